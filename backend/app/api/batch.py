@@ -4,10 +4,14 @@ Implements intelligent deduplication and streaming results for massive cost redu
 """
 
 import os
-import json
+import re
+import time
 import uuid
 import asyncio
 import hashlib
+import logging
+import unicodedata
+from collections import OrderedDict
 from typing import List, Dict, Any, Optional, Set, Tuple
 from datetime import datetime
 from pathlib import Path
@@ -15,17 +19,145 @@ from fastapi import APIRouter, File, UploadFile, HTTPException, BackgroundTasks,
 from fastapi.responses import StreamingResponse
 from sse_starlette.sse import EventSourceResponse
 import aiofiles
-from docx import Document
 
+from ..core.json_utils import dumps, loads
 from ..core.semantic_cache import get_semantic_cache
-from ..core.text_indexer import WorkingTextIndexer
+from ..core.numba_kernels import best_match
+from ..core.process_pool import get_process_pool
+from ..core.docx_text import build_working_text
 from ..core.rule_engine import RuleEngine
 from ..core.llm_orchestrator import LLMOrchestrator
 from ..workers.redis_job_queue import RedisJobQueue, JobPriority
 from ..models.schemas import JobStatus
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# xxhash (optional) gives a faster non-cryptographic clause key than hashlib
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+# MinHash-LSH near-duplicate detection (optional dependency). Without it,
+# deduplication falls back to pairwise embedding similarity.
+try:
+    from datasketch import MinHash, MinHashLSH
+    MINHASH_AVAILABLE = True
+except ImportError:
+    MINHASH_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/api/batch", tags=["batch"])
 
+# Near-duplicate clause detection settings
+DEDUP_SIMILARITY_THRESHOLD = 0.92
+MINHASH_NUM_PERM = 128
+MINHASH_LSH_PARAMS = (32, 4)  # bands, rows per band
+SHINGLE_SIZE = 5
+EMBEDDING_MATRIX_CHUNK_ROWS = 1024
+EMBEDDING_BATCH_SIZE = 1024
+
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+# Batch job retention: jobs (including their full results) expire after the
+# TTL, and the in-process store keeps at most BATCH_JOB_CACHE jobs (LRU).
+# Expired ids are remembered for longer so they can be reported as gone.
+BATCH_JOB_CACHE_SIZE = int(os.getenv("BATCH_JOB_CACHE", "1024"))
+BATCH_JOB_TTL_SECONDS = int(os.getenv("BATCH_JOB_TTL", "86400"))
+BATCH_JOB_TOMBSTONE_TTL_SECONDS = 7 * BATCH_JOB_TTL_SECONDS
+
+_PUNCTUATION_RE = re.compile(r'[^\w\s]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def _split_clauses(working_text: str) -> List[Dict]:
+    """
+    Split working text into paragraph clauses with their offsets.
+
+    Paragraph segmentation as in LLMPipelineOrchestrator._segment_by_clause_type,
+    on the single newline that ends each working text paragraph. Offsets
+    advance with each paragraph, so repeated paragraphs keep their own positions.
+    """
+    clauses = []
+    offset = 0
+
+    for paragraph in working_text.split('\n'):
+        start = offset
+        offset += len(paragraph) + 1
+
+        if paragraph.strip():
+            clauses.append({
+                'text': paragraph,
+                'start': start,
+                'end': start + len(paragraph)
+            })
+
+    return clauses
+
+
+def _clause_hash(text: str) -> str:
+    """128-bit dedup key for clause text (not used for anything security related)."""
+    text_bytes = text.encode('utf-8')
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_128_hexdigest(text_bytes)
+    return hashlib.blake2b(text_bytes, digest_size=16).hexdigest()
+
+
+def _clause_shingles(text: str, size: int = SHINGLE_SIZE) -> Set[str]:
+    """
+    Build word n-gram shingles from normalized clause text.
+
+    Text is NFC-normalized, lowercased and stripped of punctuation so that
+    formatting-only differences do not affect similarity.
+    """
+    normalized = unicodedata.normalize('NFC', text).lower()
+    normalized = _PUNCTUATION_RE.sub(' ', normalized)
+    tokens = _WHITESPACE_RE.split(normalized.strip())
+
+    if len(tokens) <= size:
+        return {' '.join(tokens)}
+
+    return {' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    """Exact Jaccard similarity of two shingle sets."""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class ThrottledCallback:
+    """
+    Coalesce progress updates to at most one per interval.
+
+    Updates carrying a per-document payload and terminal statuses are always
+    delivered.
+    """
+
+    FORCED_STATUSES = ('completed', 'error')
+
+    def __init__(self, callback, interval: float = 0.1):
+        self.callback = callback
+        self.interval = interval
+        self.last_sent = 0.0
+
+    async def __call__(self, update: Dict[str, Any]):
+        now = time.monotonic()
+        if (
+            now - self.last_sent < self.interval
+            and update.get('status') not in self.FORCED_STATUSES
+            and 'payload' not in update
+        ):
+            return
+        self.last_sent = now
+        await self.callback(update)
+
 
 class BatchProcessor:
     """
@@ -62,7 +194,9 @@ class BatchProcessor:
         self,
         batch_id: str,
         file_paths: List[str],
-        callback=None
+        callback=None,
+        use_batch_api: bool = False,
+        sla_seconds: Optional[float] = None
     ) -> Dict[str, Any]:
         """
         Process multiple NDAs with clause deduplication.
@@ -71,15 +205,22 @@ class BatchProcessor:
             batch_id: Unique batch identifier
             file_paths: List of document paths
             callback: Progress callback function
+            use_batch_api: Analyze uncached clauses through the Message Batches API
+            sla_seconds: Caller deadline; the real-time path is used when it is
+                shorter than the orchestrator's message batch timeout
 
         Returns:
             Batch processing results
         """
         start_time = datetime.now()
+        if callback:
+            callback = ThrottledCallback(callback)
         results = []
         total_clauses = 0
         unique_clauses = 0
         cache_hits = 0
+        # Working text per document, parsed once in Phase 1 and reused in Phase 4
+        doc_cache: Dict[str, str] = {}
 
         try:
             # Phase 1: Extract all clauses from all documents
@@ -94,10 +235,23 @@ class BatchProcessor:
             all_clauses = []
             document_clauses_map = {}
 
-            for idx, file_path in enumerate(file_paths):
-                doc_clauses = await self._extract_document_clauses(file_path)
-                all_clauses.extend(doc_clauses)
-                document_clauses_map[file_path] = doc_clauses
+            # DOCX parsing is CPU-bound; run it outside the GIL
+            loop = asyncio.get_running_loop()
+            extract_pool = get_process_pool()
+
+            async def extract_working_text(file_path: str) -> Tuple[str, str]:
+                working_text = await loop.run_in_executor(extract_pool, build_working_text, file_path)
+                return file_path, working_text
+
+            tasks = [extract_working_text(file_path) for file_path in file_paths]
+
+            for idx, task in enumerate(asyncio.as_completed(tasks)):
+                file_path, working_text = await task
+                doc_cache[file_path] = working_text
+                document_clauses_map[file_path] = self._extract_document_clauses(
+                    file_path,
+                    working_text
+                )
 
                 progress = (idx + 1) / len(file_paths) * 20
                 await self._update_callback(
@@ -108,6 +262,10 @@ class BatchProcessor:
                     f"Extracted clauses from document {idx + 1}/{len(file_paths)}"
                 )
 
+            # Keep clause order stable regardless of completion order
+            for file_path in file_paths:
+                all_clauses.extend(document_clauses_map[file_path])
+
             total_clauses = len(all_clauses)
 
             # Phase 2: Deduplicate clauses using semantic similarity
@@ -119,7 +277,7 @@ class BatchProcessor:
                 f"Deduplicating {total_clauses} clauses..."
             )
 
-            unique_clause_map = await self._deduplicate_clauses(all_clauses)
+            unique_clause_map, clause_to_unique = await self._deduplicate_clauses(all_clauses)
             unique_clauses = len(unique_clause_map)
 
             await self._update_callback(
@@ -139,40 +297,105 @@ class BatchProcessor:
                 f"Analyzing {unique_clauses} unique clauses..."
             )
 
-            clause_results = {}
+            # Results are stored column-wise, indexed by unique clause row
+            unique_row = {clause_hash: row for row, clause_hash in enumerate(unique_clause_map)}
+            clause_rows = {
+                clause_hash: unique_row[unique_hash]
+                for clause_hash, unique_hash in clause_to_unique.items()
+            }
+            rule_lists: List[Optional[List[Dict]]] = [None] * unique_clauses
+            llm_lists: List[Optional[List[Dict]]] = [None] * unique_clauses
 
-            for idx, (clause_hash, clause_data) in enumerate(unique_clause_map.items()):
-                # Check cache first
-                cached = await self.semantic_cache.search(
-                    clause_data['text'],
-                    context={'batch': batch_id}
-                )
+            def record_result(clause_hash: str, result: Dict):
+                row = unique_row[clause_hash]
+                rule_lists[row] = result.get('rule_redlines', [])
+                llm_lists[row] = result.get('llm_redlines', [])
 
-                if cached:
-                    clause_results[clause_hash] = cached['response']
-                    cache_hits += 1
-                else:
-                    # Process with LLM
-                    result = await self._process_clause(clause_data)
-                    clause_results[clause_hash] = result
+            semaphore = asyncio.Semaphore(int(os.getenv("BATCH_LLM_CONCURRENCY", "20")))
+            completed = 0
 
-                    # Store in cache
-                    await self.semantic_cache.store(
-                        clause_data['text'],
-                        result,
-                        context={'batch': batch_id},
-                        cost=0.03
+            async def analyze_unique_clause(clause_hash: str, clause_data: Dict):
+                nonlocal completed, cache_hits
+
+                async with semaphore:
+                    # Check cache first
+                    cached = await self.semantic_cache.search(
+                        clause_data['text']
                     )
 
-                progress = 30 + (idx + 1) / unique_clauses * 40
+                    if cached:
+                        record_result(clause_hash, cached['response'])
+                        cache_hits += 1
+                    else:
+                        # Process with LLM
+                        result = await self._process_clause(clause_data)
+                        record_result(clause_hash, result)
+
+                        # Store in cache
+                        await self.semantic_cache.store(
+                            clause_data['text'],
+                            result,
+                            cost=0.03
+                        )
+
+                completed += 1
+                progress = 30 + completed / unique_clauses * 40
                 await self._update_callback(
                     callback,
                     batch_id,
                     "analyzing",
                     progress,
-                    f"Analyzed {idx + 1}/{unique_clauses} unique clauses (cache hits: {cache_hits})"
+                    f"Analyzed {completed}/{unique_clauses} unique clauses (cache hits: {cache_hits})"
                 )
 
+            if (use_batch_api and sla_seconds is not None
+                    and sla_seconds < self.llm_orchestrator.batch_api_timeout):
+                use_batch_api = False
+
+            if use_batch_api:
+                # Serve what we can from cache, then submit the rest as one batch
+                pending_clauses = {}
+
+                async def lookup_cache(clause_hash: str, clause_data: Dict):
+                    nonlocal cache_hits
+                    async with semaphore:
+                        cached = await self.semantic_cache.search(
+                            clause_data['text']
+                        )
+                    if cached:
+                        record_result(clause_hash, cached['response'])
+                        cache_hits += 1
+                    else:
+                        pending_clauses[clause_hash] = clause_data
+
+                await asyncio.gather(*[
+                    lookup_cache(clause_hash, clause_data)
+                    for clause_hash, clause_data in unique_clause_map.items()
+                ])
+
+                await self._update_callback(
+                    callback,
+                    batch_id,
+                    "analyzing",
+                    35,
+                    f"Submitted {len(pending_clauses)} clauses to the Message Batches API "
+                    f"(cache hits: {cache_hits})"
+                )
+
+                batch_results = await self._process_clauses_with_batch_api(pending_clauses)
+                for clause_hash, result in batch_results.items():
+                    record_result(clause_hash, result)
+                    await self.semantic_cache.store(
+                        pending_clauses[clause_hash]['text'],
+                        result,
+                        cost=0.015
+                    )
+            else:
+                await asyncio.gather(*[
+                    analyze_unique_clause(clause_hash, clause_data)
+                    for clause_hash, clause_data in unique_clause_map.items()
+                ])
+
             # Phase 4: Apply results to all documents
             await self._update_callback(
                 callback,
@@ -186,8 +409,10 @@ class BatchProcessor:
                 doc_result = await self._apply_results_to_document(
                     file_path,
                     document_clauses_map[file_path],
-                    clause_results,
-                    unique_clause_map
+                    clause_rows,
+                    rule_lists,
+                    llm_lists,
+                    doc_cache.get(file_path)
                 )
 
                 results.append(doc_result)
@@ -196,9 +421,10 @@ class BatchProcessor:
                 await self._update_callback(
                     callback,
                     batch_id,
-                    "applying",
+                    "document_complete",
                     progress,
-                    f"Processed document {idx + 1}/{len(file_paths)}"
+                    f"Processed document {idx + 1}/{len(file_paths)}",
+                    payload=doc_result
                 )
 
             # Calculate metrics
@@ -246,76 +472,172 @@ class BatchProcessor:
             )
             raise
 
-    async def _extract_document_clauses(self, file_path: str) -> List[Dict]:
-        """Extract clauses from a single document."""
-        doc = Document(file_path)
-        indexer = WorkingTextIndexer()
-        indexer.build_index(doc)
+        finally:
+            doc_cache.clear()
 
-        # Use LLM orchestrator's clause extraction
-        clauses = self.llm_orchestrator._extract_clauses(indexer.working_text)
+    def _extract_document_clauses(self, file_path: str, working_text: str) -> List[Dict]:
+        """Extract clauses from a single document's working text."""
+        clauses = _split_clauses(working_text)
 
         # Add document reference
         for clause in clauses:
             clause['document'] = file_path
-            clause['hash'] = hashlib.md5(clause['text'].encode()).hexdigest()
+            clause['hash'] = _clause_hash(clause['text'])
 
         return clauses
 
     async def _deduplicate_clauses(
         self,
         clauses: List[Dict]
-    ) -> Dict[str, Dict]:
+    ) -> Tuple[Dict[str, Dict], Dict[str, str]]:
         """
-        Deduplicate clauses using semantic similarity.
+        Deduplicate clauses using MinHash-LSH over word shingles.
+
+        LSH candidates are verified with exact Jaccard similarity before a
+        clause is treated as a duplicate. Falls back to embedding similarity
+        when datasketch is not installed.
 
         Returns:
-            Dictionary mapping clause hash to unique clause data
+            Tuple of (clause hash -> unique clause data, clause hash -> unique hash)
         """
+        if not MINHASH_AVAILABLE:
+            return await self._deduplicate_clauses_by_embedding(clauses)
+
         unique_clauses = {}
-        processed_embeddings = []
+        clause_to_unique = {}
+        lsh = MinHashLSH(
+            threshold=DEDUP_SIMILARITY_THRESHOLD,
+            num_perm=MINHASH_NUM_PERM,
+            params=MINHASH_LSH_PARAMS
+        )
 
         for clause in clauses:
-            clause_text = clause['text']
             clause_hash = clause['hash']
 
             # Check if exact match exists
-            if clause_hash in unique_clauses:
-                # Add document reference
-                unique_clauses[clause_hash]['documents'].append(clause['document'])
+            if clause_hash in clause_to_unique:
+                unique_clauses[clause_to_unique[clause_hash]]['documents'].append(clause['document'])
                 continue
 
-            # Check semantic similarity with existing clauses
-            is_duplicate = False
+            shingles = _clause_shingles(clause['text'])
+            minhash = MinHash(num_perm=MINHASH_NUM_PERM)
+            minhash.update_batch([shingle.encode('utf-8') for shingle in shingles])
+
+            # Verify LSH candidates with exact Jaccard on the shingle sets
+            best_hash = None
+            best_score = 0.0
+            for candidate_hash in lsh.query(minhash):
+                score = _jaccard(shingles, unique_clauses[candidate_hash]['shingles'])
+                if score > best_score:
+                    best_hash, best_score = candidate_hash, score
+
+            if best_hash is not None and best_score >= DEDUP_SIMILARITY_THRESHOLD:
+                unique_clauses[best_hash]['documents'].append(clause['document'])
+                clause_to_unique[clause_hash] = best_hash
+                continue
 
-            if processed_embeddings:
-                embedding = await self.semantic_cache.get_embedding(clause_text)
+            lsh.insert(clause_hash, minhash)
+            clause_to_unique[clause_hash] = clause_hash
+            unique_clauses[clause_hash] = {
+                'text': clause['text'],
+                'documents': [clause['document']],
+                'minhash': minhash,
+                'shingles': shingles,
+                'original_clause': clause
+            }
 
-                for existing_hash, existing_data in unique_clauses.items():
-                    existing_embedding = existing_data.get('embedding')
+        return unique_clauses, clause_to_unique
 
-                    if existing_embedding is not None:
-                        # Calculate cosine similarity
-                        similarity = float(embedding @ existing_embedding)
+    async def _deduplicate_clauses_by_embedding(
+        self,
+        clauses: List[Dict]
+    ) -> Tuple[Dict[str, Dict], Dict[str, str]]:
+        """
+        Deduplicate clauses using embedding similarity.
 
-                        if similarity > 0.92:  # High similarity threshold
-                            # Mark as duplicate
-                            existing_data['documents'].append(clause['document'])
-                            is_duplicate = True
-                            break
+        Embeddings for all distinct clauses are computed up front in batches.
+        Each new embedding is then scored against all unique embeddings in one
+        fused kernel call over a preallocated float32 matrix.
 
-            if not is_duplicate:
-                # Add as unique clause
-                embedding = await self.semantic_cache.get_embedding(clause_text)
+        Returns:
+            Tuple of (clause hash -> unique clause data, clause hash -> unique hash)
+        """
+        unique_clauses = {}
+        clause_to_unique = {}
+        embedding_matrix = None
+        hash_index: List[str] = []
+
+        # Embed each distinct clause once, before the dedup loop
+        pending_texts = {}
+        for clause in clauses:
+            pending_texts.setdefault(clause['hash'], clause['text'])
+
+        embeddings = await self.semantic_cache.get_embeddings_batch(
+            list(pending_texts.values()),
+            batch_size=EMBEDDING_BATCH_SIZE
+        )
+        embedding_by_hash = (
+            dict(zip(pending_texts.keys(), embeddings))
+            if embeddings is not None else {}
+        )
+        # Embeddings are L2-normalized float32, so compare dot products directly
+        similarity_threshold = np.float32(DEDUP_SIMILARITY_THRESHOLD) if np is not None else None
+
+        for clause in clauses:
+            clause_text = clause['text']
+            clause_hash = clause['hash']
+
+            # Check if exact match exists
+            if clause_hash in clause_to_unique:
+                # Add document reference
+                unique_clauses[clause_to_unique[clause_hash]]['documents'].append(clause['document'])
+                continue
+
+            embedding = embedding_by_hash.get(clause_hash)
+            if embedding is None:
+                # Semantic cache disabled: exact-hash dedup only
+                clause_to_unique[clause_hash] = clause_hash
                 unique_clauses[clause_hash] = {
                     'text': clause_text,
                     'documents': [clause['document']],
-                    'embedding': embedding,
                     'original_clause': clause
                 }
-                processed_embeddings.append(embedding)
+                continue
+
+            # Check semantic similarity with all existing clauses at once
+            count = len(hash_index)
+            if count:
+                idx, similarity = best_match(embedding_matrix[:count], embedding)
+                if similarity > similarity_threshold:
+                    unique_clauses[hash_index[idx]]['documents'].append(clause['document'])
+                    clause_to_unique[clause_hash] = hash_index[idx]
+                    continue
+
+            # Grow the matrix in fixed-size chunks to avoid per-insert copies
+            if embedding_matrix is None:
+                embedding_matrix = np.empty(
+                    (EMBEDDING_MATRIX_CHUNK_ROWS, embedding.shape[0]),
+                    dtype=np.float32
+                )
+            elif count == embedding_matrix.shape[0]:
+                grown = np.empty(
+                    (count + EMBEDDING_MATRIX_CHUNK_ROWS, embedding_matrix.shape[1]),
+                    dtype=np.float32
+                )
+                grown[:count] = embedding_matrix
+                embedding_matrix = grown
 
-        return unique_clauses
+            embedding_matrix[count] = embedding
+            hash_index.append(clause_hash)
+            clause_to_unique[clause_hash] = clause_hash
+
+            unique_clauses[clause_hash] = {
+                'text': clause_text,
+                'documents': [clause['document']],
+                'original_clause': clause
+            }
+
+        return unique_clauses, clause_to_unique
 
     async def _process_clause(self, clause_data: Dict) -> Dict:
         """Process a single unique clause with LLM."""
@@ -325,9 +647,18 @@ class BatchProcessor:
         rule_redlines = self.rule_engine.apply_rules(clause_text)
 
         # LLM analysis
-        llm_redlines = await self.llm_orchestrator._analyze_clause_with_gpt5(
+        analysis = await self.llm_orchestrator._analyze_with_opus(
             clause_text,
-            0,
+            clause_data['original_clause']['hash'],
+            rule_redlines
+        )
+
+        return self._clause_result(clause_text, rule_redlines, analysis)
+
+    def _clause_result(self, clause_text: str, rule_redlines: List[Dict], analysis: Dict) -> Dict:
+        """Combine rule redlines with Opus redlines located in the clause text."""
+        llm_redlines = self.llm_orchestrator._convert_claude_to_document_format(
+            analysis.get('redlines', []),
             clause_text
         )
 
@@ -337,42 +668,93 @@ class BatchProcessor:
             'total_redlines': len(rule_redlines) + len(llm_redlines)
         }
 
+    async def _process_clauses_with_batch_api(
+        self,
+        clauses: Dict[str, Dict]
+    ) -> Dict[str, Dict]:
+        """
+        Analyze clauses through the Anthropic Message Batches API.
+
+        Submits one request per clause (custom_id = clause hash) and maps each
+        result back by custom_id. Clauses whose request did not succeed, or all
+        of them if the batch fails or times out (it is then cancelled), are
+        retried through the real-time path.
+
+        Returns:
+            Dictionary mapping clause hash to analysis result
+        """
+        if not clauses:
+            return {}
+
+        orchestrator = self.llm_orchestrator
+        rule_redlines = {
+            clause_hash: self.rule_engine.apply_rules(clause_data['text'])
+            for clause_hash, clause_data in clauses.items()
+        }
+
+        try:
+            messages = await orchestrator._run_message_batch([
+                {
+                    'custom_id': clause_hash,
+                    'params': orchestrator._opus_params(
+                        clause_data['text'],
+                        rule_redlines[clause_hash]
+                    )
+                }
+                for clause_hash, clause_data in clauses.items()
+            ])
+        except Exception as e:
+            logger.warning(f"Message batch failed, analyzing clauses individually: {e}")
+            messages = {}
+
+        results = {}
+        for clause_hash, message in messages.items():
+            if clause_hash not in clauses:
+                continue
+            parsed = orchestrator._parse_claude_response(message.content[0].text)
+            results[clause_hash] = self._clause_result(
+                clauses[clause_hash]['text'],
+                rule_redlines[clause_hash],
+                parsed
+            )
+
+        # Errored or expired requests fall back to the real-time path
+        for clause_hash, clause_data in clauses.items():
+            if clause_hash not in results:
+                results[clause_hash] = await self._process_clause(clause_data)
+
+        return results
+
     async def _apply_results_to_document(
         self,
         file_path: str,
         doc_clauses: List[Dict],
-        clause_results: Dict,
-        unique_clause_map: Dict
+        clause_rows: Dict[str, int],
+        rule_lists: List[Optional[List[Dict]]],
+        llm_lists: List[Optional[List[Dict]]],
+        working_text: Optional[str] = None
     ) -> Dict:
-        """Apply processing results to a document."""
+        """
+        Apply processing results to a document.
+
+        When the document's working text is available, each redline is checked
+        against it; results shared with a near-duplicate clause are re-anchored
+        within this clause, and dropped if their text does not occur there.
+        """
         doc_name = Path(file_path).name
         all_redlines = []
 
         # Map results back to document positions
         for clause in doc_clauses:
-            clause_hash = clause['hash']
-
-            # Find corresponding result
-            result = None
-            for unique_hash, unique_data in unique_clause_map.items():
-                if file_path in unique_data['documents']:
-                    # Check if this clause matches
-                    if clause_hash == unique_hash or \
-                       await self._is_similar_clause(clause['text'], unique_data['text']):
-                        result = clause_results.get(unique_hash)
-                        break
-
-            if result:
-                # Adjust positions for document
-                for redline in result.get('rule_redlines', []):
-                    redline['start'] += clause['start']
-                    redline['end'] += clause['start']
-                    all_redlines.append(redline)
+            row = clause_rows.get(clause['hash'])
+            if row is None or rule_lists[row] is None:
+                continue
 
-                for redline in result.get('llm_redlines', []):
-                    redline['start'] += clause['start']
-                    redline['end'] += clause['start']
-                    all_redlines.append(redline)
+            for redlines in (rule_lists[row], llm_lists[row]):
+                for redline in redlines:
+                    placed = self._place_redline(redline, clause, working_text)
+                    if placed:
+                        all_redlines.append(placed)
 
         return {
             'document': doc_name,
@@ -381,16 +763,26 @@ class BatchProcessor:
             'redlines': all_redlines
         }
 
-    async def _is_similar_clause(self, text1: str, text2: str) -> bool:
-        """Check if two clauses are semantically similar."""
-        if text1 == text2:
-            return True
-
-        embedding1 = await self.semantic_cache.get_embedding(text1)
-        embedding2 = await self.semantic_cache.get_embedding(text2)
-
-        similarity = float(embedding1 @ embedding2)
-        return similarity > 0.92
+    def _place_redline(
+        self,
+        redline: Dict,
+        clause: Dict,
+        working_text: Optional[str]
+    ) -> Optional[Dict]:
+        """Offset a clause-relative redline into document positions."""
+        # Results are shared across clauses, so offset a copy
+        start = redline['start'] + clause['start']
+        end = redline['end'] + clause['start']
+        original_text = redline.get('original_text')
+
+        if working_text is not None and original_text and working_text[start:end] != original_text:
+            clause_end = clause['start'] + len(clause['text'])
+            start = working_text.find(original_text, clause['start'], clause_end)
+            if start == -1:
+                return None
+            end = start + len(original_text)
+
+        return {**redline, 'start': start, 'end': end}
 
     async def _update_callback(
         self,
@@ -398,30 +790,282 @@ class BatchProcessor:
         batch_id: str,
         status: str,
         progress: float,
-        message: str
+        message: str,
+        payload: Optional[Dict] = None
     ):
-        """Update batch processing status."""
+        """Update batch processing status, optionally carrying a per-document result."""
         if callback:
-            await callback({
+            update = {
                 'batch_id': batch_id,
                 'status': status,
                 'progress': progress,
                 'message': message,
                 'timestamp': datetime.now().isoformat()
-            })
+            }
+            if payload is not None:
+                update['payload'] = payload
+            await callback(update)
+
+
+class BatchJobStore:
+    """
+    Batch job state shared across API workers.
+
+    Job state lives in a Redis hash (``batch:{id}``, JSON-encoded fields) and
+    every update is published on ``batch:{id}:events`` so SSE streams are
+    push-driven. Reuses the RedisJobQueue connection; when Redis is not
+    reachable, falls back to process-local state with in-memory fan-out.
+
+    Jobs expire BATCH_JOB_TTL_SECONDS after their last update (Redis EXPIRE,
+    or a TTL + LRU bound in process). A longer-lived marker per batch id lets
+    expired() tell an expired batch apart from one that never existed.
+    """
+
+    TERMINAL_STATUSES = ('completed', 'error')
+
+    def __init__(
+        self,
+        max_jobs: int = BATCH_JOB_CACHE_SIZE,
+        ttl_seconds: int = BATCH_JOB_TTL_SECONDS
+    ):
+        self.max_jobs = max_jobs
+        self.ttl_seconds = ttl_seconds
+        self._queue: Optional[RedisJobQueue] = None
+        self._redis = None
+        self._connect_lock = asyncio.Lock()
+        self._connect_attempted = False
+        # batch_id -> (expires_at, job), least recently used first
+        self._local_jobs: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._local_expired: "OrderedDict[str, None]" = OrderedDict()
+        self._local_subscribers: Dict[str, List[asyncio.Queue]] = {}
+
+    async def _get_redis(self):
+        """Connect lazily through RedisJobQueue; None when Redis is unavailable."""
+        if self._connect_attempted:
+            return self._redis
+
+        async with self._connect_lock:
+            if not self._connect_attempted:
+                self._connect_attempted = True
+                try:
+                    self._queue = RedisJobQueue()
+                    await self._queue.connect()
+                    self._redis = self._queue.redis_client
+                except Exception as e:
+                    logger.warning(f"Batch job store using in-process state (Redis unavailable: {e})")
+                    self._redis = None
+
+        return self._redis
+
+    @staticmethod
+    def _key(batch_id: str) -> str:
+        return f"batch:{batch_id}"
+
+    @staticmethod
+    def _channel(batch_id: str) -> str:
+        return f"batch:{batch_id}:events"
+
+    @staticmethod
+    def _marker_key(batch_id: str) -> str:
+        # Outside the batch:* namespace so list_statuses() never scans it
+        return f"batch_issued:{batch_id}"
+
+    def _local_job(self, batch_id: str) -> Optional[Dict]:
+        """Return a live in-process job, expiring it if its TTL has passed."""
+        entry = self._local_jobs.get(batch_id)
+        if entry is None:
+            return None
+        expires_at, job = entry
+        if expires_at <= time.monotonic():
+            self._expire_local(batch_id)
+            return None
+        return job
+
+    def _expire_local(self, batch_id: str):
+        self._local_jobs.pop(batch_id, None)
+        self._local_expired[batch_id] = None
+        while len(self._local_expired) > self.max_jobs:
+            self._local_expired.popitem(last=False)
+
+    def _touch_local(self, batch_id: str, job: Dict):
+        """Store a job as most recently used, evicting past the size bound."""
+        self._local_jobs[batch_id] = (time.monotonic() + self.ttl_seconds, job)
+        self._local_jobs.move_to_end(batch_id)
+        while len(self._local_jobs) > self.max_jobs:
+            oldest_id = next(iter(self._local_jobs))
+            self._expire_local(oldest_id)
+
+    async def create(self, batch_id: str, job: Dict[str, Any]):
+        """Register a new batch job."""
+        client = await self._get_redis()
+        if client is None:
+            self._local_expired.pop(batch_id, None)
+            self._touch_local(batch_id, dict(job))
+            return
+
+        key = self._key(batch_id)
+        async with client.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping={field: dumps(value) for field, value in job.items()})
+            pipe.expire(key, self.ttl_seconds)
+            pipe.set(self._marker_key(batch_id), 1, ex=BATCH_JOB_TOMBSTONE_TTL_SECONDS)
+            await pipe.execute()
+
+    async def update(
+        self,
+        batch_id: str,
+        update: Dict[str, Any],
+        event: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Merge an update into the job state and publish it to subscribers.
+
+        Args:
+            batch_id: Batch identifier
+            update: Fields to store in the job state
+            event: Message for subscribers (defaults to the update itself)
+        """
+        event = update if event is None else event
+        client = await self._get_redis()
+        if client is None:
+            job = self._local_job(batch_id)
+            if job is None:
+                return
+            job.update(update)
+            self._touch_local(batch_id, job)
+            for queue in self._local_subscribers.get(batch_id, []):
+                queue.put_nowait(event)
+            return
+
+        if update:
+            key = self._key(batch_id)
+            async with client.pipeline(transaction=True) as pipe:
+                pipe.hset(key, mapping={field: dumps(value) for field, value in update.items()})
+                pipe.expire(key, self.ttl_seconds)
+                await pipe.execute()
+        await client.publish(self._channel(batch_id), dumps(event))
+
+    async def get(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        """Return the current job state, or None if the batch is unknown."""
+        client = await self._get_redis()
+        if client is None:
+            job = self._local_job(batch_id)
+            if job is not None:
+                self._local_jobs.move_to_end(batch_id)
+            return job
+
+        raw = await client.hgetall(self._key(batch_id))
+        if not raw:
+            return None
+        return {
+            (field.decode() if isinstance(field, bytes) else field): loads(value)
+            for field, value in raw.items()
+        }
+
+    async def expired(self, batch_id: str) -> bool:
+        """True if the batch existed but its state has since expired."""
+        client = await self._get_redis()
+        if client is None:
+            return self._local_job(batch_id) is None and batch_id in self._local_expired
+
+        marker, exists = await asyncio.gather(
+            client.exists(self._marker_key(batch_id)),
+            client.exists(self._key(batch_id))
+        )
+        return bool(marker) and not exists
+
+    async def list_statuses(self) -> List[str]:
+        """Return the status of every known batch job."""
+        client = await self._get_redis()
+        if client is None:
+            now = time.monotonic()
+            return [
+                job.get('status')
+                for expires_at, job in self._local_jobs.values()
+                if expires_at > now
+            ]
+
+        statuses = []
+        async for key in client.scan_iter(match="batch:*"):
+            value = await client.hget(key, 'status')
+            if value is not None:
+                statuses.append(loads(value))
+        return statuses
+
+    async def subscribe(self, batch_id: str):
+        """
+        Yield the current job state, then every subsequent update.
+
+        Subscribes before reading the state so no update can be missed.
+        Stops after a terminal status.
+        """
+        client = await self._get_redis()
+
+        if client is None:
+            queue: asyncio.Queue = asyncio.Queue()
+            self._local_subscribers.setdefault(batch_id, []).append(queue)
+            try:
+                current = self._local_job(batch_id) or {}
+                yield dict(current)
+                if current.get('status') in self.TERMINAL_STATUSES:
+                    return
+                while True:
+                    update = await queue.get()
+                    yield update
+                    if update.get('status') in self.TERMINAL_STATUSES:
+                        return
+            finally:
+                self._local_subscribers[batch_id].remove(queue)
+                if not self._local_subscribers[batch_id]:
+                    del self._local_subscribers[batch_id]
+            return
+
+        pubsub = client.pubsub()
+        await pubsub.subscribe(self._channel(batch_id))
+        try:
+            current = await self.get(batch_id) or {}
+            yield current
+            if current.get('status') in self.TERMINAL_STATUSES:
+                return
+
+            async for message in pubsub.listen():
+                if message.get('type') != 'message':
+                    continue
+                update = loads(message['data'])
+                yield update
+                if update.get('status') in self.TERMINAL_STATUSES:
+                    return
+        finally:
+            await pubsub.unsubscribe(self._channel(batch_id))
+            await pubsub.close()
 
 
 # Global batch processor instance
 batch_processor = BatchProcessor()
 
 # Batch tracking
-batch_jobs: Dict[str, Dict] = {}
+batch_jobs = BatchJobStore()
+
+
+async def _raise_batch_missing(batch_id: str):
+    """Raise 410 for an expired batch, 404 for an unknown one."""
+    if await batch_jobs.expired(batch_id):
+        raise HTTPException(status_code=410, detail="Batch results have expired")
+    raise HTTPException(status_code=404, detail="Batch not found")
 
 
 @router.post("/upload")
 async def upload_batch(
     files: List[UploadFile] = File(...),
     priority: str = Query("standard", description="Job priority level"),
+    use_batch_api: bool = Query(
+        False,
+        description="Analyze clauses via the Message Batches API (50% cheaper, up to 24h latency)"
+    ),
+    sla_seconds: Optional[float] = Query(
+        None,
+        gt=0,
+        description="Deadline in seconds; shorter than the message batch timeout uses the real-time path"
+    ),
     background_tasks: BackgroundTasks = BackgroundTasks()
 ):
     """
@@ -449,15 +1093,30 @@ async def upload_batch(
     batch_path = batch_processor.storage_path / "batches" / batch_id
     batch_path.mkdir(parents=True, exist_ok=True)
 
+    # One directory per upload: files sharing a name must not write to the
+    # same path, and results keep reporting the original filename
     file_paths = []
+    for idx, file in enumerate(files):
+        upload_path = batch_path / str(idx)
+        upload_path.mkdir()
+        file_paths.append(str(upload_path / Path(file.filename).name))
+
+    # Save uploaded files in bounded chunks, a few files at a time
+    save_semaphore = asyncio.Semaphore(8)
+
+    async def save_upload(file: UploadFile, file_path: str):
+        async with save_semaphore:
+            async with aiofiles.open(file_path, 'wb') as f:
+                while True:
+                    chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    await f.write(chunk)
 
-    # Save uploaded files
-    for file in files:
-        file_path = batch_path / file.filename
-        async with aiofiles.open(file_path, 'wb') as f:
-            content = await file.read()
-            await f.write(content)
-        file_paths.append(str(file_path))
+    await asyncio.gather(*[
+        save_upload(file, file_path)
+        for file, file_path in zip(files, file_paths)
+    ])
 
     # Initialize batch job
     batch_job = {
@@ -471,13 +1130,15 @@ async def upload_batch(
         'result': None
     }
 
-    batch_jobs[batch_id] = batch_job
+    await batch_jobs.create(batch_id, batch_job)
 
     # Start processing in background
     background_tasks.add_task(
         process_batch_background,
         batch_id,
-        file_paths
+        file_paths,
+        use_batch_api,
+        sla_seconds
     )
 
     return {
@@ -488,34 +1149,54 @@ async def upload_batch(
     }
 
 
-async def process_batch_background(batch_id: str, file_paths: List[str]):
+async def process_batch_background(
+    batch_id: str,
+    file_paths: List[str],
+    use_batch_api: bool = False,
+    sla_seconds: Optional[float] = None
+):
     """Process batch in background."""
     async def update_callback(update):
-        if batch_id in batch_jobs:
-            batch_jobs[batch_id].update(update)
+        # The final 'completed' update is published together with the result below
+        if update.get('status') == 'completed':
+            return
+        # Per-document results are streamed to subscribers, not kept in job state
+        state = {key: value for key, value in update.items() if key != 'payload'}
+        await batch_jobs.update(batch_id, state, event=update)
 
     try:
         result = await batch_processor.process_batch(
             batch_id,
             file_paths,
-            update_callback
+            update_callback,
+            use_batch_api=use_batch_api,
+            sla_seconds=sla_seconds
         )
 
-        batch_jobs[batch_id]['result'] = result
-        batch_jobs[batch_id]['status'] = 'completed'
+        # Documents were already streamed individually; the completion event
+        # only carries the summary, while job state keeps the full result
+        summary = {key: value for key, value in result.items() if key != 'results'}
+        await batch_jobs.update(
+            batch_id,
+            {'status': 'completed', 'progress': 100, 'result': result},
+            event={'status': 'completed', 'progress': 100, 'result': summary}
+        )
 
     except Exception as e:
-        batch_jobs[batch_id]['status'] = 'error'
-        batch_jobs[batch_id]['error'] = str(e)
+        await batch_jobs.update(batch_id, {
+            'status': 'error',
+            'error': str(e)
+        })
 
 
 @router.get("/status/{batch_id}")
 async def get_batch_status(batch_id: str):
     """Get batch processing status."""
-    if batch_id not in batch_jobs:
-        raise HTTPException(status_code=404, detail="Batch not found")
+    batch = await batch_jobs.get(batch_id)
+    if batch is None:
+        await _raise_batch_missing(batch_id)
 
-    return batch_jobs[batch_id]
+    return batch
 
 
 @router.get("/stream/{batch_id}")
@@ -525,49 +1206,47 @@ async def stream_batch_results(batch_id: str):
 
     Returns results as they complete for each document.
     """
-    if batch_id not in batch_jobs:
-        raise HTTPException(status_code=404, detail="Batch not found")
+    if await batch_jobs.get(batch_id) is None:
+        await _raise_batch_missing(batch_id)
 
     async def event_generator():
-        last_status = None
-
-        while True:
-            if batch_id in batch_jobs:
-                batch = batch_jobs[batch_id]
-
-                # Send update if status changed
-                if batch.get('status') != last_status:
-                    last_status = batch.get('status')
-
-                    yield {
-                        "event": "status",
-                        "data": json.dumps({
-                            'batch_id': batch_id,
-                            'status': batch.get('status'),
-                            'progress': batch.get('progress', 0),
-                            'message': batch.get('message', '')
-                        })
-                    }
-
-                # Send final result if completed
-                if batch.get('status') == 'completed' and batch.get('result'):
-                    yield {
-                        "event": "complete",
-                        "data": json.dumps(batch['result'])
-                    }
-                    break
-
-                # Send error if failed
-                if batch.get('status') == 'error':
-                    yield {
-                        "event": "error",
-                        "data": json.dumps({
-                            'error': batch.get('error', 'Unknown error')
-                        })
-                    }
-                    break
-
-            await asyncio.sleep(1)
+        async for update in batch_jobs.subscribe(batch_id):
+            status = update.get('status')
+
+            # Stream each document's redlines as soon as it is finished
+            if update.get('payload') is not None:
+                yield {
+                    "event": "document",
+                    "data": dumps(update['payload'])
+                }
+
+            # Send final result if completed
+            if status == 'completed' and update.get('result'):
+                yield {
+                    "event": "complete",
+                    "data": dumps(update['result'])
+                }
+                break
+
+            # Send error if failed
+            if status == 'error':
+                yield {
+                    "event": "error",
+                    "data": dumps({
+                        'error': update.get('error', 'Unknown error')
+                    })
+                }
+                break
+
+            yield {
+                "event": "status",
+                "data": dumps({
+                    'batch_id': batch_id,
+                    'status': status,
+                    'progress': update.get('progress', 0),
+                    'message': update.get('message', '')
+                })
+            }
 
     return EventSourceResponse(event_generator())
 
@@ -576,10 +1255,11 @@ async def stream_batch_results(batch_id: str):
 async def get_batch_stats():
     """Get batch processing statistics."""
     cache_stats = batch_processor.semantic_cache.get_statistics()
+    statuses = await batch_jobs.list_statuses()
 
     return {
-        'active_batches': sum(1 for b in batch_jobs.values() if b['status'] == 'processing'),
-        'completed_batches': sum(1 for b in batch_jobs.values() if b['status'] == 'completed'),
+        'active_batches': sum(1 for status in statuses if status == 'processing'),
+        'completed_batches': sum(1 for status in statuses if status == 'completed'),
         'cache_stats': cache_stats,
         'total_cost_saved': cache_stats.get('total_cost_saved', 0)
     }
\ No newline at end of file
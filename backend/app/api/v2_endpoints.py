@@ -9,13 +9,14 @@ from typing import Optional, Dict, Any
 from fastapi import APIRouter, UploadFile, File, HTTPException, Form
 from fastapi.responses import JSONResponse, StreamingResponse
 import asyncio
+import tempfile
 from datetime import datetime
-import io
 
 try:
     # Try absolute import for Railway deployment (running from root)
     from backend.app.orchestrators.llm_pipeline import LLMPipelineOrchestrator
     from backend.app.core.strictness_controller import EnforcementLevel
+    from backend.app.core.docx_text import iter_paragraph_texts
     from backend.app.models.schemas_v2 import (
         PipelineRequest,
         PipelineResult,
@@ -27,6 +28,7 @@ except ModuleNotFoundError:
     # Fall back to relative imports for local development
     from ..orchestrators.llm_pipeline import LLMPipelineOrchestrator
     from ..core.strictness_controller import EnforcementLevel
+    from ..core.docx_text import iter_paragraph_texts
     from ..models.schemas_v2 import (
         PipelineRequest,
         PipelineResult,
@@ -34,21 +36,46 @@ except ModuleNotFoundError:
         BatchResult,
         ExportRequest
     )
-from docx import Document
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v2", tags=["v2"])
 
-# Initialize pipeline orchestrator (singleton)
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+UPLOAD_SPOOL_MAX_SIZE = 8 * 1024 * 1024  # Spill to disk above 8 MiB
+
+# Enforcement levels are resolved once, not per request
+_LEVELS_BY_NAME = {level.value: level for level in EnforcementLevel}
+_DEFAULT_LEVEL = EnforcementLevel.from_string(os.getenv("ENFORCEMENT_LEVEL", "Balanced"))
+
+# Initialize pipeline orchestrator (singleton, plus one specialization per level)
 _pipeline_instance = None
+_pipelines_by_level: Dict[EnforcementLevel, LLMPipelineOrchestrator] = {}
 
-def get_pipeline() -> LLMPipelineOrchestrator:
-    """Get or create pipeline instance"""
+def get_pipeline(level: Optional[EnforcementLevel] = None) -> LLMPipelineOrchestrator:
+    """Get or create pipeline instance, optionally specialized to a level"""
     global _pipeline_instance
     if _pipeline_instance is None:
-        _pipeline_instance = LLMPipelineOrchestrator()
-    return _pipeline_instance
+        _pipeline_instance = LLMPipelineOrchestrator(enforcement_level=_DEFAULT_LEVEL)
+    if level is None:
+        return _pipeline_instance
+
+    pipeline = _pipelines_by_level.get(level)
+    if pipeline is None:
+        pipeline = _pipeline_instance.for_level(level)
+        _pipelines_by_level[level] = pipeline
+    return pipeline
+
+
+def resolve_enforcement_level(name: Optional[str]) -> EnforcementLevel:
+    """Map an enforcement level name to its level, falling back to the default"""
+    if not name:
+        return _DEFAULT_LEVEL
+    level = _LEVELS_BY_NAME.get(name)
+    if level is None:
+        logger.warning(f"Invalid enforcement level '{name}'. Using default.")
+        return _DEFAULT_LEVEL
+    return level
 
 
 @router.post("/analyze")
@@ -76,32 +103,31 @@ async def analyze_document(
                 detail=f"File type {file_ext} not supported. Use: {allowed_extensions}"
             )
 
-        # Read file content
-        content = await file.read()
-
         # Extract text based on file type
         if file_ext == '.docx':
-            doc = Document(io.BytesIO(content))
-            text = '\n'.join([p.text for p in doc.paragraphs if p.text.strip()])
+            # Spool the upload (in memory up to 8 MiB, then on disk) and stream
+            # body paragraphs straight out of word/document.xml
+            with tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_MAX_SIZE) as spool:
+                while True:
+                    chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    spool.write(chunk)
+                spool.seek(0)
+
+                text = '\n'.join(
+                    paragraph for location, paragraph in iter_paragraph_texts(spool)
+                    if location == 'body' and paragraph.strip()
+                )
         elif file_ext == '.pdf':
             # PDF extraction would go here
             raise HTTPException(status_code=501, detail="PDF support coming soon")
         else:
+            content = await file.read()
             text = content.decode('utf-8')
 
         # Get enforcement level
-        if enforcement_level:
-            try:
-                level = EnforcementLevel.from_string(enforcement_level)
-            except (ValueError, KeyError, AttributeError) as e:
-                logger.warning(f"Invalid enforcement level '{enforcement_level}': {e}. Using default.")
-                level = EnforcementLevel.from_string(
-                    os.getenv("ENFORCEMENT_LEVEL", "Balanced")
-                )
-        else:
-            level = EnforcementLevel.from_string(
-                os.getenv("ENFORCEMENT_LEVEL", "Balanced")
-            )
+        level = resolve_enforcement_level(enforcement_level)
 
         # Create pipeline request
         request = PipelineRequest(
@@ -111,8 +137,8 @@ async def analyze_document(
             filename=file.filename
         )
 
-        # Get pipeline instance
-        pipeline = get_pipeline()
+        # Get pipeline specialized to the level
+        pipeline = get_pipeline(level)
 
         # Execute pipeline
         result = await pipeline.execute_pipeline(request)
@@ -137,43 +163,61 @@ async def analyze_batch(batch_request: BatchRequest):
         BatchResult with all results
     """
     try:
-        pipeline = get_pipeline()
-
-        # Process documents in parallel (respecting max_concurrent)
-        tasks = []
-        for doc_request in batch_request.documents:
-            task = pipeline.execute_pipeline(doc_request)
-            tasks.append(task)
+        # Longest documents first, so the slowest work is not left for the tail
+        order = sorted(
+            range(len(batch_request.documents)),
+            key=lambda idx: len(batch_request.documents[idx].document_text),
+            reverse=True
+        )
 
-        # Wait for all with concurrency limit
-        max_concurrent = batch_request.max_concurrent
+        # A freed slot picks up the next document immediately instead of
+        # waiting for the rest of a fixed-size chunk
+        semaphore = asyncio.Semaphore(batch_request.max_concurrent)
+
+        async def run_document(idx: int):
+            async with semaphore:
+                try:
+                    doc_request = batch_request.documents[idx]
+                    pipeline = get_pipeline(_LEVELS_BY_NAME[doc_request.enforcement_level])
+                    return idx, await pipeline.execute_pipeline(doc_request)
+                except Exception as e:
+                    return idx, e
+
+        tasks = [asyncio.create_task(run_document(idx)) for idx in order]
+        outcomes = [None] * len(batch_request.documents)
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                idx, outcome = await next_done
+                if isinstance(outcome, Exception) and not batch_request.continue_on_error:
+                    raise outcome
+                outcomes[idx] = outcome
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        # Report in request order
         results = []
         errors = []
-
-        for i in range(0, len(tasks), max_concurrent):
-            batch = tasks[i:i + max_concurrent]
-            batch_results = await asyncio.gather(*batch, return_exceptions=True)
-
-            for idx, result in enumerate(batch_results):
-                if isinstance(result, Exception):
-                    errors.append({
-                        'document_id': batch_request.documents[i + idx].document_id,
-                        'error': str(result)
-                    })
-                    if not batch_request.continue_on_error:
-                        raise result
-                else:
-                    results.append(result)
+        for doc_request, outcome in zip(batch_request.documents, outcomes):
+            if isinstance(outcome, Exception):
+                errors.append({
+                    'document_id': doc_request.document_id,
+                    'error': str(outcome)
+                })
+            else:
+                results.append(outcome)
 
         # Create batch result
+        total_time_ms = sum(r.total_processing_time_ms for r in results)
         batch_result = BatchResult(
             total_documents=len(batch_request.documents),
             successful=len(results),
             failed=len(errors),
             results=results,
             errors=errors,
-            total_time_ms=sum(r.total_processing_time_ms for r in results),
-            average_time_ms=sum(r.total_processing_time_ms for r in results) / len(results) if results else 0
+            total_time_ms=total_time_ms,
+            average_time_ms=total_time_ms / len(results) if results else 0
         )
 
         return JSONResponse(content=batch_result.dict())
@@ -320,7 +364,7 @@ async def test_pipeline():
         request = PipelineRequest(
             document_text=sample_text,
             document_id="test_doc",
-            enforcement_level=os.getenv("ENFORCEMENT_LEVEL", "Balanced"),
+            enforcement_level=_DEFAULT_LEVEL.value,
             filename="test.txt"
         )
 
@@ -8,18 +8,29 @@ from .confidence_thresholds import (
     CONFIDENCE_THRESHOLDS,
     PATTERN_CONFIDENCE_MAP,
     calculate_redline_confidence,
+    calculate_redline_confidence_batch,
     should_validate_high_confidence,
     get_confidence_explanation
 )
-from .settings import Settings
+
+
+def __getattr__(name):
+    # Settings pulls in pydantic-settings; import it only when first requested
+    if name in ('Settings', 'get_settings'):
+        from . import settings
+        return getattr(settings, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     'Settings',
+    'get_settings',
     'ConfidenceLevel',
     'ProcessingAction',
     'CONFIDENCE_THRESHOLDS',
     'PATTERN_CONFIDENCE_MAP',
     'calculate_redline_confidence',
+    'calculate_redline_confidence_batch',
     'should_validate_high_confidence',
     'get_confidence_explanation'
 ]
\ No newline at end of file
@@ -3,9 +3,24 @@ Confidence thresholds and scoring configuration for NDA redline processing
 Based on analysis of 789 patterns from 84 training NDAs
 """
 
-from typing import Dict, List, Tuple
+import random
+from array import array
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
 from enum import Enum
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# pyahocorasick (optional) matches every context indicator in one pass
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 class ConfidenceLevel(Enum):
     """Confidence level categories for redline processing"""
     HIGH = "high"          # 95-100% - Auto-apply
@@ -106,6 +121,116 @@ NEGATIVE_CONTEXT_INDICATORS = [
     ("may be modified", -5),              # Flexibility clause
 ]
 
+def _frequency_boost(frequency: int) -> int:
+    """Confidence boost for patterns seen often in training data."""
+    if frequency >= 10:
+        return 3
+    elif frequency >= 5:
+        return 2
+    elif frequency >= 3:
+        return 1
+    return 0
+
+
+# (rule_id, clause_type) -> (base_confidence * clause_modifier, frequency boost),
+# precomputed for every known pattern and clause type
+_PATTERN_CLAUSE_SCORES: Dict[Tuple[str, str], Tuple[float, int]] = {
+    (rule_id, clause_type): (base_confidence * clause_modifier, _frequency_boost(frequency))
+    for rule_id, (base_confidence, frequency) in PATTERN_CONFIDENCE_MAP.items()
+    for clause_type, clause_modifier in CLAUSE_TYPE_CONFIDENCE_MODIFIER.items()
+}
+
+# Indicators normalized once to (lowercased terms, score), so nothing
+# star-unpacks the mixed-arity tuples at scoring time
+_CONTEXT_GROUPS: Tuple[Tuple[Tuple[str, ...], int], ...] = tuple(
+    (tuple(term.lower() for term in terms), score)
+    for *terms, score in POSITIVE_CONTEXT_INDICATORS + NEGATIVE_CONTEXT_INDICATORS
+)
+
+# Groups as parallel arrays: a group scores when its found-bits equal its
+# mask (one bit per term), i.e. every term occurs
+_GROUP_SCORES = array('i', (score for _, score in _CONTEXT_GROUPS))
+_GROUP_MASKS = array('i', ((1 << len(terms)) - 1 for terms, _ in _CONTEXT_GROUPS))
+
+
+def _build_term_hits() -> Dict[str, Tuple[Tuple[int, int], ...]]:
+    """Map each distinct lowercased term to the (group, bit) pairs it sets."""
+    term_hits: Dict[str, List[Tuple[int, int]]] = {}
+    for group_idx, (terms, _) in enumerate(_CONTEXT_GROUPS):
+        for term_idx, term in enumerate(terms):
+            term_hits.setdefault(term, []).append((group_idx, 1 << term_idx))
+    return {term: tuple(hits) for term, hits in term_hits.items()}
+
+
+_TERM_HITS = _build_term_hits()
+
+
+def _build_context_automaton():
+    """Build one Aho-Corasick automaton over all context indicator terms."""
+    automaton = ahocorasick.Automaton()
+    for term, hits in _TERM_HITS.items():
+        automaton.add_word(term, hits)
+    automaton.make_automaton()
+    return automaton
+
+
+_CONTEXT_AUTOMATON = _build_context_automaton() if AHOCORASICK_AVAILABLE else None
+
+
+def _score_context(text_lower: str) -> int:
+    """Sum the scores of all context indicator groups found in the text."""
+    found = [0] * len(_GROUP_SCORES)
+
+    if _CONTEXT_AUTOMATON is None:
+        # Each distinct term is searched once, however many groups use it
+        for term, hits in _TERM_HITS.items():
+            if term in text_lower:
+                for group_idx, bit in hits:
+                    found[group_idx] |= bit
+    else:
+        for _, hits in _CONTEXT_AUTOMATON.iter(text_lower):
+            for group_idx, bit in hits:
+                found[group_idx] |= bit
+
+    return sum(
+        score for score, mask, bits in zip(_GROUP_SCORES, _GROUP_MASKS, found)
+        if bits == mask
+    )
+
+
+# (level, action) per confidence band, indexed by bisecting the band floors
+_BAND_FLOORS = (
+    0,
+    CONFIDENCE_THRESHOLDS["medium_threshold"],
+    CONFIDENCE_THRESHOLDS["high_threshold"]
+)
+_BAND_OUTCOMES = (
+    (ConfidenceLevel.LOW, ProcessingAction.REQUIRE_VALIDATION),
+    (ConfidenceLevel.MEDIUM, ProcessingAction.SUGGEST_REVIEW),
+    (ConfidenceLevel.HIGH, ProcessingAction.AUTO_APPLY)
+)
+
+# Explanation template per level; only the selected one is formatted
+_EXPLANATION_TEMPLATES = {
+    ConfidenceLevel.HIGH: "High confidence ({:.1f}%) - Pattern found in multiple training examples. Auto-applying redline.",
+    ConfidenceLevel.MEDIUM: "Medium confidence ({:.1f}%) - Pattern recognized but may need review. Suggesting redline.",
+    ConfidenceLevel.LOW: "Low confidence ({:.1f}%) - Uncertain pattern. Requiring validation."
+}
+
+
+def _pattern_clause_scores(rule_id: str, clause_type: str) -> Tuple[float, int]:
+    """(base_confidence * clause_modifier, frequency boost) for a rule and clause type."""
+    scores = _PATTERN_CLAUSE_SCORES.get((rule_id, clause_type))
+    if scores is None:
+        base_confidence, frequency = PATTERN_CONFIDENCE_MAP.get(
+            rule_id,
+            PATTERN_CONFIDENCE_MAP["default"]
+        )
+        clause_modifier = CLAUSE_TYPE_CONFIDENCE_MODIFIER.get(clause_type, 1.0)
+        scores = (base_confidence * clause_modifier, _frequency_boost(frequency))
+    return scores
+
+
 def calculate_redline_confidence(
     rule_id: str,
     clause_type: str,
@@ -124,60 +249,106 @@ def calculate_redline_confidence(
     Returns:
         Tuple of (confidence_score, confidence_level, recommended_action)
     """
-    # Get base confidence from pattern map
-    base_confidence, frequency = PATTERN_CONFIDENCE_MAP.get(
-        rule_id,
-        PATTERN_CONFIDENCE_MAP["default"]
-    )
-
-    # Apply clause type modifier
-    clause_modifier = CLAUSE_TYPE_CONFIDENCE_MODIFIER.get(clause_type, 1.0)
-
-    # Calculate context score
-    context_score = 0
-    text_lower = text_context.lower()
+    # Base confidence with clause type modifier and frequency boost applied
+    modified_confidence, frequency_boost = _pattern_clause_scores(rule_id, clause_type)
 
-    # Check positive indicators
-    for *terms, score in POSITIVE_CONTEXT_INDICATORS:
-        if all(term in text_lower for term in terms):
-            context_score += score
-
-    # Check negative indicators
-    for *terms, score in NEGATIVE_CONTEXT_INDICATORS:
-        if all(term in text_lower for term in terms):
-            context_score += score
+    # Calculate context score from positive and negative indicators
+    context_score = _score_context(text_context.lower())
 
     # Calculate final confidence
-    confidence = base_confidence * clause_modifier * pattern_match_quality
+    confidence = modified_confidence * pattern_match_quality
 
     # Add context score (capped at +/- 10)
     context_score = max(-10, min(10, context_score))
     confidence += context_score
 
     # Boost for high-frequency patterns
-    if frequency >= 10:
-        confidence += 3
-    elif frequency >= 5:
-        confidence += 2
-    elif frequency >= 3:
-        confidence += 1
+    confidence += frequency_boost
 
     # Ensure confidence is in valid range
     confidence = max(0, min(100, confidence))
 
-    # Determine confidence level
-    if confidence >= CONFIDENCE_THRESHOLDS["high_threshold"]:
-        level = ConfidenceLevel.HIGH
-        action = ProcessingAction.AUTO_APPLY
-    elif confidence >= CONFIDENCE_THRESHOLDS["medium_threshold"]:
-        level = ConfidenceLevel.MEDIUM
-        action = ProcessingAction.SUGGEST_REVIEW
-    else:
-        level = ConfidenceLevel.LOW
-        action = ProcessingAction.REQUIRE_VALIDATION
+    # Determine confidence level (confidence is >= 0, so the index is >= 0)
+    level, action = _BAND_OUTCOMES[bisect_right(_BAND_FLOORS, confidence) - 1]
 
     return confidence, level, action
 
+def calculate_redline_confidence_batch(
+    rule_ids: List[str],
+    clause_types: List[str],
+    text_contexts: List[str],
+    pattern_match_qualities: Optional[List[float]] = None
+) -> List[Tuple[float, ConfidenceLevel, ProcessingAction]]:
+    """
+    Calculate confidence for many redlines at once
+
+    Same result as calling calculate_redline_confidence per redline; with
+    NumPy the arithmetic, clamping and banding run as vector operations.
+
+    Args:
+        rule_ids: Rule that matched, per redline
+        clause_types: Clause type, per redline
+        text_contexts: Surrounding text, per redline
+        pattern_match_qualities: Match quality per redline (defaults to 1.0)
+
+    Returns:
+        List of (confidence_score, confidence_level, recommended_action)
+    """
+    if pattern_match_qualities is None:
+        pattern_match_qualities = [1.0] * len(rule_ids)
+
+    if np is None:
+        return [
+            calculate_redline_confidence(rule_id, clause_type, text_context, quality)
+            for rule_id, clause_type, text_context, quality
+            in zip(rule_ids, clause_types, text_contexts, pattern_match_qualities)
+        ]
+
+    scores = [
+        _pattern_clause_scores(rule_id, clause_type)
+        for rule_id, clause_type in zip(rule_ids, clause_types)
+    ]
+    modified = np.array([score[0] for score in scores], dtype=np.float64)
+    boosts = np.array([score[1] for score in scores], dtype=np.float64)
+    context = np.array(
+        [_score_context(text_context.lower()) for text_context in text_contexts],
+        dtype=np.float64
+    )
+    qualities = np.asarray(pattern_match_qualities, dtype=np.float64)
+
+    # Same operation order as the scalar path, so results match exactly
+    confidences = modified * qualities
+    confidences += np.clip(context, -10, 10)
+    confidences += boosts
+    np.clip(confidences, 0, 100, out=confidences)
+    bands = np.searchsorted(_BAND_FLOORS, confidences, side='right') - 1
+
+    return [
+        (confidence, *_BAND_OUTCOMES[band])
+        for confidence, band in zip(confidences.tolist(), bands.tolist())
+    ]
+
+
+# Uniform samples for validation sampling, drawn in bulk when NumPy is available
+_UNIFORM_BUFFER_SIZE = 4096
+_uniform_buffer = None
+_uniform_index = _UNIFORM_BUFFER_SIZE
+
+
+def _next_uniform() -> float:
+    """Next uniform [0, 1) sample, refilling the buffer when it runs out."""
+    global _uniform_buffer, _uniform_index
+    if np is None:
+        return random.random()
+
+    if _uniform_index >= _UNIFORM_BUFFER_SIZE:
+        _uniform_buffer = np.random.random(_UNIFORM_BUFFER_SIZE).tolist()
+        _uniform_index = 0
+    value = _uniform_buffer[_uniform_index]
+    _uniform_index += 1
+    return value
+
+
 def should_validate_high_confidence(confidence: float) -> bool:
     """
     Determine if a high-confidence redline should still be validated
@@ -189,11 +360,9 @@ def should_validate_high_confidence(confidence: float) -> bool:
     Returns:
         True if should validate despite high confidence
     """
-    import random
-
     if confidence >= CONFIDENCE_THRESHOLDS["high_threshold"]:
         # Sample 15% of high-confidence redlines for validation
-        return random.random() < CONFIDENCE_THRESHOLDS["validation_sample_rate"]
+        return _next_uniform() < CONFIDENCE_THRESHOLDS["validation_sample_rate"]
     return False
 
 def get_confidence_explanation(
@@ -210,13 +379,7 @@ def get_confidence_explanation(
     Returns:
         Explanation string
     """
-    explanations = {
-        ConfidenceLevel.HIGH: f"High confidence ({confidence:.1f}%) - Pattern found in multiple training examples. Auto-applying redline.",
-        ConfidenceLevel.MEDIUM: f"Medium confidence ({confidence:.1f}%) - Pattern recognized but may need review. Suggesting redline.",
-        ConfidenceLevel.LOW: f"Low confidence ({confidence:.1f}%) - Uncertain pattern. Requiring validation."
-    }
-
-    return explanations.get(level, f"Confidence: {confidence:.1f}%")
+    return _EXPLANATION_TEMPLATES.get(level, "Confidence: {:.1f}%").format(confidence)
 
 # Export key functions and constants
 __all__ = [
@@ -225,6 +388,7 @@ __all__ = [
     'CONFIDENCE_THRESHOLDS',
     'PATTERN_CONFIDENCE_MAP',
     'calculate_redline_confidence',
+    'calculate_redline_confidence_batch',
     'should_validate_high_confidence',
     'get_confidence_explanation'
 ]
\ No newline at end of file
@@ -5,6 +5,7 @@ Application settings with validation and type safety
 from pydantic_settings import BaseSettings
 from pydantic import Field, validator
 from typing import Optional
+from functools import lru_cache
 import os
 
 class Settings(BaseSettings):
@@ -129,3 +130,13 @@ class Settings(BaseSettings):
 
         # Allow extra fields for forward compatibility
         extra = "ignore"
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Validated settings, loaded once per process
+    Use this instead of constructing Settings() so .env parsing and
+    validation run only on first access
+    """
+    return Settings()
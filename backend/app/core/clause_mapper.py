@@ -4,12 +4,75 @@ Handles conceptual clause descriptions from LLMs
 """
 
 import re
-import logging
+import importlib.util
+from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
-from rapidfuzz import fuzz
-from rapidfuzz import process
 
-logger = logging.getLogger(__name__)
+import structlog
+
+# rapidfuzz is imported on first fuzzy match (see _rapidfuzz); fail at import
+# time if it is missing so callers can still detect the mapper as unavailable
+if importlib.util.find_spec("rapidfuzz") is None:
+    raise ImportError("ClauseMapper requires rapidfuzz")
+
+# pyahocorasick (optional) finds every clause's exact position in one pass
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# rapidfuzz.process.cdist needs NumPy; without it clauses are scored one at a time
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+logger = structlog.get_logger(__name__)
+
+_PARAGRAPH_BREAK_RE = re.compile(r'\n\n+')
+_SENTENCE_BREAK_RE = re.compile(r'(?<=[.!?])\s+')
+
+# Potential headers at the start of a clause description
+_HEADER_PATTERNS = [
+    re.compile(r'^([A-Z][A-Za-z\s\-]+)[:.]'),  # "Non-Solicitation:"
+    re.compile(r'^(\d+\.?\s*[A-Z][A-Za-z\s\-]+)'),  # "1. Confidentiality"
+    re.compile(r'^([A-Z\s]+)[\s\-]'),  # "CONFIDENTIALITY -"
+]
+# Words used by the fuzzy-match prefilter
+_WORD_TOKEN_RE = re.compile(r'[a-z]{4,}')
+# A clause with at least this many distinct words, none of which occur in
+# the document, is not worth fuzzy matching
+_MIN_TOKENS_FOR_PREFILTER = 3
+
+# Lowercases ASCII letters only; equivalent to str.lower() on ASCII text
+_ASCII_LOWER = bytes.maketrans(bytes(range(0x41, 0x5B)), bytes(range(0x61, 0x7B)))
+_NEXT_HEADER_RE = re.compile(r'\n\n+\d*\.?\s*[A-Z][A-Za-z\s\-]+[:.]')
+
+
+_fuzz = None
+_process = None
+
+
+def _rapidfuzz():
+    """Import rapidfuzz on first use and return its (fuzz, process) modules"""
+    global _fuzz, _process
+    if _process is None:
+        from rapidfuzz import fuzz, process
+        _fuzz, _process = fuzz, process
+    return _fuzz, _process
+
+
+@dataclass(slots=True)
+class MapperStats:
+    """Cumulative ClauseMapper counters"""
+    total_attempts: int = 0
+    successful_matches: int = 0
+    fuzzy_matches: int = 0
+    exact_matches: int = 0
+    failed_matches: int = 0
+    confidence_sum: float = 0.0
 
 
 class ClauseMapper:
@@ -26,14 +89,18 @@ class ClauseMapper:
             confidence_threshold: Minimum confidence score (0-100) for accepting a match
         """
         self.confidence_threshold = confidence_threshold
-        self.stats = {
-            'total_attempts': 0,
-            'successful_matches': 0,
-            'fuzzy_matches': 0,
-            'exact_matches': 0,
-            'failed_matches': 0,
-            'average_confidence': 0.0
-        }
+        self.stats = MapperStats()
+        # Derived views of the current document: lowercased text and chunk
+        # lists keyed by chunk size
+        self._chunk_document: Optional[str] = None
+        self._document_lower: Optional[str] = None
+        self._document_ascii_lower: Optional[bytes] = None
+        self._document_tokens: Optional[set] = None
+        self._chunk_cache: Dict[int, Tuple[List[str], List[Tuple[int, int]]]] = {}
+        # Matches per clause, found in batch by convert_redlines_with_mapping
+        self._exact_matches: Dict[str, Optional[Tuple[int, int, str, float]]] = {}
+        self._case_insensitive_matches: Dict[str, Optional[Tuple[int, int, str, float]]] = {}
+        self._fuzzy_matches: Dict[str, Optional[Tuple[int, int, str, float]]] = {}
 
     def map_clause_to_position(
         self,
@@ -52,10 +119,10 @@ class ClauseMapper:
         Returns:
             Tuple of (start_pos, end_pos, matched_text, confidence) or None if not found
         """
-        self.stats['total_attempts'] += 1
+        self.stats.total_attempts += 1
 
         if not clause_description or not document_text:
-            self.stats['failed_matches'] += 1
+            self.stats.failed_matches += 1
             return None
 
         # Clean up the clause description
@@ -64,40 +131,30 @@ class ClauseMapper:
         # Strategy 1: Try exact match first
         exact_match = self._try_exact_match(clause_clean, document_text)
         if exact_match:
-            self.stats['successful_matches'] += 1
-            self.stats['exact_matches'] += 1
-            return exact_match
+            return self._record_match(exact_match, 'exact_matches')
 
         # Strategy 2: Try case-insensitive match
         case_insensitive_match = self._try_case_insensitive_match(clause_clean, document_text)
         if case_insensitive_match:
-            self.stats['successful_matches'] += 1
-            self.stats['exact_matches'] += 1
-            return case_insensitive_match
+            return self._record_match(case_insensitive_match, 'exact_matches')
 
         # Strategy 3: Extract key phrases and try fuzzy matching
         fuzzy_match = self._try_fuzzy_match(clause_clean, document_text)
         if fuzzy_match and fuzzy_match[3] >= self.confidence_threshold:
-            self.stats['successful_matches'] += 1
-            self.stats['fuzzy_matches'] += 1
-            return fuzzy_match
+            return self._record_match(fuzzy_match, 'fuzzy_matches')
 
         # Strategy 4: Try to find by clause title/header
         if indexer:
             header_match = self._try_header_match(clause_clean, document_text, indexer)
             if header_match:
-                self.stats['successful_matches'] += 1
-                self.stats['fuzzy_matches'] += 1
-                return header_match
+                return self._record_match(header_match, 'fuzzy_matches')
 
         # Strategy 5: Try partial match with first/last sentences
         anchor_match = self._try_anchor_match(clause_clean, document_text)
         if anchor_match and anchor_match[3] >= self.confidence_threshold:
-            self.stats['successful_matches'] += 1
-            self.stats['fuzzy_matches'] += 1
-            return anchor_match
+            return self._record_match(anchor_match, 'fuzzy_matches')
 
-        self.stats['failed_matches'] += 1
+        self.stats.failed_matches += 1
         logger.warning(
             f"Could not map clause to document position",
             clause_preview=clause_clean[:100],
@@ -105,8 +162,26 @@ class ClauseMapper:
         )
         return None
 
+    def _record_match(
+        self,
+        match: Tuple[int, int, str, float],
+        kind: str
+    ) -> Tuple[int, int, str, float]:
+        """Count a successful match of the given kind and return it"""
+        stats = self.stats
+        stats.successful_matches += 1
+        if kind == 'exact_matches':
+            stats.exact_matches += 1
+        else:
+            stats.fuzzy_matches += 1
+        stats.confidence_sum += match[3]
+        return match
+
     def _try_exact_match(self, clause: str, document: str) -> Optional[Tuple[int, int, str, float]]:
         """Try exact substring match"""
+        if clause in self._exact_matches and document is self._chunk_document:
+            return self._exact_matches[clause]
+
         pos = document.find(clause)
         if pos >= 0:
             return (pos, pos + len(clause), clause, 100.0)
@@ -114,9 +189,10 @@ class ClauseMapper:
 
     def _try_case_insensitive_match(self, clause: str, document: str) -> Optional[Tuple[int, int, str, float]]:
         """Try case-insensitive match"""
-        doc_lower = document.lower()
-        clause_lower = clause.lower()
-        pos = doc_lower.find(clause_lower)
+        if clause in self._case_insensitive_matches and document is self._chunk_document:
+            return self._case_insensitive_matches[clause]
+
+        pos = self._find_ignoring_case(clause, document)
         if pos >= 0:
             actual_text = document[pos:pos + len(clause)]
             return (pos, pos + len(clause), actual_text, 95.0)
@@ -127,13 +203,20 @@ class ClauseMapper:
         Try fuzzy matching using token sort ratio.
         Splits document into paragraphs and finds best match.
         """
+        if clause in self._fuzzy_matches and document is self._chunk_document:
+            return self._fuzzy_matches[clause]
+
+        if not self._may_fuzzy_match(clause, document):
+            return None
+
         # Split document into paragraphs or reasonable chunks
-        paragraphs = self._split_into_chunks(document)
+        paragraphs, spans = self._split_into_chunks(document)
 
         if not paragraphs:
             return None
 
         # Find the best matching paragraph
+        fuzz, process = _rapidfuzz()
         best_match = process.extractOne(
             clause,
             paragraphs,
@@ -142,28 +225,124 @@ class ClauseMapper:
         )
 
         if best_match:
-            matched_text, confidence, idx = best_match
-            # Find the position of this paragraph in the document
-            pos = document.find(matched_text)
-            if pos >= 0:
-                return (pos, pos + len(matched_text), matched_text, confidence)
+            _, confidence, idx = best_match
+            start, end = spans[idx]
+            return (start, end, document[start:end], confidence)
 
         return None
 
+    def _batch_literal_match(self, clauses: List[str], document: str) -> List[str]:
+        """
+        Find the exact and case-insensitive positions of all clauses and
+        remember them for _try_exact_match and _try_case_insensitive_match.
+
+        With pyahocorasick each search is a single pass over the document;
+        otherwise only the unmatched clauses are determined here.
+
+        Returns:
+            Clauses with neither an exact nor a case-insensitive match
+        """
+        self._exact_matches = {}
+        self._case_insensitive_matches = {}
+
+        if not AHOCORASICK_AVAILABLE or not clauses:
+            return [
+                clause for clause in clauses
+                if self._find_ignoring_case(clause, document) < 0
+            ]
+
+        doc_lower = self._lower_document(document)
+
+        # Strategy 1: first occurrence of each clause in the document
+        for clause, pos in self._first_occurrences(clauses, document).items():
+            self._exact_matches[clause] = (pos, pos + len(clause), clause, 100.0)
+
+        # Strategy 2: first occurrence of each remaining clause, ignoring case
+        remaining = [clause for clause in clauses if clause not in self._exact_matches]
+        lowered: Dict[str, List[str]] = {}
+        for clause in remaining:
+            lowered.setdefault(clause.lower(), []).append(clause)
+        for clause_lower, pos in self._first_occurrences(list(lowered), doc_lower).items():
+            for clause in lowered[clause_lower]:
+                self._case_insensitive_matches[clause] = (
+                    pos, pos + len(clause), document[pos:pos + len(clause)], 95.0
+                )
+
+        unmatched = []
+        for clause in remaining:
+            if clause not in self._case_insensitive_matches:
+                self._exact_matches[clause] = None
+                self._case_insensitive_matches[clause] = None
+                unmatched.append(clause)
+        return unmatched
+
+    @staticmethod
+    def _first_occurrences(needles: List[str], text: str) -> Dict[str, int]:
+        """Start position of the first occurrence of each needle found in text"""
+        if not needles:
+            return {}
+
+        automaton = ahocorasick.Automaton()
+        for needle in needles:
+            automaton.add_word(needle, needle)
+        automaton.make_automaton()
+
+        # Hits arrive in order of end position, so the first hit per needle
+        # is also its leftmost occurrence
+        positions: Dict[str, int] = {}
+        for end, needle in automaton.iter(text):
+            if needle not in positions:
+                positions[needle] = end - len(needle) + 1
+                if len(positions) == len(needles):
+                    break
+        return positions
+
+    def _batch_fuzzy_match(self, clauses: List[str], document: str):
+        """
+        Score all clauses against the document chunks in one cdist call and
+        remember each clause's best match for _try_fuzzy_match.
+        """
+        self._fuzzy_matches = {}
+        for clause in clauses:
+            if not self._may_fuzzy_match(clause, document):
+                self._fuzzy_matches[clause] = None
+        clauses = [clause for clause in clauses if clause not in self._fuzzy_matches]
+
+        if not NUMPY_AVAILABLE or len(clauses) < 2:
+            return
+
+        paragraphs, spans = self._split_into_chunks(document)
+        if not paragraphs:
+            return
+
+        fuzz, process = _rapidfuzz()
+        scores = process.cdist(
+            clauses,
+            paragraphs,
+            scorer=fuzz.token_sort_ratio,
+            score_cutoff=self.confidence_threshold,
+            dtype=np.float64,
+            workers=-1
+        )
+        best_indices = scores.argmax(axis=1)
+
+        for row, clause in enumerate(clauses):
+            idx = int(best_indices[row])
+            confidence = float(scores[row, idx])
+            if confidence >= self.confidence_threshold:
+                start, end = spans[idx]
+                self._fuzzy_matches[clause] = (start, end, document[start:end], confidence)
+            else:
+                self._fuzzy_matches[clause] = None
+
     def _try_header_match(self, clause: str, document: str, indexer) -> Optional[Tuple[int, int, str, float]]:
         """
         Try to match by clause title/header.
         Useful when LLM provides clause descriptions like "Non-Solicitation..."
         """
         # Extract potential header from clause description
-        header_patterns = [
-            r'^([A-Z][A-Za-z\s\-]+)[:.]',  # "Non-Solicitation:"
-            r'^(\d+\.?\s*[A-Z][A-Za-z\s\-]+)',  # "1. Confidentiality"
-            r'^([A-Z\s]+)[\s\-]',  # "CONFIDENTIALITY -"
-        ]
-
-        for pattern in header_patterns:
-            match = re.match(pattern, clause)
+        for pattern in _HEADER_PATTERNS:
+            match = pattern.match(clause)
             if match:
                 header = match.group(1).strip()
                 # Try to find this header in the document
@@ -185,7 +364,8 @@ class ClauseMapper:
             last_anchor = clause[-anchor_length:]
 
             # Try fuzzy match with anchors
-            chunks = self._split_into_chunks(document, chunk_size=500)
+            chunks, spans = self._split_into_chunks(document, chunk_size=500)
+            fuzz, process = _rapidfuzz()
 
             # Try first anchor
             best_match = process.extractOne(
@@ -196,10 +376,9 @@ class ClauseMapper:
             )
 
             if best_match:
-                matched_text, confidence, idx = best_match
-                pos = document.find(matched_text)
-                if pos >= 0:
-                    return (pos, pos + len(matched_text), matched_text, confidence)
+                _, confidence, idx = best_match
+                start, end = spans[idx]
+                return (start, end, document[start:end], confidence)
 
             # Try last anchor
             best_match = process.extractOne(
@@ -210,74 +389,136 @@ class ClauseMapper:
             )
 
             if best_match:
-                matched_text, confidence, idx = best_match
-                pos = document.find(matched_text)
-                if pos >= 0:
-                    return (pos, pos + len(matched_text), matched_text, confidence)
+                _, confidence, idx = best_match
+                start, end = spans[idx]
+                return (start, end, document[start:end], confidence)
 
         return None
 
-    def _split_into_chunks(self, document: str, chunk_size: int = 300) -> List[str]:
+    def _bind_document(self, document: str):
+        """Drop cached views when a different document is being mapped"""
+        if document is not self._chunk_document:
+            self._chunk_document = document
+            self._document_lower = None
+            self._document_ascii_lower = None
+            self._document_tokens = None
+            self._chunk_cache = {}
+
+    def _lower_document(self, document: str) -> str:
+        """Lowercased document, computed once per document"""
+        self._bind_document(document)
+        if self._document_lower is None:
+            self._document_lower = document.lower()
+        return self._document_lower
+
+    def _may_fuzzy_match(self, clause: str, document: str) -> bool:
+        """
+        Cheap prefilter for the fuzzy strategy: False when the clause has
+        several words and none of them occurs anywhere in the document.
+        """
+        clause_tokens = set(_WORD_TOKEN_RE.findall(clause.lower()))
+        if len(clause_tokens) < _MIN_TOKENS_FOR_PREFILTER:
+            return True
+
+        self._bind_document(document)
+        if self._document_tokens is None:
+            self._document_tokens = set(_WORD_TOKEN_RE.findall(self._lower_document(document)))
+        return not clause_tokens.isdisjoint(self._document_tokens)
+
+    def _find_ignoring_case(self, clause: str, document: str) -> int:
+        """
+        Case-insensitive find. ASCII text (the common case for contracts) is
+        compared as bytes lowered with a translation table, where offsets
+        match string offsets; anything else uses str.lower().
+        """
+        self._bind_document(document)
+        if document.isascii() and clause.isascii():
+            if self._document_ascii_lower is None:
+                self._document_ascii_lower = document.encode('ascii').translate(_ASCII_LOWER)
+            return self._document_ascii_lower.find(clause.encode('ascii').translate(_ASCII_LOWER))
+        return self._lower_document(document).find(clause.lower())
+
+    def _split_into_chunks(
+        self,
+        document: str,
+        chunk_size: int = 300
+    ) -> Tuple[List[str], List[Tuple[int, int]]]:
         """
         Split document into manageable chunks for fuzzy matching.
         Tries to split on paragraph boundaries when possible.
+        Results are cached for the most recent document.
+
+        Returns:
+            Tuple of (chunks, spans) where spans[i] is the (start, end) range in
+            the document covered by chunks[i]
         """
-        # First try to split by paragraphs
-        paragraphs = re.split(r'\n\n+', document)
+        self._bind_document(document)
+        cached = self._chunk_cache.get(chunk_size)
+        if cached is not None:
+            return cached
 
         chunks = []
-        for para in paragraphs:
+        spans = []
+        for para_start, para_end in self._iter_segments(_PARAGRAPH_BREAK_RE, document, 0, len(document)):
+            para = document[para_start:para_end]
             if len(para) <= chunk_size:
                 if para.strip():  # Skip empty paragraphs
                     chunks.append(para)
+                    spans.append((para_start, para_end))
             else:
                 # Split large paragraphs into sentences
-                sentences = re.split(r'(?<=[.!?])\s+', para)
                 current_chunk = ""
-                for sent in sentences:
+                current_start = current_end = para_start
+                for sent_start, sent_end in self._iter_segments(_SENTENCE_BREAK_RE, document, para_start, para_end):
+                    sent = document[sent_start:sent_end]
                     if len(current_chunk) + len(sent) <= chunk_size:
+                        if not current_chunk:
+                            current_start = sent_start
                         current_chunk += " " + sent if current_chunk else sent
                     else:
                         if current_chunk:
                             chunks.append(current_chunk)
+                            spans.append((current_start, current_end))
                         current_chunk = sent
+                        current_start = sent_start
+                    current_end = sent_end
                 if current_chunk:
                     chunks.append(current_chunk)
+                    spans.append((current_start, current_end))
+
+        self._chunk_cache[chunk_size] = (chunks, spans)
+        return chunks, spans
 
-        return chunks
+    @staticmethod
+    def _iter_segments(separator, text: str, start: int, end: int):
+        """Yield (start, end) of the pieces of text[start:end] between separator matches"""
+        pos = start
+        for match in separator.finditer(text, start, end):
+            yield pos, match.start()
+            pos = match.end()
+        yield pos, end
 
     def _find_header_position(self, header: str, document: str) -> Optional[Tuple[int, int, str, float]]:
         """Find a header/title in the document with fuzzy matching"""
-        # Look for the header with various formatting
-        patterns = [
-            f"{header}",
-            f"{header}:",
-            f"{header}.",
-            f"{header} -",
-            f"\\b{re.escape(header)}\\b"
-        ]
-
-        for pattern in patterns:
-            matches = list(re.finditer(pattern, document, re.IGNORECASE))
-            if matches:
-                match = matches[0]
-                # Find the end of this section (next header or paragraph break)
-                section_end = self._find_section_end(document, match.end())
-                section_text = document[match.start():section_end]
-                return (match.start(), section_end, section_text, 90.0)
+        # The bare header pattern matches wherever any decorated form
+        # ("header:", "header.", "header -", word-bounded) would, so it is the
+        # only search needed
+        match = re.search(header, document, re.IGNORECASE)
+        if match:
+            # Find the end of this section (next header or paragraph break)
+            section_end = self._find_section_end(document, match.end())
+            section_text = document[match.start():section_end]
+            return (match.start(), section_end, section_text, 90.0)
 
         return None
 
     def _find_section_end(self, document: str, start_pos: int) -> int:
         """Find the end of a section starting from a position"""
         # Look for next header or double newline
-        next_header = re.search(
-            r'\n\n+\d*\.?\s*[A-Z][A-Za-z\s\-]+[:.]',
-            document[start_pos:]
-        )
+        next_header = _NEXT_HEADER_RE.search(document, start_pos)
 
         if next_header:
-            return start_pos + next_header.start()
+            return next_header.start()
 
         # Look for double newline
         next_break = document.find('\n\n', start_pos)
@@ -289,22 +530,20 @@ class ClauseMapper:
 
     def get_stats(self) -> Dict:
         """Get mapping statistics"""
-        if self.stats['successful_matches'] > 0:
-            self.stats['average_confidence'] = (
-                self.stats['average_confidence'] / self.stats['successful_matches']
-            )
-
         return {
-            'total_attempts': self.stats['total_attempts'],
-            'successful_matches': self.stats['successful_matches'],
+            'total_attempts': self.stats.total_attempts,
+            'successful_matches': self.stats.successful_matches,
             'success_rate': (
-                self.stats['successful_matches'] / self.stats['total_attempts'] * 100
-                if self.stats['total_attempts'] > 0 else 0
+                self.stats.successful_matches / self.stats.total_attempts * 100
+                if self.stats.total_attempts > 0 else 0
             ),
-            'exact_matches': self.stats['exact_matches'],
-            'fuzzy_matches': self.stats['fuzzy_matches'],
-            'failed_matches': self.stats['failed_matches'],
-            'average_confidence': self.stats['average_confidence']
+            'exact_matches': self.stats.exact_matches,
+            'fuzzy_matches': self.stats.fuzzy_matches,
+            'failed_matches': self.stats.failed_matches,
+            'average_confidence': (
+                self.stats.confidence_sum / self.stats.successful_matches
+                if self.stats.successful_matches > 0 else 0.0
+            )
         }
 
     def convert_redlines_with_mapping(
@@ -324,14 +563,31 @@ class ClauseMapper:
         Returns:
             Tuple of (converted_redlines, conversion_stats)
         """
+        self._chunk_document = None
+
+        # Locate all clauses literally in one pass, then score the ones that
+        # are left in one fuzzy batch
+        clauses = sorted({
+            clause_clean
+            for clause_clean in (
+                (redline.get('clause', '') or redline.get('original_text', '')).strip()
+                for redline in claude_redlines
+                if not all(key in redline for key in ['start', 'end', 'original_text'])
+            )
+            if clause_clean
+        })
+        unmatched = self._batch_literal_match(clauses, document_text)
+        self._batch_fuzzy_match(unmatched, document_text)
+
         converted = []
         stats = {
             'total': len(claude_redlines),
             'converted': 0,
             'already_formatted': 0,
-            'failed': 0,
-            'confidence_scores': []
+            'failed': 0
         }
+        confidence_sum = 0.0
+        match_cache: Dict[str, Optional[Tuple[int, int, str, float]]] = {}
 
         for redline in claude_redlines:
             # Check if already in correct format
@@ -348,8 +604,13 @@ class ClauseMapper:
                 stats['failed'] += 1
                 continue
 
-            # Use the mapper to find position
-            match_result = self.map_clause_to_position(clause_text, document_text, indexer)
+            # Use the mapper to find position, once per distinct clause
+            clause_key = clause_text.strip()
+            if clause_key in match_cache:
+                match_result = match_cache[clause_key]
+            else:
+                match_result = self.map_clause_to_position(clause_text, document_text, indexer)
+                match_cache[clause_key] = match_result
 
             if match_result:
                 start, end, matched_text, confidence = match_result
@@ -368,7 +629,7 @@ class ClauseMapper:
                 })
 
                 stats['converted'] += 1
-                stats['confidence_scores'].append(confidence)
+                confidence_sum += confidence
 
                 logger.debug(
                     f"Successfully mapped clause to position",
@@ -383,10 +644,9 @@ class ClauseMapper:
                 stats['failed'] += 1
 
         # Calculate average confidence
-        if stats['confidence_scores']:
-            stats['average_confidence'] = sum(stats['confidence_scores']) / len(stats['confidence_scores'])
-        else:
-            stats['average_confidence'] = 0
+        stats['average_confidence'] = (
+            confidence_sum / stats['converted'] if stats['converted'] else 0
+        )
 
         # Log summary
         logger.info(
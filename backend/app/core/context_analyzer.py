@@ -3,9 +3,214 @@ Contextual Intelligence Analyzer
 Analyzes existing document terms to determine what's already reasonable
 """
 import re
-from typing import Dict, Optional, List, Tuple
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional, List, Tuple
 from enum import Enum
 
+# google-re2 (optional) matches in linear time; lazy patterns like
+# 'retain.*?copy' backtrack quadratically in re on repetitive text
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+
+# Patterns are written in lowercase and compiled for two scan forms. ASCII
+# documents are lowercased once and scanned case-sensitively with the lower
+# form, which lets the regex engine skip ahead on literal prefixes; other text
+# is scanned with the raw, re.IGNORECASE form. Lower forms with an unbounded
+# '.*' use re2 when it is installed; re is faster on the rest, which start
+# with a literal it can skip to. The raw form keeps re's Unicode case folding.
+_LOWER, _RAW = 0, 1
+
+
+class _Pattern(NamedTuple):
+    """A lowercase pattern in both scan forms, plus the literals any match contains"""
+    lower: "re.Pattern"  # or re2._Regexp
+    raw: re.Pattern
+    # Every group must have a member in the document for the pattern to match
+    requires: Tuple[Tuple[str, ...], ...]
+
+
+def _compile(pattern: str, flags: int = 0, requires: Tuple[Tuple[str, ...], ...] = ()) -> _Pattern:
+    """Compile a lowercase pattern for both scan forms."""
+    return _Pattern(
+        _compile_lower(pattern, flags),
+        re.compile(pattern, flags | re.IGNORECASE),
+        requires
+    )
+
+
+def _compile_lower(pattern: str, flags: int):
+    """Compile the case-sensitive form, with re2 when it can backtrack badly"""
+    if not RE2_AVAILABLE or '.*' not in pattern:
+        return re.compile(pattern, flags)
+    options = re2.Options()
+    options.dot_nl = bool(flags & re.DOTALL)
+    # Compiled for bytes: lower forms only scan ASCII, and re2 converts match
+    # offsets of str haystacks at a cost comparable to the search itself
+    return re2.compile(pattern.encode('ascii'), options)
+
+
+def _ascii_lower(text: str) -> Optional[str]:
+    """
+    Lowercase copy of text, or None if it is not ASCII.
+
+    Only for ASCII text do str.lower() offsets line up with the original and
+    agree with re.IGNORECASE matching.
+    """
+    return text.lower() if text.isascii() else None
+
+
+class _Scan:
+    """
+    A document prepared once and shared by every extractor.
+
+    Keyword lookups are memoized, so a literal needed by several patterns is
+    looked for once per document, and patterns whose literals are absent are
+    never run.
+    """
+
+    __slots__ = ('haystack', 'form', '_found', '_encoded')
+
+    def __init__(self, text: str):
+        lowered = _ascii_lower(text)
+        self.haystack, self.form = (text, _RAW) if lowered is None else (lowered, _LOWER)
+        self._found: Dict[str, bool] = {}
+        self._encoded: Optional[bytes] = None
+
+    def contains(self, keyword: str) -> bool:
+        """Whether the document may contain keyword (always True for raw scans)"""
+        if self.form == _RAW:
+            return True
+        found = self._found.get(keyword)
+        if found is None:
+            found = self._found[keyword] = keyword in self.haystack
+        return found
+
+    def find(self, keyword: str) -> int:
+        """Offset of the first occurrence of keyword, 0 for raw scans, -1 if absent"""
+        return self.haystack.find(keyword) if self.form == _LOWER else 0
+
+    def lower_prefix(self, length: int) -> str:
+        """Lowercased first length characters of the document"""
+        prefix = self.haystack[:length]
+        return prefix if self.form == _LOWER else prefix.lower()
+
+    def search(self, pattern: _Pattern, pos: int = 0) -> Optional[re.Match]:
+        """Search the document, skipping patterns whose literals are absent"""
+        for group in pattern.requires:
+            if not any(self.contains(keyword) for keyword in group):
+                return None
+        regex = pattern[self.form]
+        if isinstance(regex.pattern, bytes):
+            # re2 form: groups are bytes, so callers read captures by span
+            if self._encoded is None:
+                self._encoded = self.haystack.encode('ascii')
+            return regex.search(self._encoded, pos)
+        return regex.search(self.haystack, pos)
+
+
+_YEAR = ('year',)
+_MONTH = ('month',)
+_COPY = ('copy', 'copies', 'record')
+_CONFIDENTIAL = ('confidential', 'material')
+
+# Term length, in order of precedence: years, then months, then perpetual
+_YEAR_PATTERNS = [
+    _compile(r'(?:expire|term of|period of|for)\s+(?:a\s+period\s+of\s+)?(\d+)\s*years?', requires=(_YEAR,)),
+    _compile(r'(\d+)\s*years?\s+(?:from|after|following)', requires=(_YEAR,)),
+    _compile(r'(\d+)[-\s]*year\s+(?:term|period)', requires=(_YEAR,)),
+]
+
+_MONTH_PATTERNS = [
+    _compile(r'(?:expire|term of|period of|for)\s+(\d+)\s*months?', requires=(_MONTH,)),
+    _compile(r'(\d+)\s*months?\s+(?:from|after|following)', requires=(_MONTH,)),
+]
+
+_PERPETUAL_RE = _compile(
+    r'\b(?:perpetual|indefinite|no\s+expir)',
+    requires=(('perpetual', 'indefinite', 'expir'),)
+)
+
+_GOV_LAW_PATTERNS = [
+    _compile(
+        r'governed?\s+by\s+(?:the\s+)?laws?\s+of\s+(?:the\s+)?(?:state\s+of\s+)?(\w+)',
+        requires=(('govern',), ('law',))
+    ),
+    _compile(
+        r'laws?\s+of\s+(?:the\s+)?(?:state\s+of\s+)?(\w+)\s+(?:shall\s+)?govern',
+        requires=(('govern',), ('law',))
+    ),
+]
+# Literal each governing law pattern starts with, in the same order
+_GOV_LAW_ANCHORS = ('govern', 'law')
+
+_RETENTION_PATTERNS = [
+    _compile(r'retain.*?(?:copy|copies|record)', requires=(('retain',), _COPY)),
+    _compile(r'keep.*?(?:copy|copies|record)', requires=(('keep',), _COPY)),
+    _compile(r'file.*?retention', requires=(('file',), ('retention',))),
+    _compile(r'regulatory.*?requirement', requires=(('regulatory',), ('requirement',))),
+    _compile(r'legal.*?requirement', requires=(('legal',), ('requirement',))),
+    _compile(r'archival.*?(?:purpose|copy)', requires=(('archival',), ('purpose', 'copy'))),
+]
+
+_NON_SOLICIT_EXCEPTION_PATTERNS = {
+    'general_advertising': _compile(
+        r'general\s+(?:public\s+)?advertis',
+        requires=(('general',), ('advertis',))
+    ),
+    'employee_initiated': _compile(
+        r'employee.*?initiat|initiat.*?employee',
+        requires=(('employee',), ('initiat',))
+    ),
+    'prior_discussions': _compile(
+        r'prior.*?(?:discuss|contact)|discuss.*?prior',
+        requires=(('prior',), ('discuss', 'contact'))
+    ),
+    'terminated_employees': _compile(
+        r'(?:terminated|former).*?employee',
+        requires=(('terminated', 'former'), ('employee',))
+    ),
+}
+
+# The employee branch stays within one sentence so that every "employee"
+# mention cannot scan ahead to the end of the document
+_NON_SOLICIT_SECTION_RE = _compile(
+    r'(?:non[-\s]?solicitation|employee[^.\n]{0,200}?solicitation).{0,500}',
+    re.DOTALL,
+    requires=(('solicitation',),)
+)
+# Case-sensitive, applied to the section as written
+_SECTION_YEARS_RE = re.compile(r'(\d+)\s*years?')
+_SECTION_MONTHS_RE = re.compile(r'(\d+)\s*months?')
+
+_RETURN_PATTERNS = [
+    _compile(r'return.*?(?:confidential|material)', requires=(('return',), _CONFIDENTIAL)),
+    _compile(r'destroy.*?(?:confidential|material)', requires=(('destroy',), _CONFIDENTIAL)),
+    _compile(
+        r'(?:return|destruct).*?(?:upon|within).*?(?:request|termination)',
+        requires=(('return', 'destruct'), ('upon', 'within'), ('request', 'termination'))
+    ),
+]
+
+_GEO_PATTERNS = [
+    _compile(
+        r'(?:within|in)\s+(?:the\s+)?(\w+(?:\s+\w+)?)\s+(?:where|in which)',
+        requires=(('where', 'in which'),)
+    ),
+    _compile(
+        r'geographic.*?(?:area|scope|region).*?(\w+(?:\s+\w+)?)',
+        requires=(('geographic',), ('area', 'scope', 'region'))
+    ),
+]
+
+_WORLDWIDE_RE = _compile(
+    r'\b(?:worldwide|globally|international)',
+    requires=(('worldwide', 'globally', 'international'),)
+)
+
 
 class DocumentType(Enum):
     """Types of NDAs"""
@@ -37,25 +242,72 @@ class ContextualAnalyzer:
         'Texas', 'Illinois', 'Massachusetts'
     ]
 
+    # Rule type -> predicate on the analyzed context that makes the rule unnecessary
+    _SKIP_HANDLERS = {
+        # Don't change reasonable confidentiality terms (12-36 months)
+        'confidentiality_term': lambda context: context.get('term_is_reasonable'),
+        # Don't change if governing law is already a preferred jurisdiction
+        'governing_law': lambda context: context.get('jurisdiction_is_reasonable'),
+        # Don't modify non-solicit if duration is already reasonable and it
+        # has at least 2 exceptions; only add missing exceptions otherwise
+        'employee_solicitation': lambda context: (
+            context.get('non_solicit_is_reasonable')
+            and context.get('non_solicit_exceptions', 0) >= 2
+        ),
+        # Don't add return provision if one already exists
+        'return_destruction': lambda context: context.get('has_return_provision'),
+        # Don't add retention carveout if one already exists
+        'retention_exception': lambda context: context.get('has_retention_carveout'),
+    }
+
+    # Number of recently analyzed documents to keep results for
+    ANALYSIS_CACHE_SIZE = 64
+
+    def __init__(self):
+        # working_text -> analysis, least recently used first
+        self._analysis_cache: "OrderedDict[str, Dict]" = OrderedDict()
+
     def analyze_existing_terms(self, working_text: str) -> Dict:
         """
         Identify what reasonable terms already exist in the document
 
+        Analysis is pure on the text, so results for recently analyzed
+        documents are reused. Each call returns a fresh dict.
+
         Returns dict with analysis of existing provisions
         """
 
-        first_1000_chars = working_text[:1000].lower()
+        cached = self._analysis_cache.get(working_text)
+        if cached is None:
+            cached = self._analyze(working_text)
+            self._analysis_cache[working_text] = cached
+            if len(self._analysis_cache) > self.ANALYSIS_CACHE_SIZE:
+                self._analysis_cache.popitem(last=False)
+        else:
+            self._analysis_cache.move_to_end(working_text)
+
+        return dict(cached)
+
+    def _analyze(self, working_text: str) -> Dict:
+        """Analyze existing provisions without consulting the cache"""
+
+        # Lowercased once and shared by every extractor
+        scan = _Scan(working_text)
+        first_1000_chars = scan.lower_prefix(1000)
+        document_type = self._identify_nda_type(working_text, first_1000_chars)
 
         existing_terms = {
-            'term_length_months': self._extract_term_length(working_text),
-            'governing_law': self._extract_governing_law(working_text),
-            'has_retention_carveout': self._has_retention_exception(working_text),
-            'non_solicit_exceptions': self._count_non_solicit_exceptions(working_text),
-            'non_solicit_duration_months': self._extract_non_solicit_duration(working_text),
-            'is_mutual': 'mutual' in first_1000_chars or 'each party' in first_1000_chars,
-            'document_type': self._identify_nda_type(working_text),
-            'has_return_provision': self._has_return_provision(working_text),
-            'geographic_scope': self._extract_geographic_scope(working_text)
+            'term_length_months': self._extract_term_length(working_text, scan),
+            'governing_law': self._extract_governing_law(working_text, scan),
+            'has_retention_carveout': self._has_retention_exception(working_text, scan),
+            'non_solicit_exceptions': self._count_non_solicit_exceptions(working_text, scan),
+            'non_solicit_duration_months': self._extract_non_solicit_duration(
+                working_text, scan
+            ),
+            'is_mutual': document_type is DocumentType.MUTUAL,
+            'document_type': document_type,
+            'has_return_provision': self._has_return_provision(working_text, scan),
+            'geographic_scope': self._extract_geographic_scope(working_text, scan)
         }
 
         # Add reasonableness assessments
@@ -71,51 +323,45 @@ class ContextualAnalyzer:
 
         return existing_terms
 
-    def _extract_term_length(self, text: str) -> Optional[int]:
+    def _extract_term_length(self, text: str, scan: Optional[_Scan] = None) -> Optional[int]:
         """Extract existing confidentiality term in months"""
 
+        if scan is None:
+            scan = _Scan(text)
+
         # Pattern for years
-        year_patterns = [
-            r'(?:expire|term of|period of|for)\s+(?:a\s+period\s+of\s+)?(\d+)\s*years?',
-            r'(\d+)\s*years?\s+(?:from|after|following)',
-            r'(\d+)[-\s]*year\s+(?:term|period)',
-        ]
-
-        for pattern in year_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _YEAR_PATTERNS:
+            match = scan.search(pattern)
             if match:
                 years = int(match.group(1))
                 return years * 12  # Convert to months
 
         # Pattern for months
-        month_patterns = [
-            r'(?:expire|term of|period of|for)\s+(\d+)\s*months?',
-            r'(\d+)\s*months?\s+(?:from|after|following)',
-        ]
-
-        for pattern in month_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _MONTH_PATTERNS:
+            match = scan.search(pattern)
             if match:
                 return int(match.group(1))
 
         # Check for perpetual/indefinite (red flag)
-        if re.search(r'\b(?:perpetual|indefinite|no\s+expir)', text, re.IGNORECASE):
+        if scan.search(_PERPETUAL_RE):
             return 999  # Flag as unreasonably long
 
         return None
 
-    def _extract_governing_law(self, text: str) -> Optional[str]:
+    def _extract_governing_law(self, text: str, scan: Optional[_Scan] = None) -> Optional[str]:
         """Extract governing law jurisdiction"""
 
-        patterns = [
-            r'governed?\s+by\s+(?:the\s+)?laws?\s+of\s+(?:the\s+)?(?:State\s+of\s+)?(\w+)',
-            r'laws?\s+of\s+(?:the\s+)?(?:State\s+of\s+)?(\w+)\s+(?:shall\s+)?govern',
-        ]
+        if scan is None:
+            scan = _Scan(text)
 
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern, anchor in zip(_GOV_LAW_PATTERNS, _GOV_LAW_ANCHORS):
+            # The clause is usually near the end; start at the first anchor
+            start = scan.find(anchor)
+            if start < 0:
+                continue
+            match = scan.search(pattern, start)
             if match:
-                jurisdiction = match.group(1).strip()
+                jurisdiction = text[match.start(1):match.end(1)].strip()
                 # Normalize common variations
                 if jurisdiction.lower() in ['delaware', 'de']:
                     return 'Delaware'
@@ -127,71 +373,64 @@ class ContextualAnalyzer:
 
         return None
 
-    def _has_retention_exception(self, text: str) -> bool:
+    def _has_retention_exception(self, text: str, scan: Optional[_Scan] = None) -> bool:
         """Check if document has reasonable retention exception"""
 
-        retention_keywords = [
-            r'retain.*?(?:copy|copies|record)',
-            r'keep.*?(?:copy|copies|record)',
-            r'file.*?retention',
-            r'regulatory.*?requirement',
-            r'legal.*?requirement',
-            r'archival.*?(?:purpose|copy)'
-        ]
-
-        for keyword in retention_keywords:
-            if re.search(keyword, text, re.IGNORECASE):
+        if scan is None:
+            scan = _Scan(text)
+
+        for keyword in _RETENTION_PATTERNS:
+            if scan.search(keyword):
                 return True
 
         return False
 
-    def _count_non_solicit_exceptions(self, text: str) -> int:
+    def _count_non_solicit_exceptions(self, text: str, scan: Optional[_Scan] = None) -> int:
         """Count number of non-solicitation exceptions present"""
 
-        exceptions = {
-            'general_advertising': r'general\s+(?:public\s+)?advertis',
-            'employee_initiated': r'employee.*?initiat|initiat.*?employee',
-            'prior_discussions': r'prior.*?(?:discuss|contact)|discuss.*?prior',
-            'terminated_employees': r'(?:terminated|former).*?employee'
-        }
+        if scan is None:
+            scan = _Scan(text)
 
         count = 0
-        for exception_type, pattern in exceptions.items():
-            if re.search(pattern, text, re.IGNORECASE):
+        for exception_type, pattern in _NON_SOLICIT_EXCEPTION_PATTERNS.items():
+            if scan.search(pattern):
                 count += 1
 
         return count
 
-    def _extract_non_solicit_duration(self, text: str) -> Optional[int]:
+    def _extract_non_solicit_duration(
+        self,
+        text: str,
+        scan: Optional[_Scan] = None
+    ) -> Optional[int]:
         """Extract non-solicitation duration in months"""
 
+        if scan is None:
+            scan = _Scan(text)
         # Look for non-solicit section
-        non_solicit_section = re.search(
-            r'(?:non[-\s]?solicitation|employee.*?solicitation).{0,500}',
-            text,
-            re.IGNORECASE | re.DOTALL
-        )
+        non_solicit_section = scan.search(_NON_SOLICIT_SECTION_RE)
 
         if not non_solicit_section:
             return None
 
-        section_text = non_solicit_section.group(0)
+        section_text = text[non_solicit_section.start():non_solicit_section.end()]
 
         # Extract duration
-        year_match = re.search(r'(\d+)\s*years?', section_text)
+        year_match = _SECTION_YEARS_RE.search(section_text)
         if year_match:
             return int(year_match.group(1)) * 12
 
-        month_match = re.search(r'(\d+)\s*months?', section_text)
+        month_match = _SECTION_MONTHS_RE.search(section_text)
         if month_match:
             return int(month_match.group(1))
 
         return None
 
-    def _identify_nda_type(self, text: str) -> DocumentType:
+    def _identify_nda_type(self, text: str, first_1000: Optional[str] = None) -> DocumentType:
         """Identify if NDA is mutual, one-way, or multi-party"""
 
-        first_1000 = text[:1000].lower()
+        if first_1000 is None:
+            first_1000 = text[:1000].lower()
 
         if 'mutual' in first_1000 or 'each party' in first_1000:
             return DocumentType.MUTUAL
@@ -200,36 +439,31 @@ class ContextualAnalyzer:
         else:
             return DocumentType.ONE_WAY
 
-    def _has_return_provision(self, text: str) -> bool:
+    def _has_return_provision(self, text: str, scan: Optional[_Scan] = None) -> bool:
         """Check if document has return/destruction provision"""
 
-        return_keywords = [
-            r'return.*?(?:confidential|material)',
-            r'destroy.*?(?:confidential|material)',
-            r'(?:return|destruct).*?(?:upon|within).*?(?:request|termination)'
-        ]
+        if scan is None:
+            scan = _Scan(text)
 
-        for keyword in return_keywords:
-            if re.search(keyword, text, re.IGNORECASE):
+        for keyword in _RETURN_PATTERNS:
+            if scan.search(keyword):
                 return True
 
         return False
 
-    def _extract_geographic_scope(self, text: str) -> Optional[str]:
+    def _extract_geographic_scope(self, text: str, scan: Optional[_Scan] = None) -> Optional[str]:
         """Extract geographic scope of restrictions"""
 
-        geo_patterns = [
-            r'(?:within|in)\s+(?:the\s+)?(\w+(?:\s+\w+)?)\s+(?:where|in which)',
-            r'geographic.*?(?:area|scope|region).*?(\w+(?:\s+\w+)?)',
-        ]
+        if scan is None:
+            scan = _Scan(text)
 
-        for pattern in geo_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _GEO_PATTERNS:
+            match = scan.search(pattern)
             if match:
-                return match.group(1).strip()
+                return text[match.start(1):match.end(1)].strip()
 
         # Check for worldwide
-        if re.search(r'\b(?:worldwide|globally|international)', text, re.IGNORECASE):
+        if scan.search(_WORLDWIDE_RE):
             return 'Worldwide'
 
         return None
@@ -268,33 +502,9 @@ class ContextualAnalyzer:
 
         rule_type = rule.get('type') or rule.get('clause_type')
 
-        # Don't change reasonable confidentiality terms (12-36 months)
-        if rule_type == 'confidentiality_term':
-            if context.get('term_is_reasonable'):
-                return False  # Term is already in acceptable range
-
-        # Don't change if governing law is already a preferred jurisdiction
-        if rule_type == 'governing_law':
-            if context.get('jurisdiction_is_reasonable'):
-                return False
-
-        # Don't modify non-solicit if duration is already reasonable
-        if rule_type == 'employee_solicitation':
-            if context.get('non_solicit_is_reasonable'):
-                # Only add missing exceptions, don't rewrite whole clause
-                existing_exceptions = context.get('non_solicit_exceptions', 0)
-                if existing_exceptions >= 2:  # Has at least 2 exceptions
-                    return False
-
-        # Don't add return provision if one already exists
-        if rule_type == 'return_destruction':
-            if context.get('has_return_provision'):
-                return False
-
-        # Don't add retention carveout if one already exists
-        if rule_type == 'retention_exception':
-            if context.get('has_retention_carveout'):
-                return False
+        handler = self._SKIP_HANDLERS.get(rule_type)
+        if handler and handler(context):
+            return False  # Existing term is already acceptable
 
         return True  # Apply the rule
 
@@ -3,14 +3,47 @@ TrackChangesEngine - Generate Microsoft Word-compatible tracked revisions
 Manipulates OXML (Open XML) directly to create w:del and w:ins elements
 """
 from docx import Document
-from docx.oxml import parse_xml
-from docx.oxml.ns import qn
+from docx.oxml.ns import nsmap, qn
+from docx.oxml.parser import oxml_parser
 from lxml import etree
+from collections import defaultdict
+from operator import itemgetter
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional, Tuple
 from .text_indexer import WorkingTextIndexer, TextMapping
+import sys
 import uuid
 
+# rapidfuzz (optional) scores fuzzy text matches in C++; difflib is the fallback
+try:
+    from rapidfuzz import fuzz
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    from difflib import SequenceMatcher
+    RAPIDFUZZ_AVAILABLE = False
+
+# Qualified names resolved once rather than per element
+_W_NSMAP = {'w': nsmap['w']}
+_W_DEL = qn('w:del')
+_W_INS = qn('w:ins')
+_W_R = qn('w:r')
+_W_T = qn('w:t')
+_W_ID = qn('w:id')
+_W_AUTHOR = qn('w:author')
+_W_DATE = qn('w:date')
+_W_TRACK_REVISIONS = qn('w:trackRevisions')
+_XML_SPACE = qn('xml:space')
+
+
+def _w_element(tag: str, attrs: Optional[Dict[str, str]] = None):
+    """
+    Create a w: element from its qualified name.
+
+    Same as docx.oxml.OxmlElement, which returns python-docx's element
+    classes, but without re-parsing the prefixed tag on every call.
+    """
+    return oxml_parser.makeelement(tag, attrib=attrs, nsmap=_W_NSMAP)
+
 
 class TrackChangesEngine:
     """
@@ -26,7 +59,8 @@ class TrackChangesEngine:
     def __init__(self, author: str = "ndaOK"):
         self.author = author
         self.revision_id = 1
-        self.timestamp = datetime.now().isoformat()
+        # One shared string for the w:date of every revision from this engine
+        self.timestamp = sys.intern(datetime.now().isoformat())
 
     def apply_deletion(self, paragraph, run, text_to_delete: str) -> bool:
         """
@@ -45,19 +79,10 @@ class TrackChangesEngine:
             r_elem = run._element
 
             # Create w:del element
-            del_elem = parse_xml(
-                f'<w:del xmlns:w="{qn("w")}" '
-                f'w:id="{self.revision_id}" '
-                f'w:author="{self.author}" '
-                f'w:date="{self.timestamp}"/>'
-            )
+            del_elem = self._revision_element(_W_DEL)
 
             # Find the run in the paragraph and wrap it
-            run_index = None
-            for i, child in enumerate(p_elem):
-                if child == r_elem:
-                    run_index = i
-                    break
+            run_index = self._child_index(p_elem, r_elem)
 
             if run_index is not None:
                 # Remove the run from paragraph
@@ -98,19 +123,10 @@ class TrackChangesEngine:
             p_elem = paragraph._element
 
             # Create new run with the text
-            new_run = parse_xml(
-                f'<w:r xmlns:w="{qn("w")}">'
-                f'<w:t xml:space="preserve">{self._escape_xml(new_text)}</w:t>'
-                f'</w:r>'
-            )
+            new_run = self._text_run(new_text)
 
             # Create w:ins element
-            ins_elem = parse_xml(
-                f'<w:ins xmlns:w="{qn("w")}" '
-                f'w:id="{self.revision_id}" '
-                f'w:author="{self.author}" '
-                f'w:date="{self.timestamp}"/>'
-            )
+            ins_elem = self._revision_element(_W_INS)
 
             # Add run to ins element
             ins_elem.append(new_run)
@@ -118,12 +134,7 @@ class TrackChangesEngine:
             # Find position and insert
             if position_run is not None:
                 r_elem = position_run._element
-                run_index = None
-
-                for i, child in enumerate(p_elem):
-                    if child == r_elem:
-                        run_index = i
-                        break
+                run_index = self._child_index(p_elem, r_elem)
 
                 if run_index is not None:
                     if insert_before:
@@ -157,38 +168,20 @@ class TrackChangesEngine:
             r_elem = run._element
 
             # Find run index
-            run_index = None
-            for i, child in enumerate(p_elem):
-                if child == r_elem:
-                    run_index = i
-                    break
+            run_index = self._child_index(p_elem, r_elem)
 
             if run_index is None:
                 return False
 
             # Create deletion element with original run
-            del_elem = parse_xml(
-                f'<w:del xmlns:w="{qn("w")}" '
-                f'w:id="{self.revision_id}" '
-                f'w:author="{self.author}" '
-                f'w:date="{self.timestamp}"/>'
-            )
+            del_elem = self._revision_element(_W_DEL)
 
             self.revision_id += 1
 
             # Create insertion element with new text
-            new_run = parse_xml(
-                f'<w:r xmlns:w="{qn("w")}">'
-                f'<w:t xml:space="preserve">{self._escape_xml(new_text)}</w:t>'
-                f'</w:r>'
-            )
-
-            ins_elem = parse_xml(
-                f'<w:ins xmlns:w="{qn("w")}" '
-                f'w:id="{self.revision_id}" '
-                f'w:author="{self.author}" '
-                f'w:date="{self.timestamp}"/>'
-            )
+            new_run = self._text_run(new_text)
+
+            ins_elem = self._revision_element(_W_INS)
 
             self.revision_id += 1
 
@@ -226,8 +219,6 @@ class TrackChangesEngine:
         try:
             start = redline['start']
             end = redline['end']
-            original_text = redline['original_text']
-            revised_text = redline.get('revised_text', '')
 
             # Find the DOCX location(s) for this text span
             mappings = indexer.find_spans(start, end)
@@ -236,18 +227,45 @@ class TrackChangesEngine:
                 print(f"No mappings found for span [{start}:{end}]")
                 return False
 
+        except Exception as e:
+            print(f"Error applying redline: {e}")
+            return False
+
+        return self._apply_to_mappings(redline, mappings, indexer.get_paragraph_and_run)
+
+    def _apply_to_mappings(
+        self,
+        redline: Dict,
+        mappings: List[TextMapping],
+        resolve: Callable[[TextMapping], Tuple]
+    ) -> bool:
+        """
+        Apply a redline to the runs of its mappings.
+
+        Args:
+            redline: Dict with 'original_text' and optional 'revised_text'
+            mappings: Non-empty list of mappings covering the redline span
+            resolve: Returns the (paragraph, run) of a mapping
+
+        Returns:
+            bool: Success status
+        """
+        try:
+            original_text = redline['original_text']
+            revised_text = redline.get('revised_text', '')
+
             # Handle different cases
             if not revised_text or revised_text.strip() == '':
                 # Pure deletion
                 for mapping in mappings:
-                    paragraph, run = indexer.get_paragraph_and_run(mapping)
+                    paragraph, run = resolve(mapping)
                     if paragraph and run:
                         self.apply_deletion(paragraph, run, original_text)
 
             elif not original_text or original_text.strip() == '':
                 # Pure insertion
                 mapping = mappings[0]
-                paragraph, run = indexer.get_paragraph_and_run(mapping)
+                paragraph, run = resolve(mapping)
                 if paragraph:
                     self.apply_insertion(paragraph, run, revised_text, insert_before=False)
 
@@ -255,7 +273,7 @@ class TrackChangesEngine:
                 # Replacement
                 # For simplicity, apply to the first mapping
                 mapping = mappings[0]
-                paragraph, run = indexer.get_paragraph_and_run(mapping)
+                paragraph, run = resolve(mapping)
                 if paragraph and run:
                     self.apply_replacement(paragraph, run, original_text, revised_text)
 
@@ -277,29 +295,80 @@ class TrackChangesEngine:
         Returns:
             int: Number of successfully applied redlines
         """
-        # Sort redlines by position (reverse order to avoid index shifting)
-        sorted_redlines = sorted(redlines, key=lambda r: r['start'], reverse=True)
+        located = []
+        for redline in redlines:
+            try:
+                located.append((redline, (redline['start'], redline['end'])))
+            except Exception as e:
+                print(f"Error applying redline: {e}")
+
+        # Look up all spans at once, then group redlines by the paragraph
+        # their span starts in
+        all_mappings = indexer.find_spans_bulk(span for _, span in located)
+
+        by_paragraph = defaultdict(list)
+        for (redline, (start, end)), mappings in zip(located, all_mappings):
+            if not mappings:
+                print(f"No mappings found for span [{start}:{end}]")
+                continue
+
+            by_paragraph[self._paragraph_key(mappings[0])].append((start, redline, mappings))
+
+        # Each paragraph's runs are looked up once, on first touch and before
+        # any edit to that paragraph moves runs into w:del/w:ins wrappers
+        paragraph_runs = {}
+
+        def resolve(mapping: TextMapping):
+            key = self._paragraph_key(mapping)
+            if key not in paragraph_runs:
+                paragraph_runs[key] = indexer.get_paragraph_runs(mapping)
+            paragraph, normalized_runs = paragraph_runs[key]
+            if paragraph is not None and mapping.r_idx < len(normalized_runs):
+                return paragraph, normalized_runs[mapping.r_idx]['run']
+            return None, None
+
+        # Paragraphs bottom-up, and within each paragraph the last edit first
+        groups = sorted(by_paragraph.values(), key=lambda group: group[0][2][0].start, reverse=True)
 
         success_count = 0
-        for redline in sorted_redlines:
-            if self.apply_redline(doc, indexer, redline):
-                success_count += 1
+        for group in groups:
+            group.sort(key=itemgetter(0), reverse=True)
+            for _, redline, mappings in group:
+                if self._apply_to_mappings(redline, mappings, resolve):
+                    success_count += 1
 
         return success_count
 
     @staticmethod
-    def _escape_xml(text: str) -> str:
-        """Escape special XML characters"""
-        if not text:
-            return ""
+    def _paragraph_key(mapping: TextMapping) -> Tuple:
+        """Identify the paragraph a mapping belongs to"""
+        return (mapping.element_type, tuple(mapping.table_info.values()), mapping.p_idx)
+
+    def _revision_element(self, tag: str):
+        """Create an empty w:ins or w:del element for the current revision"""
+        return _w_element(tag, {
+            _W_ID: str(self.revision_id),
+            _W_AUTHOR: self.author,
+            _W_DATE: self.timestamp,
+        })
 
-        text = text.replace('&', '&amp;')
-        text = text.replace('<', '&lt;')
-        text = text.replace('>', '&gt;')
-        text = text.replace('"', '&quot;')
-        text = text.replace("'", '&apos;')
+    @staticmethod
+    def _text_run(text: str):
+        """Create a w:r holding text, with whitespace preserved"""
+        run = _w_element(_W_R)
+        t = _w_element(_W_T, {_XML_SPACE: 'preserve'})
+        # lxml escapes the text when the document is serialized
+        t.text = text or ''
+        run.append(t)
+        return run
 
-        return text
+    @staticmethod
+    def _child_index(p_elem, r_elem) -> Optional[int]:
+        """Index of r_elem among p_elem's children, or None if it is not a direct child"""
+        try:
+            return p_elem.index(r_elem)
+        except ValueError:
+            return None
 
     def enable_track_changes(self, doc: Document):
         """Enable track changes in document settings"""
@@ -308,21 +377,24 @@ class TrackChangesEngine:
             settings = doc.settings
             settings_elem = settings.element
 
-            # The qn function returns the full namespace URI
             # Format: {http://schemas.openxmlformats.org/wordprocessingml/2006/main}trackRevisions
-            track_revisions = settings_elem.find(qn('w:trackRevisions'))
+            track_revisions = settings_elem.find(_W_TRACK_REVISIONS)
 
             if track_revisions is None:
-                # Create the trackRevisions element properly
-                # qn('w:trackRevisions') returns the full namespaced tag
-                from lxml import etree as ElementTree
-                track_elem = ElementTree.Element(qn('w:trackRevisions'))
+                track_elem = etree.Element(_W_TRACK_REVISIONS)
                 settings_elem.append(track_elem)
 
         except Exception as e:
             print(f"Error enabling track changes: {e}")
 
 
+def _similarity(a: str, b: str) -> float:
+    """Similarity ratio of two strings in [0, 1]"""
+    if RAPIDFUZZ_AVAILABLE:
+        return fuzz.ratio(a, b) / 100.0
+    return SequenceMatcher(None, a, b).ratio()
+
+
 class RedlineValidator:
     """Validate redlines before applying"""
 
@@ -361,14 +433,17 @@ class RedlineValidator:
         actual_text = working_text[start:end]
         expected_text = redline['original_text']
 
+        # Most redlines quote the span exactly
+        if actual_text == expected_text:
+            return True
+
         # Normalize for comparison
         actual_norm = actual_text.strip().lower()
         expected_norm = expected_text.strip().lower()
 
         if actual_norm != expected_norm:
             # Allow fuzzy match within 20% difference
-            from difflib import SequenceMatcher
-            ratio = SequenceMatcher(None, actual_norm, expected_norm).ratio()
+            ratio = _similarity(actual_norm, expected_norm)
             if ratio < 0.8:
                 print(f"Text mismatch (ratio={ratio:.2f}):")
                 print(f"  Expected: '{expected_text[:100]}...'")
@@ -0,0 +1,322 @@
+"""
+Streaming DOCX text extraction with lxml
+Reads word/document.xml directly instead of building the python-docx object model
+"""
+import posixpath
+import zipfile
+from typing import Callable, Dict, IO, Iterator, List, Optional, Tuple, Union
+
+from lxml import etree
+
+from .text_indexer import WorkingTextIndexer
+
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+R_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+_T = f'{W_NS}t'
+_TAB = f'{W_NS}tab'
+_PTAB = f'{W_NS}ptab'
+_BR = f'{W_NS}br'
+_CR = f'{W_NS}cr'
+_NO_BREAK_HYPHEN = f'{W_NS}noBreakHyphen'
+_BR_TYPE = f'{W_NS}type'
+_R = f'{W_NS}r'
+_HYPERLINK = f'{W_NS}hyperlink'
+_P = f'{W_NS}p'
+_TC = f'{W_NS}tc'
+_BODY = f'{W_NS}body'
+_TBL = f'{W_NS}tbl'
+_TR = f'{W_NS}tr'
+_P_PR = f'{W_NS}pPr'
+_SECT_PR = f'{W_NS}sectPr'
+_HEADER_REFERENCE = f'{W_NS}headerReference'
+_FOOTER_REFERENCE = f'{W_NS}footerReference'
+_VAL = f'{W_NS}val'
+_TYPE = f'{W_NS}type'
+_R_ID = f'{R_NS}id'
+_RELATIONSHIP = f'{REL_NS}Relationship'
+
+# Run properties WorkingTextIndexer.should_merge_runs compares
+_R_PR = f'{W_NS}rPr'
+_BOLD = f'{W_NS}b'
+_ITALIC = f'{W_NS}i'
+_UNDERLINE = f'{W_NS}u'
+_FONTS = f'{W_NS}rFonts'
+_FONTS_ASCII = f'{W_NS}ascii'
+_SIZE = f'{W_NS}sz'
+
+# Cell layout, resolved as python-docx _Row.cells does
+_TC_PR = f'{W_NS}tcPr'
+_TR_PR = f'{W_NS}trPr'
+_GRID_SPAN = f'{W_NS}gridSpan'
+_GRID_BEFORE = f'{W_NS}gridBefore'
+_V_MERGE = f'{W_NS}vMerge'
+
+
+def run_text(run) -> str:
+    """Text of a w:r element, matching python-docx Run.text."""
+    parts = []
+    for child in run:
+        tag = child.tag
+        if tag == _T:
+            parts.append(child.text or '')
+        elif tag in (_TAB, _PTAB):
+            parts.append('\t')
+        elif tag == _CR:
+            parts.append('\n')
+        elif tag == _BR:
+            # Page and column breaks have no text equivalent
+            if child.get(_BR_TYPE, 'textWrapping') == 'textWrapping':
+                parts.append('\n')
+        elif tag == _NO_BREAK_HYPHEN:
+            parts.append('-')
+    return ''.join(parts)
+
+
+def paragraph_text(paragraph, include_hyperlinks: bool = True) -> str:
+    """
+    Text of a w:p element.
+
+    With include_hyperlinks this matches python-docx Paragraph.text; without it,
+    only direct runs are read (as Paragraph.runs / WorkingTextIndexer do).
+    """
+    parts = []
+    for child in paragraph:
+        if child.tag == _R:
+            parts.append(run_text(child))
+        elif include_hyperlinks and child.tag == _HYPERLINK:
+            parts.extend(run_text(run) for run in child.iterchildren(_R))
+    return ''.join(parts)
+
+
+def iter_paragraph_texts(
+    source: Union[str, IO[bytes]],
+    include_hyperlinks: bool = True
+) -> Iterator[Tuple[str, str]]:
+    """
+    Stream paragraph texts from a DOCX file path or binary file object.
+
+    Yields (location, text) in document order, where location is 'body' for
+    body paragraphs and 'table' for paragraphs in body-level table cells.
+    Other paragraphs (nested tables, text boxes) are skipped.
+    """
+    with zipfile.ZipFile(source) as archive, archive.open('word/document.xml') as xml:
+        for _, paragraph in etree.iterparse(xml, tag=_P):
+            parent = paragraph.getparent()
+            if parent.tag == _BODY:
+                location = 'body'
+            elif parent.tag == _TC and parent.getparent().getparent().getparent().tag == _BODY:
+                location = 'table'
+            else:
+                continue
+
+            yield location, paragraph_text(paragraph, include_hyperlinks)
+            paragraph.clear()
+
+
+def _on_off(element) -> Optional[bool]:
+    """Value of an ST_OnOff property element; None when it is absent."""
+    if element is None:
+        return None
+    return element.get(_VAL, 'true') in ('1', 'true', 'on')
+
+
+def _run_format(run) -> Tuple:
+    """Bold, italic, underline, font name and size of a w:r, as python-docx reads them."""
+    properties = run.find(_R_PR)
+    if properties is None:
+        return (None, None, None, None, None)
+
+    underline = properties.find(_UNDERLINE)
+    fonts = properties.find(_FONTS)
+    size = properties.find(_SIZE)
+    return (
+        _on_off(properties.find(_BOLD)),
+        _on_off(properties.find(_ITALIC)),
+        underline.get(_VAL) if underline is not None else None,
+        fonts.get(_FONTS_ASCII) if fonts is not None else None,
+        size.get(_VAL) if size is not None else None
+    )
+
+
+def _indexed_paragraph_text(paragraph, normalize: Callable[[str], str]) -> str:
+    """
+    Working text of a w:p, as WorkingTextIndexer.index_paragraph builds it.
+
+    Adjacent direct runs with the same formatting are merged, each merged run
+    is normalized on its own, and the paragraph ends with a newline if any
+    run has text.
+    """
+    merged: List[str] = []
+    current_format = None
+    current_text = None
+
+    for run in paragraph.iterchildren(_R):
+        text = run_text(run)
+        run_format = _run_format(run)
+        if current_text is None:
+            current_format, current_text = run_format, text
+        elif run_format == current_format:
+            current_text += text
+        else:
+            if current_text:
+                merged.append(current_text)
+            current_format, current_text = run_format, text
+
+    if current_text:
+        merged.append(current_text)
+
+    if not merged:
+        return ''
+    return ''.join(normalize(text) for text in merged) + '\n'
+
+
+def _int_property(parent, properties_tag: str, tag: str, default: int) -> int:
+    """Integer w:val of parent/properties_tag/tag, or default."""
+    properties = parent.find(properties_tag)
+    element = properties.find(tag) if properties is not None else None
+    return default if element is None else int(element.get(_VAL))
+
+
+def _grid_offset(cell) -> int:
+    """Layout-grid column a w:tc starts in."""
+    row = cell.getparent()
+    offset = _int_property(row, _TR_PR, _GRID_BEFORE, 0)
+    for sibling in cell.itersiblings(_TC, preceding=True):
+        offset += _int_property(sibling, _TC_PR, _GRID_SPAN, 1)
+    return offset
+
+
+def _merge_root(cell, rows: list, row_idx: int):
+    """The w:tc holding the content of a vertically merged cell."""
+    while True:
+        properties = cell.find(_TC_PR)
+        merge = properties.find(_V_MERGE) if properties is not None else None
+        if merge is None or merge.get(_VAL, 'continue') != 'continue':
+            return cell
+
+        if row_idx == 0:
+            raise ValueError("no tr above topmost tr in w:tbl")
+        offset = _grid_offset(cell)
+        row_idx -= 1
+        row = rows[row_idx]
+        remaining = offset - _int_property(row, _TR_PR, _GRID_BEFORE, 0)
+        above = None
+        for candidate in row.iterchildren(_TC):
+            if remaining <= 0:
+                above = candidate if remaining == 0 else None
+                break
+            remaining -= _int_property(candidate, _TC_PR, _GRID_SPAN, 1)
+        if above is None:
+            raise ValueError(f"no `tc` element at grid_offset={offset}")
+        cell = above
+
+
+def _table_text(table, normalize: Callable[[str], str]) -> str:
+    """
+    Working text of a body-level w:tbl, as WorkingTextIndexer.index_table builds it.
+
+    Like python-docx _Row.cells, a cell spanning several grid columns is
+    repeated once per column, and a vertically merged cell repeats the cell
+    its merge starts in.
+    """
+    parts = []
+    rows = list(table.iterchildren(_TR))
+    for row_idx, row in enumerate(rows):
+        for cell in row.iterchildren(_TC):
+            root = _merge_root(cell, rows, row_idx)
+            text = ''.join(
+                _indexed_paragraph_text(paragraph, normalize)
+                for paragraph in root.iterchildren(_P)
+            )
+            parts.append(text * _int_property(root, _TC_PR, _GRID_SPAN, 1))
+    return ''.join(parts)
+
+
+def _reference_id(section, tag: str) -> Optional[str]:
+    """Relationship id of a section's default header or footer reference."""
+    for reference in section.iterchildren(tag):
+        if reference.get(_TYPE) == 'default':
+            return reference.get(_R_ID)
+    return None
+
+
+def _part_names(archive: zipfile.ZipFile) -> Dict[str, str]:
+    """Relationship id -> zip member name for parts related to word/document.xml."""
+    with archive.open('word/_rels/document.xml.rels') as rels:
+        root = etree.parse(rels).getroot()
+
+    names = {}
+    for relationship in root.iterchildren(_RELATIONSHIP):
+        target = relationship.get('Target')
+        if relationship.get('TargetMode') == 'External' or not target:
+            continue
+        if target.startswith('/'):
+            names[relationship.get('Id')] = target[1:]
+        else:
+            names[relationship.get('Id')] = posixpath.normpath(posixpath.join('word', target))
+    return names
+
+
+def build_working_text(source: Union[str, IO[bytes]]) -> str:
+    """
+    Build a document's working text straight from the DOCX XML.
+
+    Produces the same text as WorkingTextIndexer.build_index: body paragraphs,
+    then body-level tables row by row, then each section's default header and
+    footer (inherited from earlier sections when not defined). Offsets in this
+    text therefore map onto the indexer's spans.
+
+    Imports nothing from the API layer, so process pool workers can run it
+    without loading the batch processor.
+    """
+    normalize = WorkingTextIndexer().normalize_text
+    body_parts = []
+    table_parts = []
+    sections = []
+
+    with zipfile.ZipFile(source) as archive:
+        with archive.open('word/document.xml') as xml:
+            for _, element in etree.iterparse(xml, tag=(_P, _TBL, _SECT_PR)):
+                parent = element.getparent()
+
+                if element.tag == _SECT_PR:
+                    # Sections are the body's sectPr and those in body paragraph properties
+                    if parent.tag == _BODY or (
+                        parent.tag == _P_PR and parent.getparent().getparent().tag == _BODY
+                    ):
+                        sections.append((
+                            _reference_id(element, _HEADER_REFERENCE),
+                            _reference_id(element, _FOOTER_REFERENCE)
+                        ))
+                    continue
+
+                # Paragraphs and tables inside tables are read with their table
+                if parent.tag != _BODY:
+                    continue
+
+                if element.tag == _P:
+                    body_parts.append(_indexed_paragraph_text(element, normalize))
+                else:
+                    table_parts.append(_table_text(element, normalize))
+                element.clear()
+
+        header_footer_parts = []
+        if any(header or footer for header, footer in sections):
+            part_names = _part_names(archive)
+            header_id = footer_id = None
+            for section_header, section_footer in sections:
+                header_id = section_header or header_id
+                footer_id = section_footer or footer_id
+                for reference_id in (header_id, footer_id):
+                    if reference_id is None:
+                        continue
+                    with archive.open(part_names[reference_id]) as part:
+                        root = etree.parse(part).getroot()
+                    header_footer_parts.extend(
+                        _indexed_paragraph_text(paragraph, normalize)
+                        for paragraph in root.iterchildren(_P)
+                    )
+
+    return ''.join(body_parts) + ''.join(table_parts) + ''.join(header_footer_parts)
@@ -0,0 +1,45 @@
+"""
+Shared HTTP connection pool for Anthropic clients
+One keep-alive pool per worker process, multiplexed over HTTP/2 when h2 is installed
+"""
+import os
+from typing import Optional
+
+import httpx
+
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2 support)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    The worker's shared httpx client, created on first use
+
+    Every AsyncAnthropic built with it reuses the same warm connections, so
+    concurrent Opus and Sonnet calls skip the TCP/TLS handshake. A closed
+    client (after shutdown cleanup) is replaced with a new one.
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=int(os.getenv("ANTHROPIC_MAX_CONNECTIONS", "64")),
+                max_keepalive_connections=int(os.getenv("ANTHROPIC_MAX_KEEPALIVE", "32"))
+            ),
+            timeout=httpx.Timeout(120.0, connect=10.0)
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared pool; the next get_http_client() call opens a new one"""
+    global _http_client
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+    _http_client = None
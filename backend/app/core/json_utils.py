@@ -0,0 +1,176 @@
+"""
+JSON extraction from model responses
+Finds the first JSON object in text that may wrap it in prose or markdown fences
+"""
+import asyncio
+import json
+import re
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+_DECODER = json.JSONDecoder()
+
+# Candidate '{' positions tried before giving up; each try reads the text at most once
+MAX_CANDIDATES = 20
+
+# Responses longer than this are parsed in a worker thread
+OFFLOAD_CHARS = 16_384
+
+T = TypeVar('T')
+
+# Characters that change nesting or string state while scanning streamed JSON
+_STRUCTURAL = re.compile(r'["\\{}\]]')
+
+
+def loads(data: str) -> Any:
+    """json.loads, through orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, sort_keys: bool = False) -> str:
+    """Compact json.dumps, through orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(obj, option=option).decode()
+    return json.dumps(obj, sort_keys=sort_keys, separators=(',', ':'), ensure_ascii=False)
+
+
+def extract_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse the first JSON object embedded in text
+
+    A response that is one object, bare or fenced, is parsed in a single
+    loads() call. Otherwise candidates are handed to the stdlib decoder, which reads exactly one
+    value and stops, so trailing prose or a closing code fence is ignored.
+    When a candidate fails to parse, the search resumes from the point of
+    failure, and at most MAX_CANDIDATES candidates are tried, so unbalanced
+    braces cannot cause the blow-up a nested regex would.
+
+    Returns:
+        The parsed object, or None if the text contains no JSON object
+    """
+    start = text.find('{')
+    if start == -1:
+        return None
+
+    # Fast path: everything from the first '{' to the last '}' is the object
+    try:
+        parsed = loads(text[start:text.rfind('}') + 1])
+    except ValueError:
+        parsed = None
+    if isinstance(parsed, dict):
+        return parsed
+
+    for _ in range(MAX_CANDIDATES):
+        if start == -1:
+            break
+        try:
+            parsed, end = _DECODER.raw_decode(text, start)
+        except json.JSONDecodeError as e:
+            start = text.find('{', max(e.pos, start + 1))
+            continue
+        except RecursionError:
+            return None
+        if isinstance(parsed, dict):
+            return parsed
+        start = text.find('{', end)
+    return None
+
+
+async def parse_off_loop(parse: Callable[[str], T], text: str) -> T:
+    """
+    Run parse(text) without stalling the event loop on long responses
+
+    Short texts are parsed inline; texts over OFFLOAD_CHARS are parsed in a
+    worker thread so concurrent API calls keep making progress meanwhile.
+    """
+    if len(text) > OFFLOAD_CHARS:
+        return await asyncio.to_thread(parse, text)
+    return parse(text)
+
+
+class ArrayItemStream:
+    """
+    Objects of one JSON array, yielded as the response text streams in
+
+    feed() takes the text in arbitrary pieces and returns the objects of
+    the array under key that were completed by that piece. The scanner
+    only tracks string and brace state, jumping between structural
+    characters, and each completed object is parsed on its own.
+    """
+
+    def __init__(self, key: str):
+        self._marker = f'"{key}"'
+        self._text = ""
+        self._pos = 0
+        self._in_array = False
+        self._done = False
+        self._in_string = False
+        self._depth = 0
+        self._item_start = 0
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        self._text += chunk
+        text = self._text
+        if self._done:
+            return []
+
+        if not self._in_array:
+            marker = text.find(self._marker, self._pos)
+            if marker == -1:
+                self._pos = max(0, len(text) - len(self._marker))
+                return []
+            bracket = text.find('[', marker + len(self._marker))
+            if bracket == -1:
+                self._pos = marker
+                return []
+            self._in_array = True
+            self._pos = bracket + 1
+
+        items = []
+        pos = self._pos
+        while True:
+            match = _STRUCTURAL.search(text, pos)
+            if match is None:
+                pos = len(text)
+                break
+            char = match.group()
+            pos = match.end()
+
+            if self._in_string:
+                if char == '\\':
+                    if pos == len(text):
+                        # The escaped character has not arrived yet
+                        pos -= 1
+                        break
+                    pos += 1
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == '{':
+                if self._depth == 0:
+                    self._item_start = match.start()
+                self._depth += 1
+            elif char == '}':
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        item = loads(text[self._item_start:pos])
+                    except ValueError:
+                        item = None
+                    if isinstance(item, dict):
+                        items.append(item)
+            elif self._depth == 0:  # ']' closing the array
+                self._done = True
+                break
+
+        self._pos = pos
+        return items
@@ -4,22 +4,31 @@ Implements comprehensive retry logic, circuit breakers, and observability
 """
 
 import asyncio
+import copy
+import hashlib
 import json
 import logging
+import os
 import random
 import time
 import uuid
-from typing import Dict, List, Optional, Any, Tuple
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field, fields
+from typing import Callable, Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 from enum import Enum
 
 import structlog
 from anthropic import AsyncAnthropic, APIStatusError, APIConnectionError
 
+from .http_client import get_http_client
+from .json_utils import ArrayItemStream, dumps, extract_json_object, parse_off_loop
+from .rate_limiter import get_rate_limiter
+
 # Import settings for model configuration
 try:
-    from ..config.settings import Settings
-    settings = Settings()
+    from ..config.settings import get_settings
+    settings = get_settings()
 except Exception:
     # Fallback if settings can't be loaded
     settings = None
@@ -112,6 +121,84 @@ else:
     claude_errors = Counter()
     circuit_breaker_state_metric = Gauge()
 
+# Opus instructions are identical for every document, so they are sent as a
+# cached system block and only the document varies between requests
+OPUS_SYSTEM_PROMPT = """You are a legal expert specializing in NDA analysis.
+Identify all potential issues, risks, and necessary redlines in the document.
+Be thorough and precise in your analysis.
+
+Provide a comprehensive analysis including:
+1. All problematic clauses that should be modified or removed
+2. Missing standard protections that should be added
+3. Terms that are unusually restrictive or one-sided
+4. Potential risks and their severity
+5. Specific recommended changes with explanations
+
+CRITICAL: You must respond with ONLY a valid JSON object. Do not include any explanatory text before or after the JSON.
+
+Format your response as a JSON object with a 'redlines' array. Each redline object must include:
+- clause: The specific clause or section name
+- issue: What's problematic about this clause
+- severity: Must be exactly one of: "high", "medium", or "low"
+- original_text: The exact text from the document that needs to change (quote it precisely)
+- revised_text: The replacement text to use (or empty string "" if deleting)
+- recommendation: Brief description of the change needed
+- explanation: Detailed reasoning for why this change is important
+
+Example response format:
+{
+  "redlines": [
+    {
+      "clause": "Term and Termination",
+      "issue": "Confidentiality term is indefinite/perpetual",
+      "severity": "high",
+      "original_text": "shall remain in effect in perpetuity",
+      "revised_text": "shall remain in effect for 2 years from the Effective Date",
+      "recommendation": "Limit confidentiality term to 2 years",
+      "explanation": "Perpetual confidentiality obligations are unreasonably burdensome and should be time-limited to a reasonable period."
+    },
+    {
+      "clause": "Governing Law",
+      "issue": "Governing law is not Delaware",
+      "severity": "medium",
+      "original_text": "governed by the laws of California",
+      "revised_text": "governed by the laws of Delaware",
+      "recommendation": "Change governing law to Delaware",
+      "explanation": "Delaware law is preferred for consistency with corporate governance."
+    }
+  ]
+}
+
+If the document has no issues, return: {"redlines": []}"""
+
+OPUS_SYSTEM = [{"type": "text", "text": OPUS_SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}]
+
+# Characters per token for English contract text, used to size prompts
+# without a tokenizer round-trip
+CHARS_PER_TOKEN = 4
+
+
+# Recent request durations kept for latency percentiles
+PROCESSING_TIMES_WINDOW = 1000
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of text (rounded up)"""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def estimate_input_tokens(params: Dict[str, Any]) -> int:
+    """Approximate input tokens of a Messages API request: system and message text"""
+    system = params.get("system", [])
+    texts = [system] if isinstance(system, str) else [block["text"] for block in system]
+    texts += [message["content"] for message in params["messages"] if isinstance(message["content"], str)]
+    return sum(estimate_tokens(text) for text in texts)
+
+
+def estimate_request_tokens(params: Dict[str, Any]) -> int:
+    """Approximate input plus maximum output tokens of a Messages API request"""
+    return estimate_input_tokens(params) + params["max_tokens"]
+
 class ProcessingState(Enum):
     """Document processing states for tracking"""
     PENDING = "PENDING"
@@ -127,6 +214,93 @@ class CircuitBreakerState(Enum):
     OPEN = 1
     HALF_OPEN = 2
 
+@dataclass(slots=True)
+class OrchestratorStats:
+    """Running counters for an orchestrator; derived metrics come from get_stats()"""
+    total_requests: int = 0
+    successful_requests: int = 0
+    failed_requests: int = 0
+    opus_calls: int = 0
+    sonnet_calls: int = 0
+    total_retries: int = 0
+    rate_limit_hits: int = 0
+    overload_errors: int = 0
+    timeout_errors: int = 0
+    connection_errors: int = 0
+    total_tokens_input: int = 0
+    total_tokens_output: int = 0
+    cache_read_tokens: int = 0
+    cache_creation_tokens: int = 0
+    total_cost_usd: float = 0.0
+    circuit_breaker_trips: int = 0
+    response_cache_hits: int = 0
+    # Durations of the most recent requests, for the latency percentiles
+    processing_times: deque = field(default_factory=lambda: deque(maxlen=PROCESSING_TIMES_WINDOW))
+
+class StreamingValidation:
+    """
+    Sonnet validation of Opus redlines while the Opus response is streaming
+
+    Redlines are collected as their JSON objects complete and validated in
+    chunks of chunk_size, each chunk as its own task, so validation overlaps
+    the rest of the Opus response. If the streamed redlines turn out not to
+    be the parsed result (a retry, a cache hit or a non-JSON response), the
+    chunks are discarded and the result is validated as a whole.
+    """
+
+    def __init__(self, orchestrator: 'AnthropicExclusiveOrchestrator', document_text: str,
+                 document_id: str, chunk_size: int):
+        self.orchestrator = orchestrator
+        self.document_text = document_text
+        self.document_id = document_id
+        self.chunk_size = chunk_size
+        self._tasks: List[asyncio.Task] = []
+        self.reset()
+
+    def reset(self):
+        """Start over for a new Opus attempt"""
+        self.cancel()
+        self._parser = ArrayItemStream("redlines")
+        self._streamed: List[Dict] = []
+        self._pending: List[Dict] = []
+        self._tasks = []
+
+    def cancel(self):
+        """Cancel the validations in flight"""
+        for task in self._tasks:
+            task.cancel()
+
+    def feed(self, text: str):
+        """Take the next piece of the Opus response text"""
+        for redline in self._parser.feed(text):
+            self._streamed.append(copy.deepcopy(redline))
+            self._pending.append(redline)
+            if len(self._pending) >= self.chunk_size:
+                self._dispatch()
+
+    def _dispatch(self):
+        chunk, self._pending = self._pending, []
+        self._tasks.append(asyncio.create_task(self.orchestrator._validate_with_sonnet(
+            {'redlines': chunk}, self.document_text, self.document_id
+        )))
+
+    async def results(self, opus_result: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Validated redlines of the finished Opus result, in Opus order"""
+        if self._streamed != opus_result.get('redlines', []):
+            logger.info(
+                "Streamed redlines differ from the Opus result, validating it whole",
+                streamed=len(self._streamed)
+            )
+            self.cancel()
+            return await self.orchestrator._validate_with_sonnet(
+                opus_result, self.document_text, self.document_id
+            )
+
+        if self._pending:
+            self._dispatch()
+        chunks = await asyncio.gather(*self._tasks)
+        return [redline for chunk in chunks for redline in chunk]
+
 class AnthropicExclusiveOrchestrator:
     """
     Production-hardened Anthropic orchestrator with comprehensive error handling
@@ -140,7 +314,9 @@ class AnthropicExclusiveOrchestrator:
         circuit_breaker_threshold: int = 5,
         circuit_breaker_reset_time: int = 60,
         opus_model: Optional[str] = None,
-        sonnet_model: Optional[str] = None
+        sonnet_model: Optional[str] = None,
+        opus_concurrency: Optional[int] = None,
+        sonnet_concurrency: Optional[int] = None
     ):
         """
         Initialize orchestrator with production configurations
@@ -152,11 +328,17 @@ class AnthropicExclusiveOrchestrator:
             circuit_breaker_reset_time: Seconds before circuit reset attempt
             opus_model: Claude Opus model to use (defaults to settings)
             sonnet_model: Claude Sonnet model to use (defaults to settings)
+            opus_concurrency: Max Opus calls in flight (defaults to OPUS_CONCURRENCY or 4)
+            sonnet_concurrency: Max Sonnet calls in flight (defaults to SONNET_CONCURRENCY or 8)
         """
         if not api_key or not api_key.startswith("sk-ant-"):
             raise ValueError(f"Invalid Anthropic API key format. Must start with 'sk-ant-'")
 
-        self.client = AsyncAnthropic(api_key=api_key, max_retries=0)  # Manual retry control
+        self.client = AsyncAnthropic(
+            api_key=api_key,
+            max_retries=0,  # Manual retry control
+            http_client=get_http_client()
+        )
         self.max_retries = max_retries
 
         # Load model configurations from settings or use provided values
@@ -182,25 +364,11 @@ class AnthropicExclusiveOrchestrator:
         self.circuit_breaker_failures = 0
         self.circuit_breaker_last_failure_time = None
         self.circuit_breaker_state = CircuitBreakerState.CLOSED
+        # When the half-open trial request was let through (monotonic)
+        self.circuit_breaker_probe_time = None
 
         # Statistics tracking
-        self.stats = {
-            'total_requests': 0,
-            'successful_requests': 0,
-            'failed_requests': 0,
-            'opus_calls': 0,
-            'sonnet_calls': 0,
-            'total_retries': 0,
-            'rate_limit_hits': 0,
-            'overload_errors': 0,
-            'timeout_errors': 0,
-            'connection_errors': 0,
-            'total_tokens_input': 0,
-            'total_tokens_output': 0,
-            'total_cost_usd': 0.0,
-            'circuit_breaker_trips': 0,
-            'processing_times': []
-        }
+        self.stats = OrchestratorStats()
 
         # Model availability flags
         self.opus_available = True
@@ -208,6 +376,43 @@ class AnthropicExclusiveOrchestrator:
         self.validation_rate = 1.0  # Default 100% validation
         self.enable_validation = True
 
+        # Validation is not latency-critical; the Message Batches API bills it at half price
+        self.use_batch_api = os.getenv("ANTHROPIC_USE_BATCH_API", "0") == "1"
+        self.batch_api_timeout = float(os.getenv("ANTHROPIC_BATCH_TIMEOUT", "600"))
+
+        # Prompts estimated above this many tokens are not sent to Opus
+        self.max_input_tokens = int(os.getenv("OPUS_MAX_INPUT_TOKENS", "180000"))
+
+        # Documents can be analyzed as parallel paragraph shards; oversized
+        # documents always are
+        self.shard_documents = os.getenv("OPUS_SHARD_DOCUMENTS", "0") == "1"
+        self.shard_tokens = int(os.getenv("OPUS_SHARD_TOKENS", "8000"))
+        self.shard_concurrency = int(os.getenv("OPUS_SHARD_CONCURRENCY", "8"))
+
+        # Calls in flight per model across all documents, so parallel
+        # analyses queue here instead of tripping rate limits
+        self.opus_concurrency = opus_concurrency or int(os.getenv("OPUS_CONCURRENCY", "4"))
+        self.sonnet_concurrency = sonnet_concurrency or int(os.getenv("SONNET_CONCURRENCY", "8"))
+        self._opus_sem = asyncio.Semaphore(self.opus_concurrency)
+        self._sonnet_sem = asyncio.Semaphore(self.sonnet_concurrency)
+
+        # Parsed responses of recent identical requests, least recently used first
+        self._response_cache: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._response_cache_size = int(os.getenv("RESPONSE_CACHE_SIZE", "10000"))
+        self._response_cache_ttl = float(os.getenv("RESPONSE_CACHE_TTL", "86400"))
+
+        # Per-minute request and token budgets shared by the worker's
+        # orchestrators (OPUS_RPM/OPUS_TPM, SONNET_RPM/SONNET_TPM)
+        self.opus_limiter = get_rate_limiter("opus")
+        self.sonnet_limiter = get_rate_limiter("sonnet")
+
+        # Validate Opus redlines in chunks while the analysis is still streaming
+        self.stream_validation = os.getenv("OPUS_STREAM_VALIDATION", "0") == "1"
+        self.stream_validation_chunk = int(os.getenv("OPUS_STREAM_VALIDATION_CHUNK", "5"))
+
+        # Seconds to wait for the next event of a streamed response
+        self.stream_chunk_timeout = float(os.getenv("ANTHROPIC_STREAM_CHUNK_TIMEOUT", "30"))
+
         # Initialize ClauseMapper for robust text mapping
         if CLAUSE_MAPPER_AVAILABLE:
             self.clause_mapper = ClauseMapper(confidence_threshold=75.0)
@@ -225,7 +430,17 @@ class AnthropicExclusiveOrchestrator:
         )
 
         # Run startup health check in background (don't block init)
-        asyncio.create_task(self._startup_health_check())
+        self._health_check_task = asyncio.create_task(self._startup_health_check())
+
+    async def aclose(self):
+        """
+        Stop the orchestrator's background work
+
+        The connection pool is shared with every other Anthropic client in the
+        worker, so it stays open; close_http_client() closes it at shutdown.
+        """
+        if not self._health_check_task.done():
+            self._health_check_task.cancel()
 
     async def _startup_health_check(self):
         """
@@ -325,6 +540,13 @@ class AnthropicExclusiveOrchestrator:
         except Exception:
             pass  # Fallback if structlog not available
 
+        streaming = None
+        if (self.stream_validation and self.enable_validation and self.sonnet_available
+                and not self.use_batch_api):
+            streaming = StreamingValidation(
+                self, document_text, document_id, self.stream_validation_chunk
+            )
+
         try:
             # Check circuit breaker
             if not self._check_circuit_breaker():
@@ -335,10 +557,11 @@ class AnthropicExclusiveOrchestrator:
 
             # Primary analysis with Opus
             logger.info("Starting Claude Opus analysis")
-            opus_result = await self._analyze_with_opus(
+            opus_result = await self._analyze_document_with_opus(
                 document_text=document_text,
                 document_id=document_id,
-                rule_redlines=rule_redlines or []
+                rule_redlines=rule_redlines or [],
+                streaming=streaming
             )
 
             # opus_result will always be a dict (never None) but may have empty redlines
@@ -348,13 +571,16 @@ class AnthropicExclusiveOrchestrator:
             else:
                 logger.info(f"Claude Opus identified {len(opus_result['redlines'])} potential issues")
 
-            # Validation with Sonnet
-            logger.info("Starting Claude Sonnet validation")
-            validated_result = await self._validate_with_sonnet(
-                opus_result=opus_result,
-                document_text=document_text,
-                document_id=document_id
-            )
+            # Validation with Sonnet, already under way when streamed
+            if streaming:
+                validated_result = await streaming.results(opus_result)
+            else:
+                logger.info("Starting Claude Sonnet validation")
+                validated_result = await self._validate_with_sonnet(
+                    opus_result=opus_result,
+                    document_text=document_text,
+                    document_id=document_id
+                )
 
             # Safety check: If validation returned empty but Opus had results, preserve them
             if not validated_result and opus_result.get('redlines'):
@@ -371,8 +597,8 @@ class AnthropicExclusiveOrchestrator:
 
             # Calculate final metrics
             processing_time = time.time() - start_time
-            self.stats['processing_times'].append(processing_time)
-            self.stats['successful_requests'] += 1
+            self.stats.processing_times.append(processing_time)
+            self.stats.successful_requests += 1
 
             result = {
                 'status': 'success',
@@ -396,7 +622,9 @@ class AnthropicExclusiveOrchestrator:
             return result
 
         except Exception as e:
-            self.stats['failed_requests'] += 1
+            if streaming:
+                streaming.cancel()
+            self.stats.failed_requests += 1
             processing_time = time.time() - start_time
 
             # Create user-friendly error message for the exception
@@ -420,7 +648,7 @@ class AnthropicExclusiveOrchestrator:
                             "correlation_id": correlation_id,
                             "document_length": len(document_text)
                         })
-                        scope.set_context("orchestrator_stats", self.stats)
+                        scope.set_context("orchestrator_stats", self._get_stats_snapshot())
                         sentry_sdk.capture_exception(e)
                 except Exception:
                     pass  # Don't fail on Sentry errors
@@ -433,18 +661,214 @@ class AnthropicExclusiveOrchestrator:
             except Exception:
                 pass
 
+    async def analyze_documents_batch(
+        self,
+        documents: List[Tuple[str, str]],
+        rule_redlines: Optional[Dict[str, List[Dict]]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Analyze many documents, through the Message Batches API when enabled
+
+        With use_batch_api, the Opus prompts of all documents are submitted
+        as one message batch and their Sonnet validations as a second, both
+        at half price and outside the per-minute rate limits. Documents that
+        need sharding, and requests that do not succeed in a batch, are
+        analyzed with analyze_document instead, as is every document when
+        the batch API is disabled.
+
+        Args:
+            documents: (document_id, document_text) pairs
+            rule_redlines: Pre-computed rule-based redlines by document id
+
+        Returns:
+            Dictionary mapping each document id to its analyze_document
+            result, or to {'status': 'error', 'error': ...} if it failed
+        """
+        rule_redlines = rule_redlines or {}
+        texts = dict(documents)
+        results: Dict[str, Dict[str, Any]] = {}
+
+        if self.use_batch_api:
+            opus_params = {}
+            for document_id, document_text in texts.items():
+                params = self._opus_params(document_text, rule_redlines.get(document_id, []))
+                oversized = estimate_input_tokens(params) > self.max_input_tokens
+                shard = self.shard_documents and estimate_tokens(document_text) > self.shard_tokens
+                if not (oversized or shard):
+                    opus_params[document_id] = params
+
+            # Only a batch that is actually sent takes the half-open trial
+            if opus_params and self._check_circuit_breaker():
+                try:
+                    results = await self._analyze_prompts_via_batch(texts, opus_params)
+                except Exception as e:
+                    logger.warning(
+                        "Batched document analysis failed, analyzing documents individually",
+                        error=str(e),
+                        error_type=type(e).__name__
+                    )
+                # A batch in which nothing succeeded counts as one failure; this
+                # also ends any half-open trial it held, so the calls below see
+                # the breaker's outcome instead of a trial still in flight
+                if not results:
+                    self._record_circuit_breaker_failure()
+
+        async def analyze(document_id: str, document_text: str) -> Dict[str, Any]:
+            try:
+                return await self.analyze_document(
+                    document_text,
+                    document_id,
+                    rule_redlines=rule_redlines.get(document_id)
+                )
+            except RuntimeError as e:
+                return {'status': 'error', 'error': str(e)}
+
+        remaining = [document_id for document_id in texts if document_id not in results]
+        individual = await asyncio.gather(*[analyze(d, texts[d]) for d in remaining])
+        results.update(zip(remaining, individual))
+
+        return {document_id: results[document_id] for document_id in texts}
+
+    async def _analyze_prompts_via_batch(
+        self,
+        texts: Dict[str, str],
+        opus_params: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Opus analysis and Sonnet validation of documents as two message batches
+
+        Returns results only for documents whose Opus request succeeded; a
+        failed validation keeps the document's unvalidated Opus redlines.
+        """
+        start_time = time.time()
+
+        # Documents analyzed recently are answered from the response cache
+        opus_keys = {document_id: self._response_cache_key(params) for document_id, params in opus_params.items()}
+        opus_results = {}
+        for document_id, key in opus_keys.items():
+            cached = self._cached_response(key)
+            if cached is not None:
+                opus_results[document_id] = cached
+
+        pending = [document_id for document_id in opus_params if document_id not in opus_results]
+        opus_messages = await self._run_message_batch([
+            {"custom_id": document_id, "params": opus_params[document_id]}
+            for document_id in pending
+        ]) if pending else {}
+
+        for document_id, message in opus_messages.items():
+            self.stats.opus_calls += 1
+            self.stats.total_requests += 1
+            self._record_usage("opus", message.usage, 0.015 * 0.5, 0.075 * 0.5)
+            opus_results[document_id] = await parse_off_loop(
+                self._parse_claude_response, message.content[0].text
+            )
+            self._remember_response(opus_keys[document_id], opus_results[document_id])
+
+        validations = {}
+        if self.enable_validation and self.sonnet_available:
+            sonnet_params = {
+                document_id: self._validation_params(result, texts[document_id])
+                for document_id, result in opus_results.items() if result.get('redlines')
+            }
+            sonnet_keys = {document_id: self._response_cache_key(params) for document_id, params in sonnet_params.items()}
+            for document_id, key in sonnet_keys.items():
+                cached = self._cached_response(key)
+                if cached is not None:
+                    validations[document_id] = cached
+
+            to_validate = [document_id for document_id in sonnet_params if document_id not in validations]
+            try:
+                sonnet_messages = await self._run_message_batch([
+                    {"custom_id": document_id, "params": sonnet_params[document_id]}
+                    for document_id in to_validate
+                ]) if to_validate else {}
+            except Exception as e:
+                logger.warning(
+                    "Batched Sonnet validation failed, preserving Opus results",
+                    error=str(e),
+                    error_type=type(e).__name__
+                )
+                sonnet_messages = {}
+
+            for document_id, message in sonnet_messages.items():
+                self.stats.sonnet_calls += 1
+                self._record_usage("sonnet", message.usage, 0.003 * 0.5, 0.015 * 0.5)
+                validations[document_id] = self._parse_validation_response(message.content[0].text)
+                self._remember_response(sonnet_keys[document_id], validations[document_id])
+
+        processing_time = time.time() - start_time
+        results = {}
+        for document_id, opus_result in opus_results.items():
+            opus_redlines = opus_result.get('redlines', [])
+            redlines = opus_redlines
+            if document_id in validations:
+                redlines = self._merge_validation_results(opus_redlines, validations[document_id]) or opus_redlines
+            if redlines:
+                redlines = self._convert_claude_to_document_format(redlines, texts[document_id])
+
+            self.stats.processing_times.append(processing_time)
+            self.stats.successful_requests += 1
+            results[document_id] = {
+                'status': 'success',
+                'redlines': redlines,
+                'correlation_id': str(uuid.uuid4()),
+                'processing_time': processing_time,
+                'opus_redlines': len(opus_redlines),
+                'validated_redlines': len(redlines),
+                'stats_snapshot': self._get_stats_snapshot()
+            }
+
+        logger.info(
+            "Batched document analysis completed",
+            documents=len(opus_params),
+            succeeded=len(results),
+            processing_time=processing_time
+        )
+
+        if results:
+            self._reset_circuit_breaker()
+        return results
+
     async def _analyze_with_opus(
         self,
         document_text: str,
         document_id: str,
-        rule_redlines: List[Dict]
+        rule_redlines: List[Dict],
+        streaming: Optional[StreamingValidation] = None,
+        record_failures: bool = True
     ) -> Optional[Dict[str, Any]]:
         """
         Perform primary analysis with Claude Opus
         Includes comprehensive retry logic and error handling
+
+        With streaming, each attempt's response text is fed to it as it
+        arrives so validation can start before the analysis ends. Without
+        record_failures, a failure is left for the caller to record with
+        the circuit breaker.
         """
         model = self.opus_model
 
+        # Build the request once; retries resend the same prompt
+        params = self._opus_params(document_text, rule_redlines)
+        prompt = params["messages"][0]["content"]
+        request_tokens = estimate_request_tokens(params)
+
+        # An identical document and rule set was analyzed recently
+        cache_key = self._response_cache_key(params)
+        cached = self._cached_response(cache_key)
+        if cached is not None:
+            logger.info("Reusing cached Claude Opus analysis", redlines_found=len(cached.get('redlines', [])))
+            return cached
+
+        # A prompt past the context window fails on every attempt, so reject it up front
+        prompt_tokens = estimate_input_tokens(params)
+        if prompt_tokens > self.max_input_tokens:
+            raise RuntimeError(
+                f"Document too large for analysis: ~{prompt_tokens} tokens "
+                f"exceeds the {self.max_input_tokens} token limit"
+            )
+
         for attempt in range(self.max_retries + 1):
             try:
                 if PROMETHEUS_AVAILABLE:
@@ -453,60 +877,39 @@ class AnthropicExclusiveOrchestrator:
                 else:
                     start_time = time.time()
 
-                # Build the analysis prompt
-                prompt = self._build_opus_prompt(document_text, rule_redlines)
-
                 logger.info(
                     f"Calling Claude Opus (attempt {attempt + 1}/{self.max_retries + 1})",
                     model=model,
                     prompt_length=len(prompt)
                 )
 
-                # Make API call with timeout
-                response = await asyncio.wait_for(
-                    self.client.messages.create(
-                        model=model,
-                        max_tokens=4096,
-                        temperature=0.1,
-                        system="""You are a legal expert specializing in NDA analysis.
-                        Identify all potential issues, risks, and necessary redlines in the document.
-                        Be thorough and precise in your analysis.""",
-                        messages=[
-                            {
-                                "role": "user",
-                                "content": prompt
-                            }
-                        ]
-                    ),
-                    timeout=120.0  # 2 minute timeout for Opus
-                )
+                # Stream the response so a stalled connection fails fast
+                if streaming:
+                    streaming.reset()
+                async with self._opus_sem:
+                    await self.opus_limiter.acquire(request_tokens)
+                    response = await asyncio.wait_for(
+                        self._stream_message(on_text=streaming.feed if streaming else None, **params),
+                        timeout=120.0  # 2 minute timeout for Opus
+                    )
 
-                # Track metrics
+                # Track metrics (Opus pricing as of 2024)
                 elapsed = time.time() - start_time
-                self.stats['opus_calls'] += 1
-                self.stats['total_requests'] += 1
-
-                input_tokens = response.usage.input_tokens
-                output_tokens = response.usage.output_tokens
-                self.stats['total_tokens_input'] += input_tokens
-                self.stats['total_tokens_output'] += output_tokens
-
-                claude_tokens.labels(model="opus", type="input").inc(input_tokens)
-                claude_tokens.labels(model="opus", type="output").inc(output_tokens)
-
-                # Calculate cost (Opus pricing as of 2024)
-                cost = (input_tokens * 0.015 + output_tokens * 0.075) / 1000
-                self.stats['total_cost_usd'] += cost
+                self.stats.opus_calls += 1
+                self.stats.total_requests += 1
+                cost = self._record_usage("opus", response.usage, 0.015, 0.075)
 
                 # Parse and validate response (never returns None, always returns dict)
-                result = self._parse_claude_response(response.content[0].text)
+                result = await parse_off_loop(self._parse_claude_response, response.content[0].text)
+                self._remember_response(cache_key, result)
 
                 # Log the response (success even if empty redlines)
                 logger.info(
                     "Claude Opus analysis succeeded",
                     elapsed_seconds=elapsed,
-                    input_tokens=input_tokens,
-                    output_tokens=output_tokens,
+                    input_tokens=response.usage.input_tokens,
+                    output_tokens=response.usage.output_tokens,
+                    cache_read_tokens=response.usage.cache_read_input_tokens,
                     cost_usd=cost,
                     redlines_found=len(result.get('redlines', []))
                 )
@@ -518,10 +921,10 @@ class AnthropicExclusiveOrchestrator:
                 return result
 
             except asyncio.TimeoutError:
-                self.stats['timeout_errors'] += 1
+                self.stats.timeout_errors += 1
                 claude_errors.labels(model="opus", error_type="timeout").inc()
                 logger.error(
-                    f"Claude Opus timeout after 120 seconds (attempt {attempt + 1})",
+                    f"Claude Opus timed out or stalled (attempt {attempt + 1})",
                     attempt=attempt + 1
                 )
                 if attempt < self.max_retries:
@@ -533,11 +936,12 @@ class AnthropicExclusiveOrchestrator:
                 if attempt < self.max_retries and self._is_retryable_error(e):
                     continue
                 else:
-                    self._record_circuit_breaker_failure()
+                    if record_failures:
+                        self._record_circuit_breaker_failure()
                     raise RuntimeError(f"Claude Opus API error: {e.status_code} - {str(e)}")
 
             except APIConnectionError as e:
-                self.stats['connection_errors'] += 1
+                self.stats.connection_errors += 1
                 claude_errors.labels(model="opus", error_type="connection").inc()
                 logger.error(
                     f"Connection error to Claude Opus (attempt {attempt + 1})",
@@ -547,7 +951,8 @@ class AnthropicExclusiveOrchestrator:
                     await self._backoff(attempt, "connection")
                     continue
                 else:
-                    self._record_circuit_breaker_failure()
+                    if record_failures:
+                        self._record_circuit_breaker_failure()
                     raise RuntimeError(f"Connection failed to Claude Opus: {str(e)}")
 
             except Exception as e:
@@ -557,13 +962,139 @@ class AnthropicExclusiveOrchestrator:
                     error_type=type(e).__name__,
                     exc_info=True
                 )
-                self._record_circuit_breaker_failure()
+                if record_failures:
+                    self._record_circuit_breaker_failure()
                 raise RuntimeError(f"Opus analysis failed: {str(e)}")
 
         # Exhausted all retries
-        self._record_circuit_breaker_failure()
+        if record_failures:
+            self._record_circuit_breaker_failure()
         raise RuntimeError(f"Claude Opus analysis failed after {self.max_retries + 1} attempts")
 
+    async def _analyze_document_with_opus(
+        self,
+        document_text: str,
+        document_id: str,
+        rule_redlines: List[Dict],
+        streaming: Optional[StreamingValidation] = None
+    ) -> Dict[str, Any]:
+        """
+        Opus analysis of the whole document, or of paragraph shards in parallel
+
+        Sharding is used when enabled and the document is larger than one
+        shard, and always when the document would not fit in one prompt.
+        If a shard fails on a document that does fit, the whole document is
+        analyzed in one call instead. Only whole-document calls are streamed
+        to streaming. A document counts as at most one circuit breaker
+        failure, however many of its shards fail.
+        """
+        oversized = estimate_input_tokens(self._opus_params(document_text, rule_redlines)) > self.max_input_tokens
+        shard = self.shard_documents and estimate_tokens(document_text) > self.shard_tokens
+
+        if not (oversized or shard):
+            return await self._analyze_with_opus(document_text, document_id, rule_redlines, streaming)
+
+        shards = self._split_into_shards(document_text)
+        semaphore = asyncio.Semaphore(self.shard_concurrency)
+
+        async def analyze(start: int, end: int) -> Dict[str, Any]:
+            async with semaphore:
+                shard_rules = [r for r in rule_redlines if start <= r.get('start', -1) < end]
+                return await self._analyze_with_opus(
+                    document_text[start:end], document_id, shard_rules, record_failures=False
+                )
+
+        logger.info("Analyzing document in shards", shards=len(shards), oversized=oversized)
+        results = await asyncio.gather(*[analyze(start, end) for start, end in shards], return_exceptions=True)
+
+        failures = [result for result in results if isinstance(result, BaseException)]
+        if failures:
+            if oversized:
+                self._record_circuit_breaker_failure()
+                raise failures[0]
+            logger.warning(
+                "Sharded Opus analysis failed, analyzing the whole document",
+                failed_shards=len(failures),
+                error=str(failures[0])
+            )
+            return await self._analyze_with_opus(document_text, document_id, rule_redlines, streaming)
+
+        return {'redlines': [redline for result in results for redline in result.get('redlines', [])]}
+
+    def _split_into_shards(self, document_text: str) -> List[Tuple[int, int]]:
+        """
+        (start, end) spans of consecutive paragraphs of about shard_tokens each
+
+        Shards end on paragraph breaks; a single paragraph larger than a
+        shard becomes a shard of its own.
+        """
+        shards = []
+        shard_start = 0
+        offset = 0
+        max_chars = self.shard_tokens * CHARS_PER_TOKEN
+
+        for para in document_text.split('\n\n'):
+            end = offset + len(para)
+            if offset > shard_start and end - shard_start > max_chars:
+                shards.append((shard_start, offset - 2))
+                shard_start = offset
+            offset = end + 2
+
+        shards.append((shard_start, len(document_text)))
+        return shards
+
+    def _record_usage(self, model: str, usage, input_rate: float, output_rate: float) -> float:
+        """
+        Add one response's token usage to the stats and metrics
+
+        Rates are USD per 1K tokens. Cache reads bill at a tenth of the
+        input rate and cache writes at 1.25x.
+
+        Returns:
+            Cost of the response in USD
+        """
+        input_tokens = usage.input_tokens
+        output_tokens = usage.output_tokens
+        cache_read = usage.cache_read_input_tokens or 0
+        cache_creation = usage.cache_creation_input_tokens or 0
+        cost = (
+            (input_tokens + cache_read * 0.1 + cache_creation * 1.25) * input_rate
+            + output_tokens * output_rate
+        ) / 1000
+
+        stats = self.stats
+        stats.total_tokens_input += input_tokens
+        stats.total_tokens_output += output_tokens
+        stats.cache_read_tokens += cache_read
+        stats.cache_creation_tokens += cache_creation
+        stats.total_cost_usd += cost
+
+        claude_tokens.labels(model=model, type="input").inc(input_tokens)
+        claude_tokens.labels(model=model, type="output").inc(output_tokens)
+        claude_tokens.labels(model=model, type="cache_read").inc(cache_read)
+
+        return cost
+
+    async def _stream_message(self, on_text: Optional[Callable[[str], None]] = None, **params):
+        """
+        Run a Messages request as a stream and return the final message
+
+        Raises asyncio.TimeoutError when no event arrives within
+        stream_chunk_timeout seconds, so a quietly stuck socket is retried
+        instead of holding the request until the overall timeout. Text
+        deltas are passed to on_text as they arrive.
+        """
+        async with self.client.messages.stream(**params) as stream:
+            events = stream.__aiter__()
+            while True:
+                try:
+                    event = await asyncio.wait_for(events.__anext__(), timeout=self.stream_chunk_timeout)
+                except StopAsyncIteration:
+                    break
+                if on_text and event.type == "content_block_delta" and event.delta.type == "text_delta":
+                    on_text(event.delta.text)
+            return await stream.get_final_message()
+
     async def _validate_with_sonnet(
         self,
         opus_result: Dict[str, Any],
@@ -593,41 +1124,35 @@ class AnthropicExclusiveOrchestrator:
                 with claude_latency.labels(model="sonnet").time():
                     pass
 
-            prompt = self._build_validation_prompt(opus_result, document_text)
-
-            logger.info("Calling Claude Sonnet for validation", model=model)
-
-            response = await asyncio.wait_for(
-                self.client.messages.create(
-                    model=model,
-                    max_tokens=2048,
-                    temperature=0.0,  # Deterministic validation
-                    messages=[
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ]
-                ),
-                timeout=60.0  # 1 minute timeout for Sonnet
+            logger.info(
+                "Calling Claude Sonnet for validation",
+                model=model,
+                batch_api=self.use_batch_api
             )
 
-            # Track metrics
-            self.stats['sonnet_calls'] += 1
-            input_tokens = response.usage.input_tokens
-            output_tokens = response.usage.output_tokens
-            self.stats['total_tokens_input'] += input_tokens
-            self.stats['total_tokens_output'] += output_tokens
-
-            claude_tokens.labels(model="sonnet", type="input").inc(input_tokens)
-            claude_tokens.labels(model="sonnet", type="output").inc(output_tokens)
-
-            # Calculate cost (Sonnet pricing)
-            cost = (input_tokens * 0.003 + output_tokens * 0.015) / 1000
-            self.stats['total_cost_usd'] += cost
+            params = self._validation_params(opus_result, document_text)
+            cache_key = self._response_cache_key(params)
+            validation = self._cached_response(cache_key)
 
-            # Parse validation response
-            validation = self._parse_validation_response(response.content[0].text)
+            if validation is None:
+                if self.use_batch_api:
+                    response = await self._create_via_batch(params)
+                else:
+                    async with self._sonnet_sem:
+                        await self.sonnet_limiter.acquire(estimate_request_tokens(params))
+                        response = await asyncio.wait_for(
+                            self.client.messages.create(**params),
+                            timeout=60.0  # 1 minute timeout for Sonnet
+                        )
+
+                # Track metrics (Sonnet pricing, halved for batched requests)
+                self.stats.sonnet_calls += 1
+                discount = 0.5 if self.use_batch_api else 1.0
+                self._record_usage("sonnet", response.usage, 0.003 * discount, 0.015 * discount)
+
+                # Parse validation response
+                validation = self._parse_validation_response(response.content[0].text)
+                self._remember_response(cache_key, validation)
 
             # Merge validated results
             validated_redlines = self._merge_validation_results(
@@ -659,32 +1184,156 @@ class AnthropicExclusiveOrchestrator:
                 logger.info(f"Preserving {len(original_redlines)} Opus redlines after validation failure")
             return original_redlines
 
+    def _opus_params(self, document_text: str, rule_redlines: List[Dict]) -> Dict[str, Any]:
+        """
+        Messages API parameters for analyzing a document with Opus
+
+        The rule summary follows the static instructions as a second system
+        block with its own cache breakpoint, so documents with the same rule
+        findings share a cached prefix and only the document is new input.
+        """
+        system = OPUS_SYSTEM
+        rule_summary = self._build_rule_summary(rule_redlines)
+        if rule_summary:
+            system = OPUS_SYSTEM + [
+                {"type": "text", "text": rule_summary, "cache_control": {"type": "ephemeral"}}
+            ]
+
+        return {
+            "model": self.opus_model,
+            "max_tokens": 4096,
+            "temperature": 0.1,
+            "system": system,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": self._build_opus_prompt(document_text)
+                }
+            ]
+        }
+
+    def _validation_params(self, opus_result: Dict[str, Any], document_text: str) -> Dict[str, Any]:
+        """Messages API parameters for validating Opus redlines with Sonnet"""
+        return {
+            "model": self.sonnet_model,
+            "max_tokens": 512,  # A few id lists
+            "temperature": 0.0,  # Deterministic validation
+            "messages": [
+                {
+                    "role": "user",
+                    "content": self._build_validation_prompt(opus_result, document_text)
+                }
+            ]
+        }
+
+    @staticmethod
+    def _response_cache_key(params: Dict[str, Any]) -> str:
+        """Digest of everything that determines a response: model, system, messages, sampling"""
+        return hashlib.sha256(dumps(params, sort_keys=True).encode()).hexdigest()
+
+    def _cached_response(self, key: str) -> Optional[Dict]:
+        """A copy of the parsed response cached under key, unless it has expired"""
+        entry = self._response_cache.get(key)
+        if entry is None:
+            return None
+
+        stored_at, response = entry
+        if time.monotonic() - stored_at > self._response_cache_ttl:
+            del self._response_cache[key]
+            return None
+
+        self._response_cache.move_to_end(key)
+        self.stats.response_cache_hits += 1
+        return copy.deepcopy(response)
+
+    def _remember_response(self, key: str, response: Dict) -> None:
+        """Cache a parsed response; callers may mutate theirs, so a copy is kept"""
+        self._response_cache[key] = (time.monotonic(), copy.deepcopy(response))
+        self._response_cache.move_to_end(key)
+        if len(self._response_cache) > self._response_cache_size:
+            self._response_cache.popitem(last=False)
+
+    async def _create_via_batch(self, params: Dict[str, Any]):
+        """Run a single Messages request through the Message Batches API"""
+        messages = await self._run_message_batch([{"custom_id": "request-0", "params": params}])
+        if "request-0" not in messages:
+            raise RuntimeError("Batched request request-0 did not succeed")
+        return messages["request-0"]
+
+    async def _run_message_batch(self, requests: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Run Messages requests through the Message Batches API
+        Polls with exponential backoff until the batch ends or times out
+
+        Returns:
+            Response messages of the requests that succeeded, by custom_id
+        """
+        batches = self.client.messages.batches
+        batch = await batches.create(requests=requests)
+
+        deadline = time.time() + self.batch_api_timeout
+        delay = 1.0
+        while batch.processing_status != "ended":
+            if time.time() >= deadline:
+                await batches.cancel(batch.id)
+                raise asyncio.TimeoutError(
+                    f"Message batch {batch.id} did not finish in {self.batch_api_timeout:.0f}s"
+                )
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+            batch = await batches.retrieve(batch.id)
+
+        messages = {}
+        async for entry in await batches.results(batch.id):
+            if entry.result.type == "succeeded":
+                messages[entry.custom_id] = entry.result.message
+            else:
+                logger.warning(
+                    "Batched request did not succeed",
+                    batch_id=batch.id,
+                    custom_id=entry.custom_id,
+                    result_type=entry.result.type
+                )
+        return messages
+
     async def _handle_api_error(self, error: APIStatusError, model: str, attempt: int):
-        """Handle API status errors with appropriate backoff strategies"""
+        """
+        Handle API status errors with appropriate backoff strategies
+
+        Rate limit and overload waits follow the server's retry-after hint
+        when it sends one. No wait is taken after the final attempt.
+        """
+        will_retry = attempt < self.max_retries
 
         if error.status_code == 529:  # Overloaded - Anthropic specific
-            self.stats['overload_errors'] += 1
+            self.stats.overload_errors += 1
             claude_errors.labels(model=model, error_type="overloaded").inc()
-            wait_time = self._calculate_overload_backoff(attempt)
+            wait_time = self._retry_after(error)
+            if wait_time is None:
+                wait_time = self._calculate_overload_backoff(attempt)
             logger.warning(
-                f"Claude overloaded (529), backing off {wait_time}s",
+                f"Claude overloaded (529), backing off {wait_time:.1f}s",
                 status_code=529,
                 attempt=attempt + 1,
                 wait_time=wait_time
             )
-            await asyncio.sleep(wait_time)
+            if will_retry:
+                await asyncio.sleep(wait_time)
 
         elif error.status_code == 429:  # Rate limited
-            self.stats['rate_limit_hits'] += 1
+            self.stats.rate_limit_hits += 1
             claude_errors.labels(model=model, error_type="rate_limit").inc()
-            wait_time = self._calculate_backoff(attempt)
+            wait_time = self._retry_after(error)
+            if wait_time is None:
+                wait_time = self._calculate_backoff(attempt)
             logger.warning(
-                f"Rate limited, backing off {wait_time}s",
+                f"Rate limited, backing off {wait_time:.1f}s",
                 status_code=429,
                 attempt=attempt + 1,
                 wait_time=wait_time
             )
-            await asyncio.sleep(wait_time)
+            if will_retry:
+                await asyncio.sleep(wait_time)
 
         elif error.status_code >= 500:  # Server errors
             claude_errors.labels(model=model, error_type=f"server_{error.status_code}").inc()
@@ -705,6 +1354,24 @@ class AnthropicExclusiveOrchestrator:
                 error=str(error)
             )
 
+    @staticmethod
+    def _retry_after(error: APIStatusError) -> Optional[float]:
+        """
+        Seconds the server asked us to wait, plus up to 0.5s of jitter
+
+        Reads retry-after-ms or retry-after (seconds) from the response,
+        capped at 60s. Returns None when neither header is usable.
+        """
+        headers = getattr(error.response, 'headers', None) or {}
+        for header, scale in (('retry-after-ms', 0.001), ('retry-after', 1.0)):
+            try:
+                delay = float(headers.get(header)) * scale
+            except (TypeError, ValueError):
+                continue
+            if delay >= 0:
+                return min(delay, 60.0) + random.random() * 0.5
+        return None
+
     def _calculate_backoff(self, attempt: int) -> float:
         """Calculate standard exponential backoff with jitter"""
         base_delay = 1.0
@@ -731,38 +1398,51 @@ class AnthropicExclusiveOrchestrator:
             reason=reason,
             wait_seconds=wait_time
         )
-        self.stats['total_retries'] += 1
+        self.stats.total_retries += 1
         await asyncio.sleep(wait_time)
 
     def _check_circuit_breaker(self) -> bool:
         """
         Check if circuit breaker allows request
         Returns True if request should proceed, False if circuit is open
+
+        Half-open lets a single trial request through; concurrent requests
+        are rejected until it succeeds or fails. A trial that ends without
+        either (e.g. a non-API error) is replaced after the reset time.
         """
+        now = time.monotonic()
+
         # Check if we're in open state
         if self.circuit_breaker_state == CircuitBreakerState.OPEN:
             if self.circuit_breaker_last_failure_time:
-                time_since_failure = time.time() - self.circuit_breaker_last_failure_time
+                time_since_failure = now - self.circuit_breaker_last_failure_time
                 if time_since_failure >= self.circuit_breaker_reset_time:
                     # Try half-open state
                     self.circuit_breaker_state = CircuitBreakerState.HALF_OPEN
+                    self.circuit_breaker_probe_time = now
                     circuit_breaker_state_metric.set(CircuitBreakerState.HALF_OPEN.value)
                     logger.info("Circuit breaker entering half-open state")
                     return True
             return False
 
+        if self.circuit_breaker_state == CircuitBreakerState.HALF_OPEN:
+            if now - self.circuit_breaker_probe_time < self.circuit_breaker_reset_time:
+                return False
+            self.circuit_breaker_probe_time = now
+
         return True
 
     def _record_circuit_breaker_failure(self):
         """Record a failure for circuit breaker logic"""
         self.circuit_breaker_failures += 1
-        self.circuit_breaker_last_failure_time = time.time()
+        self.circuit_breaker_last_failure_time = time.monotonic()
 
         if self.circuit_breaker_failures >= self.circuit_breaker_threshold:
             if self.circuit_breaker_state != CircuitBreakerState.OPEN:
                 self.circuit_breaker_state = CircuitBreakerState.OPEN
+                self.circuit_breaker_probe_time = None
                 circuit_breaker_state_metric.set(CircuitBreakerState.OPEN.value)
-                self.stats['circuit_breaker_trips'] += 1
+                self.stats.circuit_breaker_trips += 1
                 logger.error(
                     "Circuit breaker tripped - opening circuit",
                     failures=self.circuit_breaker_failures,
@@ -777,6 +1457,7 @@ class AnthropicExclusiveOrchestrator:
         self.circuit_breaker_failures = 0
         self.circuit_breaker_last_failure_time = None
         self.circuit_breaker_state = CircuitBreakerState.CLOSED
+        self.circuit_breaker_probe_time = None
         circuit_breaker_state_metric.set(CircuitBreakerState.CLOSED.value)
 
     def _is_retryable_error(self, error: APIStatusError) -> bool:
@@ -784,90 +1465,54 @@ class AnthropicExclusiveOrchestrator:
         retryable_status_codes = {408, 429, 500, 502, 503, 504, 529}
         return error.status_code in retryable_status_codes
 
-    def _build_opus_prompt(self, document_text: str, rule_redlines: List[Dict]) -> str:
-        """Build the analysis prompt for Claude Opus"""
-        rule_summary = ""
-        if rule_redlines:
-            rule_summary = f"\n\nPre-identified issues from rule analysis ({len(rule_redlines)} found):\n"
-            for idx, redline in enumerate(rule_redlines[:5], 1):  # Show first 5
-                rule_summary += f"{idx}. {redline.get('pattern', 'Unknown')}: {redline.get('explanation', '')}\n"
+    def _build_rule_summary(self, rule_redlines: List[Dict]) -> str:
+        """Summarize the rule engine's findings for the Opus system prompt"""
+        if not rule_redlines:
+            return ""
 
-        return f"""Analyze this NDA document for all potential legal issues and necessary redlines.
+        rule_summary = f"Pre-identified issues from rule analysis ({len(rule_redlines)} found):\n"
+        for idx, redline in enumerate(rule_redlines[:5], 1):  # Show first 5
+            rule_summary += f"{idx}. {redline.get('pattern', 'Unknown')}: {redline.get('explanation', '')}\n"
+        return rule_summary
 
-{rule_summary}
+    def _build_opus_prompt(self, document_text: str) -> str:
+        """Build the analysis prompt for Claude Opus"""
+        return f"""Analyze this NDA document for all potential legal issues and necessary redlines.
 
 Document text:
 {document_text}
 
-Provide a comprehensive analysis including:
-1. All problematic clauses that should be modified or removed
-2. Missing standard protections that should be added
-3. Terms that are unusually restrictive or one-sided
-4. Potential risks and their severity
-5. Specific recommended changes with explanations
-
-CRITICAL: You must respond with ONLY a valid JSON object. Do not include any explanatory text before or after the JSON.
-
-Format your response as a JSON object with a 'redlines' array. Each redline object must include:
-- clause: The specific clause or section name
-- issue: What's problematic about this clause
-- severity: Must be exactly one of: "high", "medium", or "low"
-- original_text: The exact text from the document that needs to change (quote it precisely)
-- revised_text: The replacement text to use (or empty string "" if deleting)
-- recommendation: Brief description of the change needed
-- explanation: Detailed reasoning for why this change is important
-
-Example response format:
-{{
-  "redlines": [
-    {{
-      "clause": "Term and Termination",
-      "issue": "Confidentiality term is indefinite/perpetual",
-      "severity": "high",
-      "original_text": "shall remain in effect in perpetuity",
-      "revised_text": "shall remain in effect for 2 years from the Effective Date",
-      "recommendation": "Limit confidentiality term to 2 years",
-      "explanation": "Perpetual confidentiality obligations are unreasonably burdensome and should be time-limited to a reasonable period."
-    }},
-    {{
-      "clause": "Governing Law",
-      "issue": "Governing law is not Delaware",
-      "severity": "medium",
-      "original_text": "governed by the laws of California",
-      "revised_text": "governed by the laws of Delaware",
-      "recommendation": "Change governing law to Delaware",
-      "explanation": "Delaware law is preferred for consistency with corporate governance."
-    }}
-  ]
-}}
-
-If the document has no issues, return: {{"redlines": []}}
-
 Remember: Respond with ONLY the JSON object, no additional text."""
 
     def _build_validation_prompt(self, opus_result: Dict, document_text: str) -> str:
-        """Build validation prompt for Claude Sonnet"""
-        redlines_summary = json.dumps(opus_result.get('redlines', [])[:10], indent=2)
+        """
+        Build a compact validation prompt for Claude Sonnet
 
-        return f"""Review and validate these proposed redlines for accuracy and completeness.
+        Each redline is reduced to its id, severity, issue, original and
+        revised text, plus the document text around the original, so
+        Sonnet judges the change itself rather than Opus's explanation.
+        """
+        entries = []
+        for idx, redline in enumerate(opus_result.get('redlines', [])[:10]):
+            original = redline.get('original_text', '')
+            entry = (
+                f"[{idx}] {redline.get('severity', 'medium')}: {redline.get('issue', '')}\n"
+                f"ORIG: {original}\n"
+                f"NEW: {redline.get('revised_text', '')}"
+            )
+            position = document_text.find(original) if original else -1
+            if position != -1:
+                entry += f"\nCTX: {document_text[max(0, position - 150):position + len(original) + 150]}"
+            entries.append(entry)
 
-Proposed redlines:
-{redlines_summary}
+        redlines = "\n\n".join(entries)
 
-Original document (first 3000 chars):
-{document_text[:3000]}
+        return f"""Validate these proposed NDA redlines. Remove false positives and correct severities (high/medium/low).
 
-For each redline, verify:
-1. Is the issue accurately identified?
-2. Is the severity appropriate?
-3. Is the recommendation practical and legally sound?
-4. Are there any false positives to remove?
+{redlines}
 
-Respond with a JSON object containing:
-- validated_redlines: Array of redline IDs that are valid
-- removed_redlines: Array of redline IDs that are false positives
-- severity_adjustments: Object mapping redline IDs to new severity levels
-"""
+Reply with ONLY JSON using the ids above:
+{{"validated_redlines": ["0"], "removed_redlines": ["1"], "severity_adjustments": {{"0": "low"}}}}"""
 
     def _parse_claude_response(self, response_text: str) -> Dict:
         """
@@ -881,21 +1526,11 @@ Respond with a JSON object containing:
                 response_preview=response_text[:200],
             )
 
-            parsed = None
-
-            # 1) Try direct JSON
+            # 1) Try JSON, bare or inside markdown code fences
             text = response_text.strip()
-            if text.startswith("{"):
-                parsed = json.loads(text)
+            parsed = extract_json_object(text)
 
-            # 2) Try JSON inside markdown code fences
-            if parsed is None:
-                import re
-                json_match = re.search(r"```(?:json)?\s*(\{.*?\})\s*```", text, re.DOTALL)
-                if json_match:
-                    parsed = json.loads(json_match.group(1))
-
-            # 3) If we got JSON, normalize to {'redlines': [...]}
+            # 2) If we got JSON, normalize to {'redlines': [...]}
             if parsed is not None:
                 redlines = parsed.get("redlines")
                 if isinstance(redlines, list):
@@ -909,7 +1544,7 @@ Respond with a JSON object containing:
                     )
                     return {"redlines": []}
 
-            # 4) Fallback: structured text parsing
+            # 3) Fallback: structured text parsing
             logger.warning(
                 "Claude response not in JSON format, attempting text parsing fallback"
             )
@@ -971,14 +1606,10 @@ Respond with a JSON object containing:
     def _parse_validation_response(self, response_text: str) -> Dict:
         """Parse Sonnet's validation response"""
         try:
-            if response_text.strip().startswith('{'):
-                return json.loads(response_text)
-
-            # Extract JSON from potential markdown
-            import re
-            json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', response_text, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group(1))
+            # JSON, bare or inside markdown code fences
+            parsed = extract_json_object(response_text)
+            if parsed is not None:
+                return parsed
 
             # Default: approve all if parsing fails
             return {'validated_redlines': 'all', 'removed_redlines': []}
@@ -1134,19 +1765,23 @@ Respond with a JSON object containing:
 
     def _get_stats_snapshot(self) -> Dict:
         """Get current statistics snapshot"""
-        stats = self.stats.copy()
+        # Counters only; the durations window is summarized below
+        stats = {
+            f.name: getattr(self.stats, f.name)
+            for f in fields(self.stats) if f.name != 'processing_times'
+        }
 
         # Calculate derived metrics
         if stats['total_requests'] > 0:
             stats['success_rate'] = stats['successful_requests'] / stats['total_requests']
             stats['average_retries'] = stats['total_retries'] / stats['total_requests']
 
-        if stats['processing_times']:
-            stats['avg_processing_time'] = sum(stats['processing_times']) / len(stats['processing_times'])
-            stats['p95_processing_time'] = sorted(stats['processing_times'])[int(len(stats['processing_times']) * 0.95)] if len(stats['processing_times']) > 1 else stats['processing_times'][0]
-
-        # Remove detailed arrays from snapshot
-        stats.pop('processing_times', None)
+        # Percentiles over the last PROCESSING_TIMES_WINDOW requests
+        times = sorted(self.stats.processing_times)
+        if times:
+            stats['avg_processing_time'] = sum(times) / len(times)
+            for name, quantile in (('p50', 0.5), ('p95', 0.95), ('p99', 0.99)):
+                stats[f'{name}_processing_time'] = times[min(len(times) - 1, int(len(times) * quantile))]
 
         return stats
 
@@ -1169,6 +1804,10 @@ Respond with a JSON object containing:
         if "rate limit" in error_str.lower() or error_type == "RateLimitError":
             return "The AI service is currently experiencing high demand. Please try again in a few moments."
 
+        # Oversized documents
+        if "too large" in error_str.lower():
+            return "This document is too large to analyze in one pass. Please split it into smaller documents and try again."
+
         # Timeout errors
         if "timeout" in error_str.lower() or error_type == "TimeoutError":
             return "The AI analysis took too long to complete. This may be due to document size or service load. Please try again."
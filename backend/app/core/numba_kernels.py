@@ -0,0 +1,57 @@
+"""
+Numba-compiled similarity kernels for embedding deduplication
+Fuses the dot products and best-match selection over a matrix of L2-normalized
+embeddings; falls back to NumPy when Numba is not installed.
+"""
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = np is not None
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _best_match_kernel(E, q):
+        k = E.shape[0]
+        d = E.shape[1]
+        scores = np.empty(k, dtype=np.float32)
+        for i in prange(k):
+            s = np.float32(0.0)
+            for j in range(d):
+                s += E[i, j] * q[j]
+            scores[i] = s
+
+        best_idx = 0
+        best_score = scores[0]
+        for i in range(1, k):
+            if scores[i] > best_score:
+                best_idx = i
+                best_score = scores[i]
+        return best_idx, best_score
+
+
+def best_match(E, q):
+    """
+    Find the row of E most similar to q.
+
+    Args:
+        E: (k, d) float32 matrix of L2-normalized embeddings, k >= 1
+        q: (d,) float32 L2-normalized query embedding
+
+    Returns:
+        Tuple of (row index, cosine similarity as a float32 scalar)
+    """
+    if NUMBA_AVAILABLE:
+        idx, score = _best_match_kernel(E, q)
+        return int(idx), np.float32(score)
+
+    sims = E @ q
+    idx = int(sims.argmax())
+    return idx, sims[idx]
@@ -0,0 +1,36 @@
+"""
+Shared process pool for CPU-bound document work
+One pool per worker process, created on first use and shut down with the worker
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    The worker's shared process pool, created on first use
+
+    Pool processes are spawned, not forked: the server process runs an event
+    loop and threads whose locks a forked child would inherit in whatever
+    state they happened to be in. Sized by BATCH_EXTRACT_WORKERS (default:
+    CPU count).
+    """
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(
+            max_workers=int(os.getenv("BATCH_EXTRACT_WORKERS", str(os.cpu_count() or 1))),
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _process_pool
+
+
+def shutdown_process_pool() -> None:
+    """Stop the pool's processes; the next get_process_pool() call starts a new pool"""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=True, cancel_futures=True)
+    _process_pool = None
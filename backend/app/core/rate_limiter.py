@@ -0,0 +1,91 @@
+"""
+Client-side rate limiting for Anthropic calls
+Token buckets for requests and tokens per minute, shared per model within a worker
+"""
+import asyncio
+import os
+import time
+from typing import Dict
+
+
+class RateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute buckets for one model
+
+    Each bucket refills continuously up to its per-minute limit. acquire()
+    waits until both hold enough capacity for the request and then takes
+    it, so calls are spread out before the API rejects them with a 429.
+    A limit of 0 leaves that dimension unlimited.
+    """
+
+    def __init__(self, rpm: int = 0, tpm: int = 0):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requests = float(rpm)
+        self._tokens = float(tpm)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.rpm or self.tpm)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60)
+        self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60)
+
+    def _wait_time(self, tokens: int) -> float:
+        """Seconds until both buckets can cover the request; 0 if they can now"""
+        wait = 0.0
+        if self.rpm and self._requests < 1:
+            wait = (1 - self._requests) * 60 / self.rpm
+        if self.tpm and self._tokens < tokens:
+            wait = max(wait, (tokens - self._tokens) * 60 / self.tpm)
+        return wait
+
+    async def acquire(self, tokens: int) -> None:
+        """
+        Wait for capacity for one request of about this many tokens
+
+        Callers are served in arrival order. A request larger than the whole
+        token bucket waits for a full bucket instead of forever.
+        """
+        if not self.enabled:
+            return
+
+        if self.tpm:
+            tokens = min(tokens, self.tpm)
+        async with self._lock:
+            self._refill()
+            wait = self._wait_time(tokens)
+            while wait > 0:
+                await asyncio.sleep(wait)
+                self._refill()
+                wait = self._wait_time(tokens)
+            if self.rpm:
+                self._requests -= 1
+            if self.tpm:
+                self._tokens -= tokens
+
+
+_limiters: Dict[str, RateLimiter] = {}
+
+
+def get_rate_limiter(model: str) -> RateLimiter:
+    """
+    The worker's shared limiter for a model family ("opus" or "sonnet")
+
+    Limits come from <MODEL>_RPM and <MODEL>_TPM (e.g. OPUS_RPM) and default
+    to 0, i.e. unlimited; set them to the organization's API tier limits.
+    """
+    limiter = _limiters.get(model)
+    if limiter is None:
+        prefix = model.upper()
+        limiter = _limiters[model] = RateLimiter(
+            rpm=int(os.getenv(f"{prefix}_RPM", "0")),
+            tpm=int(os.getenv(f"{prefix}_TPM", "0"))
+        )
+    return limiter
@@ -5,6 +5,8 @@ Reduces redline volume to focus on material issues
 from typing import List, Dict, Set, Tuple
 from collections import defaultdict
 
+from .rule_engine import find_overlapping_pairs
+
 
 class RedlineOptimizer:
     """Optimize redlines for maximum acceptance rate"""
@@ -126,23 +128,19 @@ class RedlineOptimizer:
         groups = []
         used = set()
 
-        for i, redline1 in enumerate(redlines):
+        # Later redlines overlapping each redline (touching spans count)
+        overlaps = defaultdict(list)
+        spans = [(r.get('start', 0), r.get('end', 0)) for r in redlines]
+        for i, j in find_overlapping_pairs(spans, inclusive=True):
+            overlaps[i].append(j)
+
+        for i in range(len(redlines)):
             if i in used:
                 continue
 
             group = [i]
-            start1 = redline1.get('start', 0)
-            end1 = redline1.get('end', 0)
-
-            for j, redline2 in enumerate(redlines[i+1:], i+1):
-                if j in used:
-                    continue
-
-                start2 = redline2.get('start', 0)
-                end2 = redline2.get('end', 0)
-
-                # Check for overlap
-                if not (end1 < start2 or end2 < start1):
+            for j in overlaps[i]:
+                if j not in used:
                     group.append(j)
                     used.add(j)
 
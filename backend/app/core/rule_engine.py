@@ -5,7 +5,7 @@ First pass before LLM analysis for guaranteed accuracy on known patterns
 import yaml
 import re
 import logging
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -36,6 +36,8 @@ class RuleEngine:
                     rule['pattern'],
                     re.IGNORECASE | re.DOTALL
                 )
+            if 'context_required' in rule:
+                rule['compiled_context'] = re.compile(rule['context_required'], re.IGNORECASE)
 
     def apply_rules(self, working_text: str) -> List[Dict]:
         """
@@ -127,7 +129,7 @@ class RuleEngine:
 
         # Check context requirements
         if 'context_required' in rule:
-            context_pattern = re.compile(rule['context_required'], re.IGNORECASE)
+            context_pattern = rule['compiled_context']
             # Get surrounding context
             context_start = max(0, start - 200)
             context_end = min(len(working_text), end + 200)
@@ -223,6 +225,36 @@ class RuleEngine:
         }
 
 
+def find_overlapping_pairs(spans: List[Tuple[int, int]], inclusive: bool = False) -> List[Tuple[int, int]]:
+    """
+    Index pairs (i, j), i < j, of spans that overlap, in (i, j) order
+
+    Sweeps the spans in start order, keeping only those still open at the
+    current start, so the cost follows the number of overlaps rather than
+    every pair. With inclusive=True spans that merely touch also overlap.
+    """
+    order = sorted(range(len(spans)), key=lambda i: spans[i][0])
+    active: List[int] = []
+    pairs = []
+
+    for j in order:
+        start, end = spans[j]
+        # Spans closed before this start cannot overlap it or anything later
+        active = [i for i in active if spans[i][1] > start or (inclusive and spans[i][1] == start)]
+        for i in active:
+            other_start, other_end = spans[i]
+            if inclusive:
+                overlaps = not (other_end < start or end < other_start)
+            else:
+                overlaps = other_end > start and other_start < end
+            if overlaps:
+                pairs.append((i, j) if i < j else (j, i))
+        active.append(j)
+
+    pairs.sort()
+    return pairs
+
+
 class RuleConflictDetector:
     """Detect conflicts between rules"""
 
@@ -230,18 +262,17 @@ class RuleConflictDetector:
     def find_conflicts(redlines: List[Dict]) -> List[Dict]:
         """Find redlines that conflict with each other"""
         conflicts = []
-
-        for i, r1 in enumerate(redlines):
-            for r2 in redlines[i+1:]:
-                # Check for overlap
-                if r1['end'] > r2['start'] and r1['start'] < r2['end']:
-                    conflicts.append({
-                        'redline1': r1,
-                        'redline2': r2,
-                        'type': 'overlap',
-                        'overlap_start': max(r1['start'], r2['start']),
-                        'overlap_end': min(r1['end'], r2['end'])
-                    })
+        spans = [(r['start'], r['end']) for r in redlines]
+
+        for i, j in find_overlapping_pairs(spans):
+            r1, r2 = redlines[i], redlines[j]
+            conflicts.append({
+                'redline1': r1,
+                'redline2': r2,
+                'type': 'overlap',
+                'overlap_start': max(r1['start'], r2['start']),
+                'overlap_end': min(r1['end'], r2['end'])
+            })
 
         return conflicts
 
@@ -105,6 +105,8 @@ class RuleEngineV2:
                 except re.error as e:
                     logger.error(f"Failed to compile pattern for rule {rule.get('id')}: {e}")
                     rule['compiled_pattern'] = None
+            if 'context_required' in rule:
+                rule['compiled_context'] = re.compile(rule['context_required'], re.IGNORECASE)
 
     def apply_rules(self,
                    working_text: str,
@@ -243,7 +245,7 @@ class RuleEngineV2:
         if 'context_required' not in rule:
             return True
 
-        context_pattern = re.compile(rule['context_required'], re.IGNORECASE)
+        context_pattern = rule['compiled_context']
 
         # Get surrounding context (±200 chars)
         context_start = max(0, start - 200)
@@ -5,16 +5,19 @@ to reduce redundant LLM API calls and achieve 60% cost reduction.
 """
 
 import os
-import json
+import re
 import time
 import hashlib
 import logging
 import asyncio
+from collections import Counter, OrderedDict
 from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime, timedelta
 from pathlib import Path
 from functools import lru_cache
 
+from .json_utils import dumps, loads
+
 # Lazy imports for heavy dependencies (prevents import-time crashes)
 # These will be imported when the cache is actually instantiated
 numpy = None
@@ -24,6 +27,66 @@ redis = None
 
 logger = logging.getLogger(__name__)
 
+# SimHash fingerprint index settings
+SIMHASH_BITS = 128
+SIMHASH_BANDS = 4  # 4 x 32-bit bands
+SIMHASH_MAX_DISTANCE = 8
+SIMHASH_SHINGLE_SIZE = 2
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def simhash_fingerprint(text: str) -> int:
+    """
+    Compute a 128-bit SimHash over count-weighted word shingles.
+
+    Near-identical texts produce fingerprints within a small Hamming distance.
+    """
+    tokens = _TOKEN_RE.findall(text.lower())
+    if len(tokens) >= SIMHASH_SHINGLE_SIZE:
+        features = Counter(
+            ' '.join(tokens[i:i + SIMHASH_SHINGLE_SIZE])
+            for i in range(len(tokens) - SIMHASH_SHINGLE_SIZE + 1)
+        )
+    else:
+        features = Counter(tokens)
+
+    weights = [0] * SIMHASH_BITS
+    for feature, weight in features.items():
+        feature_hash = int.from_bytes(
+            hashlib.blake2b(feature.encode('utf-8'), digest_size=SIMHASH_BITS // 8).digest(),
+            'big'
+        )
+        for bit in range(SIMHASH_BITS):
+            if (feature_hash >> bit) & 1:
+                weights[bit] += weight
+            else:
+                weights[bit] -= weight
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def _normalized_text_hash(text: str) -> str:
+    """
+    Hash of clause text with case and whitespace normalized.
+
+    Texts with equal hashes also have equal SimHash fingerprints.
+    """
+    normalized = ' '.join(text.lower().split())
+    return hashlib.blake2b(normalized.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _simhash_bands(fingerprint: int) -> List[int]:
+    """Split a fingerprint into SIMHASH_BANDS equal-width bands."""
+    width = SIMHASH_BITS // SIMHASH_BANDS
+    mask = (1 << width) - 1
+    return [(fingerprint >> (band * width)) & mask for band in range(SIMHASH_BANDS)]
+
+
 def _lazy_import_dependencies():
     """Import heavy dependencies lazily to prevent startup crashes."""
     global numpy, faiss, SentenceTransformer, redis
@@ -96,6 +159,17 @@ class SemanticCache:
         self.next_id = 0
         self.redis_client = None
 
+        # SimHash fingerprint index: fingerprint -> entry in LRU order, plus
+        # one bucket map per band for candidate lookup. Bounded; Redis, when
+        # configured, holds the rest.
+        self.fingerprint_entries: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self.fingerprint_bands: List[Dict[int, set]] = [{} for _ in range(SIMHASH_BANDS)]
+        self._fingerprint_index_size = int(os.getenv("FINGERPRINT_INDEX_SIZE", "10000"))
+
+        # In-process embedding memo (text hash -> normalized embedding)
+        self._embedding_memo: Dict[str, Any] = {}
+        self._embedding_memo_size = int(os.getenv("EMBEDDING_MEMO_SIZE", "10000"))
+
         # Performance metrics
         self.stats = {
             "hits": 0,
@@ -232,14 +306,21 @@ class SemanticCache:
             self._save_cache()
 
     def _normalize_embedding(self, embedding):
-        """Normalize embedding for cosine similarity."""
+        """
+        L2-normalize embedding to float32 so a plain dot product is the cosine
+        similarity.
+        """
         if numpy is None:
             return embedding
 
-        norm = numpy.linalg.norm(embedding)
-        if norm > 0:
-            return embedding / norm
-        return embedding
+        embedding = numpy.asarray(embedding, dtype=numpy.float32)
+        return embedding / (numpy.linalg.norm(embedding) + numpy.float32(1e-12))
+
+    def _remember_embedding(self, key: str, embedding):
+        """Add an embedding to the in-process memo, evicting the oldest entry when full."""
+        if len(self._embedding_memo) >= self._embedding_memo_size:
+            self._embedding_memo.pop(next(iter(self._embedding_memo)))
+        self._embedding_memo[key] = embedding
 
     async def get_embedding(self, text: str):
         """
@@ -254,26 +335,34 @@ class SemanticCache:
         if not self.enabled or self.encoder is None:
             return None
 
+        text_hash = hashlib.md5(text.encode()).hexdigest()
+        memoized = self._embedding_memo.get(text_hash)
+        if memoized is not None:
+            return memoized
+
         # Use cached embedding if available in Redis
         if self.redis_client:
             try:
-                cache_key = f"embedding:{hashlib.md5(text.encode()).hexdigest()}"
+                cache_key = f"embedding:{text_hash}"
                 cached = await self.redis_client.get(cache_key)
                 if cached:
                     import pickle
-                    return pickle.loads(cached)
+                    embedding = pickle.loads(cached)
+                    self._remember_embedding(text_hash, embedding)
+                    return embedding
             except Exception as e:
                 logger.debug(f"Redis embedding lookup failed: {e}")
 
         # Generate new embedding
         embedding = self.encoder.encode(text, convert_to_numpy=True)
         normalized = self._normalize_embedding(embedding)
+        self._remember_embedding(text_hash, normalized)
 
         # Cache in Redis if available
         if self.redis_client:
             try:
                 import pickle
-                cache_key = f"embedding:{hashlib.md5(text.encode()).hexdigest()}"
+                cache_key = f"embedding:{text_hash}"
                 await self.redis_client.setex(
                     cache_key,
                     3600,  # 1 hour TTL for embeddings
@@ -284,6 +373,57 @@ class SemanticCache:
 
         return normalized
 
+    async def get_embeddings_batch(self, texts: List[str], batch_size: int = 1024):
+        """
+        Generate embeddings for many texts with batched encoder calls.
+
+        Texts already in the in-process memo are not re-encoded.
+
+        Args:
+            texts: Input texts to embed
+            batch_size: Maximum number of texts per encoder call
+
+        Returns:
+            (len(texts), dimension) array of normalized embeddings, or None if disabled
+        """
+        if not self.enabled or self.encoder is None:
+            return None
+
+        text_hashes = [hashlib.md5(text.encode()).hexdigest() for text in texts]
+        resolved = {}
+        pending = {}
+        for text, text_hash in zip(texts, text_hashes):
+            if text_hash in resolved or text_hash in pending:
+                continue
+            memoized = self._embedding_memo.get(text_hash)
+            if memoized is not None:
+                resolved[text_hash] = memoized
+            else:
+                pending[text_hash] = text
+
+        pending_items = list(pending.items())
+        for offset in range(0, len(pending_items), batch_size):
+            chunk = pending_items[offset:offset + batch_size]
+            embeddings = self.encoder.encode(
+                [text for _, text in chunk],
+                batch_size=min(batch_size, 64),
+                convert_to_numpy=True
+            )
+            embeddings = numpy.asarray(embeddings, dtype=numpy.float32)
+            embeddings = embeddings / (
+                numpy.linalg.norm(embeddings, axis=1, keepdims=True) + numpy.float32(1e-12)
+            )
+            for (text_hash, _), embedding in zip(chunk, embeddings):
+                resolved[text_hash] = embedding
+                self._remember_embedding(text_hash, embedding)
+
+        if not texts:
+            return numpy.empty((0, self.dimension), dtype=numpy.float32)
+
+        return numpy.stack(
+            [resolved[text_hash] for text_hash in text_hashes]
+        ).astype(numpy.float32, copy=False)
+
     async def search(
         self,
         clause_text: str,
@@ -301,8 +441,14 @@ class SemanticCache:
         """
         # If cache is disabled, always return None (cache miss)
         if not self.enabled:
+            self.stats['misses'] += 1
             return None
 
+        # Fingerprint index first: repeated clauses need no embedding
+        fingerprint_hit = await self._search_fingerprint(clause_text)
+        if fingerprint_hit:
+            return fingerprint_hit
+
         try:
             # Generate embedding for query
             query_embedding = await self.get_embedding(clause_text)
@@ -373,10 +519,12 @@ class SemanticCache:
             context: Optional context information
             cost: Estimated cost of the LLM call
         """
-        # If cache is disabled, do nothing
+        # If cache is disabled, nothing is stored
         if not self.enabled:
             return
 
+        await self._store_fingerprint(clause_text, response, cost)
+
         try:
             # Generate embedding
             embedding = await self.get_embedding(clause_text)
@@ -416,7 +564,7 @@ class SemanticCache:
                     await self.redis_client.setex(
                         cache_key,
                         self.ttl_seconds,
-                        json.dumps({
+                        dumps({
                             'response': response,
                             'timestamp': time.time()
                         })
@@ -429,6 +577,117 @@ class SemanticCache:
         except Exception as e:
             logger.error(f"Cache store error: {e}")
 
+    async def _search_fingerprint(self, clause_text: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a clause by SimHash fingerprint.
+
+        Candidates sharing at least one band are checked for Hamming distance
+        <= SIMHASH_MAX_DISTANCE, and reused only if their normalized text hash
+        matches: a few changed words ("two (2)" for "five (5)", "may" for
+        "shall not") keep the fingerprint close but change the analysis.
+        """
+        fingerprint = simhash_fingerprint(clause_text)
+        text_hash = _normalized_text_hash(clause_text)
+        bands = _simhash_bands(fingerprint)
+
+        candidates = set()
+        for band_index, band_value in enumerate(bands):
+            candidates.update(self.fingerprint_bands[band_index].get(band_value, ()))
+
+        if self.redis_client:
+            try:
+                for band_index, band_value in enumerate(bands):
+                    members = await self.redis_client.smembers(
+                        f"simhash:band:{band_index}:{band_value}"
+                    )
+                    candidates.update(int(member) for member in members)
+            except Exception as e:
+                logger.debug(f"Redis fingerprint lookup failed: {e}")
+
+        best_entry = None
+        best_fingerprint = None
+        best_distance = SIMHASH_MAX_DISTANCE + 1
+        now = time.time()
+        for candidate in candidates:
+            distance = bin(candidate ^ fingerprint).count('1')
+            if distance >= best_distance:
+                continue
+
+            entry = self.fingerprint_entries.get(candidate)
+            if entry is not None and now - entry['timestamp'] > self.ttl_seconds:
+                self._forget_fingerprint(candidate)
+                entry = None
+            if entry is None and self.redis_client:
+                try:
+                    raw = await self.redis_client.get(f"simhash:entry:{candidate:032x}")
+                    entry = loads(raw) if raw else None
+                except Exception as e:
+                    logger.debug(f"Redis fingerprint entry fetch failed: {e}")
+
+            if (entry and entry.get('text_hash') == text_hash
+                    and now - entry['timestamp'] <= self.ttl_seconds):
+                best_entry, best_fingerprint, best_distance = entry, candidate, distance
+
+        if best_entry is None:
+            return None
+
+        if best_fingerprint in self.fingerprint_entries:
+            self.fingerprint_entries.move_to_end(best_fingerprint)
+
+        similarity = 1.0 - best_distance / SIMHASH_BITS
+        self.stats['hits'] += 1
+        self.stats['avg_similarity'] = self.stats['avg_similarity'] * 0.9 + similarity * 0.1
+
+        return {
+            'response': best_entry['response'],
+            'similarity': similarity,
+            'cached': True,
+            'cache_age_hours': (now - best_entry['timestamp']) / 3600
+        }
+
+    async def _store_fingerprint(self, clause_text: str, response: Dict[str, Any], cost: float):
+        """Index a response under the clause's SimHash fingerprint."""
+        fingerprint = simhash_fingerprint(clause_text)
+        entry = {
+            'response': response,
+            'text_hash': _normalized_text_hash(clause_text),
+            'timestamp': time.time(),
+            'cost': cost
+        }
+
+        self.fingerprint_entries[fingerprint] = entry
+        self.fingerprint_entries.move_to_end(fingerprint)
+        for band_index, band_value in enumerate(_simhash_bands(fingerprint)):
+            self.fingerprint_bands[band_index].setdefault(band_value, set()).add(fingerprint)
+
+        # Evict least recently used fingerprints past the size cap
+        while len(self.fingerprint_entries) > self._fingerprint_index_size:
+            self._forget_fingerprint(next(iter(self.fingerprint_entries)))
+
+        if self.redis_client:
+            try:
+                await self.redis_client.setex(
+                    f"simhash:entry:{fingerprint:032x}",
+                    self.ttl_seconds,
+                    dumps(entry)
+                )
+                for band_index, band_value in enumerate(_simhash_bands(fingerprint)):
+                    band_key = f"simhash:band:{band_index}:{band_value}"
+                    await self.redis_client.sadd(band_key, str(fingerprint))
+                    await self.redis_client.expire(band_key, self.ttl_seconds)
+            except Exception as e:
+                logger.debug(f"Redis fingerprint store failed: {e}")
+
+    def _forget_fingerprint(self, fingerprint: int):
+        """Drop a fingerprint and its band memberships from the in-process index."""
+        self.fingerprint_entries.pop(fingerprint, None)
+        for band_index, band_value in enumerate(_simhash_bands(fingerprint)):
+            bucket = self.fingerprint_bands[band_index].get(band_value)
+            if bucket is not None:
+                bucket.discard(fingerprint)
+                if not bucket:
+                    del self.fingerprint_bands[band_index][band_value]
+
     def _get_hit_rate(self) -> float:
         """Calculate cache hit rate."""
         total = self.stats['hits'] + self.stats['misses']
@@ -446,6 +705,7 @@ class SemanticCache:
         return {
             'enabled': self.enabled,
             'total_entries': len(self.cache_data) if self.enabled else 0,
+            'fingerprint_entries': len(self.fingerprint_entries),
             'hits': self.stats['hits'],
             'misses': self.stats['misses'],
             'hit_rate': self._get_hit_rate(),
@@ -134,8 +134,8 @@ class WorkerState:
         """
         Cleanup worker resources on shutdown
 
-        Ensures proper cleanup of Anthropic AsyncAnthropic client and other resources
-        Uses aclose() for async client cleanup
+        Stops the orchestrator's background work with aclose(); the Anthropic
+        connection pool is shared across the worker and closed by the app lifespan
         """
         if not self.initialized:
             return
@@ -150,21 +150,20 @@ class WorkerState:
                 }
             )
 
-            # Close Anthropic AsyncAnthropic client if available
-            # AsyncAnthropic uses aclose() not close()
-            if self.orchestrator and hasattr(self.orchestrator, 'client'):
-                if hasattr(self.orchestrator.client, 'aclose'):
-                    try:
-                        await self.orchestrator.client.aclose()
-                        logger.info(
-                            f"Worker {self.worker_id}: Anthropic client closed",
-                            extra={"worker_pid": self.worker_id}
-                        )
-                    except Exception as e:
-                        logger.warning(
-                            f"Worker {self.worker_id}: Error closing Anthropic client - {e}",
-                            extra={"worker_pid": self.worker_id}
-                        )
+            # Stop the orchestrator's background work; the shared connection
+            # pool is closed once by the app lifespan
+            if self.orchestrator and hasattr(self.orchestrator, 'aclose'):
+                try:
+                    await self.orchestrator.aclose()
+                    logger.info(
+                        f"Worker {self.worker_id}: Orchestrator closed",
+                        extra={"worker_pid": self.worker_id}
+                    )
+                except Exception as e:
+                    logger.warning(
+                        f"Worker {self.worker_id}: Error closing orchestrator - {e}",
+                        extra={"worker_pid": self.worker_id}
+                    )
 
             # Clear references
             self.orchestrator = None
@@ -5,11 +5,17 @@ Critical for precise span alignment when applying track changes
 from docx import Document
 from docx.text.paragraph import Paragraph
 from docx.table import Table
-from typing import List, Dict, Tuple, Optional
+from typing import Iterable, List, Dict, Tuple, Optional
+from bisect import bisect_right
 import re
 import gc  # Added for garbage collection
 
 
+# normalize_text runs once per run of every document, so its patterns are built once
+_WHITESPACE_RE = re.compile(r'\s+')
+_ZERO_WIDTH = dict.fromkeys(map(ord, '\u200b\ufeff'))
+
+
 class TextMapping:
     """Represents a span in the working text and its DOCX location"""
     def __init__(self, start: int, end: int, p_idx: int, r_idx: int,
@@ -39,6 +45,8 @@ class WorkingTextIndexer:
         self.working_text = ""
         self.mappings: List[TextMapping] = []
         self.doc = None
+        # End offsets of self.mappings, rebuilt when mappings change
+        self._mapping_ends: List[int] = []
 
     def normalize_text(self, text: str) -> str:
         """Normalize text for consistent processing"""
@@ -46,10 +54,10 @@ class WorkingTextIndexer:
             return ""
 
         # Normalize whitespace but preserve structure
-        text = re.sub(r'\s+', ' ', text)
+        text = _WHITESPACE_RE.sub(' ', text)
 
         # Remove zero-width characters
-        text = re.sub(r'[\u200b\ufeff]', '', text)
+        text = text.translate(_ZERO_WIDTH)
 
         return text
 
@@ -154,6 +162,7 @@ class WorkingTextIndexer:
         self.doc = doc
         self.working_text = ""
         self.mappings = []
+        self._mapping_ends = []
 
         # Index main document paragraphs
         for p_idx, paragraph in enumerate(doc.paragraphs):
@@ -173,23 +182,39 @@ class WorkingTextIndexer:
                 for p_idx, paragraph in enumerate(section.footer.paragraphs):
                     self.index_paragraph(paragraph, p_idx, element_type='footer')
 
+    def _spans_from(self, first: int, end: int) -> List[TextMapping]:
+        """Mappings from index first onward that start before end"""
+        mappings = self.mappings
+        result = []
+        for i in range(first, len(mappings)):
+            if mappings[i].start >= end:
+                break
+            result.append(mappings[i])
+        return result
+
+    def _ends(self) -> List[int]:
+        """End offsets of the mappings, which are in working text order"""
+        if len(self._mapping_ends) != len(self.mappings):
+            self._mapping_ends = [mapping.end for mapping in self.mappings]
+        return self._mapping_ends
+
     def find_spans(self, start: int, end: int) -> List[TextMapping]:
         """
         Find all DOCX mappings that overlap with the given text span.
         Binary search for efficiency.
         """
-        result = []
-
-        for mapping in self.mappings:
-            # Check for overlap
-            if mapping.end <= start:
-                continue
-            if mapping.start >= end:
-                break
+        # First mapping ending after start; mappings are sorted and disjoint
+        first = bisect_right(self._ends(), start)
+        return self._spans_from(first, end)
 
-            result.append(mapping)
+    def find_spans_bulk(self, spans: Iterable[Tuple[int, int]]) -> List[List[TextMapping]]:
+        """
+        Find the overlapping mappings of many (start, end) spans at once.
 
-        return result
+        Returns one list per span, in the order given.
+        """
+        ends = self._ends()
+        return [self._spans_from(bisect_right(ends, start), end) for start, end in spans]
 
     def find_exact_span(self, text: str, start_hint: int = 0) -> Optional[Tuple[int, int]]:
         """Find exact match of text in working_text, starting from hint"""
@@ -208,21 +233,26 @@ class WorkingTextIndexer:
 
         return self.working_text[context_start:context_end]
 
-    def get_paragraph_and_run(self, mapping: TextMapping):
-        """Get the actual paragraph and run objects from a mapping"""
+    def get_paragraph_runs(self, mapping: TextMapping) -> Tuple[Optional[Paragraph], List]:
+        """Get the paragraph of a mapping and its normalized runs"""
         if mapping.element_type == 'paragraph':
             paragraph = self.doc.paragraphs[mapping.p_idx]
-            normalized_runs = self.normalize_runs(paragraph.runs)
-            if mapping.r_idx < len(normalized_runs):
-                return paragraph, normalized_runs[mapping.r_idx]['run']
 
         elif mapping.element_type == 'table_cell':
             table = self.doc.tables[mapping.table_info['table_idx']]
             cell = table.rows[mapping.table_info['row']].cells[mapping.table_info['col']]
             paragraph = cell.paragraphs[mapping.p_idx]
-            normalized_runs = self.normalize_runs(paragraph.runs)
-            if mapping.r_idx < len(normalized_runs):
-                return paragraph, normalized_runs[mapping.r_idx]['run']
+
+        else:
+            return None, []
+
+        return paragraph, self.normalize_runs(paragraph.runs)
+
+    def get_paragraph_and_run(self, mapping: TextMapping):
+        """Get the actual paragraph and run objects from a mapping"""
+        paragraph, normalized_runs = self.get_paragraph_runs(mapping)
+        if paragraph is not None and mapping.r_idx < len(normalized_runs):
+            return paragraph, normalized_runs[mapping.r_idx]['run']
 
         return None, None
 
@@ -260,6 +290,7 @@ class WorkingTextIndexer:
         # Clear large data structures
         self.working_text = ""
         self.mappings = []
+        self._mapping_ends = []
 
         # Force garbage collection
         gc.collect()
@@ -40,6 +40,8 @@ except ImportError as e:
 
 # Import worker state management
 from .core.state import worker_state
+from .core.process_pool import shutdown_process_pool
+from .core.http_client import close_http_client
 
 # Modern FastAPI lifespan context manager (replaces deprecated on_event)
 @asynccontextmanager
@@ -123,6 +125,12 @@ async def lifespan(app: FastAPI):
     # Cleanup worker state
     await worker_state.cleanup()
 
+    # Stop the document parsing processes, if any were started
+    shutdown_process_pool()
+
+    # Close the Anthropic connection pool shared by every orchestrator
+    await close_http_client()
+
     # Cleanup any pending jobs (only if this worker owns them)
     try:
         from .models.schemas import JobStatus
@@ -4,10 +4,14 @@ Coordinates Pass 0-4 with enforcement level control
 """
 
 import os
+import re
+import copy
 import asyncio
 import time
 import hashlib
-import json
+from bisect import bisect_left
+from collections import OrderedDict
+from functools import lru_cache
 from typing import List, Dict, Optional, Tuple, Any, Set
 from datetime import datetime
 import logging
@@ -19,11 +23,15 @@ try:
     from backend.app.core.rule_engine_v2 import RuleEngineV2
     from backend.app.core.strictness_controller import EnforcementLevel, StrictnessController
     from backend.app.core.semantic_cache import SemanticCache
+    from backend.app.core.http_client import get_http_client
+    from backend.app.core.json_utils import extract_json_object, loads, parse_off_loop
 except ModuleNotFoundError:
     # Fall back to relative imports for local development
     from ..core.rule_engine_v2 import RuleEngineV2
     from ..core.strictness_controller import EnforcementLevel, StrictnessController
     from ..core.semantic_cache import SemanticCache
+    from ..core.http_client import get_http_client
+    from ..core.json_utils import extract_json_object, loads, parse_off_loop
 
 # Schema imports
 try:
@@ -65,6 +73,12 @@ from anthropic import AsyncAnthropic
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=256)
+def _banned_token_pattern(token: str) -> re.Pattern:
+    """Case-insensitive literal pattern for a banned token, compiled once"""
+    return re.compile(re.escape(token), re.IGNORECASE)
+
+
 class LLMPipelineOrchestrator:
     """
     Main orchestrator for 4-pass LLM pipeline
@@ -92,7 +106,7 @@ class LLMPipelineOrchestrator:
             raise ValueError("ANTHROPIC_API_KEY must be provided or set in environment")
 
         # API clients
-        self.anthropic_client = AsyncAnthropic(api_key=anthropic_key)
+        self.anthropic_client = AsyncAnthropic(api_key=anthropic_key, http_client=get_http_client())
 
         # Enforcement control - get from env if not provided
         if enforcement_level is None:
@@ -113,6 +127,16 @@ class LLMPipelineOrchestrator:
         if enable_cache:
             self.cache = SemanticCache()
 
+        # Sonnet verdicts for recently validated clauses, least recently used first
+        self._validation_cache: "OrderedDict[Tuple[str, str, str], Tuple]" = OrderedDict()
+        self._validation_cache_size = int(os.getenv("VALIDATION_CACHE_SIZE", "1024"))
+
+        # Model-sourced violations at or above this confidence skip Sonnet
+        # validation unless VALIDATE_ALL=1. Rule hits always carry confidence
+        # 100, so they are never gated: Sonnet is what filters their false positives
+        self.confidence_threshold = float(os.getenv("CONFIDENCE_THRESHOLD", "95"))
+        self.validate_all = os.getenv("VALIDATE_ALL", "0") == "1"
+
         # Prompt management
         self.prompts = self._load_prompts()
 
@@ -121,11 +145,40 @@ class LLMPipelineOrchestrator:
             'passes_executed': [0, 0, 0, 0, 0],
             'items_processed': 0,
             'cache_hits': 0,
+            'validation_cache_hits': 0,
+            'confidence_gated': 0,
             'total_time_ms': 0
         }
 
         logger.info(f"Pipeline initialized with {enforcement_level.value} enforcement level")
 
+    def for_level(self, enforcement_level: EnforcementLevel) -> 'LLMPipelineOrchestrator':
+        """
+        Get a pipeline specialized to another enforcement level
+
+        The strictness controller, level-filtered rule engine and prompts are
+        built once for the level; the API client and cache are shared.
+        """
+        if enforcement_level == self.enforcement_level:
+            return self
+
+        pipeline = copy.copy(self)
+        pipeline.enforcement_level = enforcement_level
+        pipeline.strictness_controller = StrictnessController(enforcement_level)
+        pipeline.rule_engine = RuleEngineV2(enforcement_level=enforcement_level)
+        pipeline.prompts = pipeline._load_prompts()
+        pipeline.stats = {
+            'passes_executed': [0, 0, 0, 0, 0],
+            'items_processed': 0,
+            'cache_hits': 0,
+            'validation_cache_hits': 0,
+            'confidence_gated': 0,
+            'total_time_ms': 0
+        }
+
+        logger.info(f"Pipeline specialized for {enforcement_level.value} enforcement level")
+        return pipeline
+
     def _load_prompts(self) -> Dict:
         """Load prompts for each pass and enforcement level"""
         # This would typically load from a prompts file
@@ -323,10 +376,13 @@ Verify required clauses are present.""",
         # Segment text by clause type
         segments = self._segment_by_clause_type(text)
 
+        # Existing violation spans, sorted once for every segment's coverage check
+        violation_spans = sorted((v.start, v.end, v.severity) for v in existing_violations)
+
         # Process each segment
         for segment in segments:
             # Check if we should skip based on existing coverage
-            if self._should_skip_segment(segment, existing_violations):
+            if self._should_skip_segment(segment, violation_spans):
                 continue
 
             # Call Claude Opus with structured output
@@ -364,10 +420,36 @@ Verify required clauses are present.""",
         removed = 0
         modified = 0
 
-        # Validate each violation
-        for violation in violations:
-            validation = await self._validate_with_sonnet(violation, text)
+        # Clauses validated before reuse their verdict, and a clause flagged
+        # several times in this document is validated once
+        validations = [self._gated_validation(v) or self._cached_validation(v) for v in violations]
+        pending: Dict[Tuple[str, str, str], ViolationSchema] = {}
+        for violation, cached in zip(violations, validations):
+            if cached is None:
+                pending.setdefault(self._validation_cache_key(violation), violation)
+
+        # The rest are validated in batches, one Sonnet call per batch;
+        # batches are independent round-trips, so run them concurrently
+        batch_size = int(os.getenv("SONNET_BATCH_SIZE", "10"))
+        unique = list(pending.values())
+        batches = [unique[i:i + batch_size] for i in range(0, len(unique), batch_size)]
+        semaphore = asyncio.Semaphore(int(os.getenv("SONNET_CONCURRENCY", "8")))
+
+        async def validate(batch: List[ViolationSchema]) -> List[ValidationResult]:
+            async with semaphore:
+                return await self._validate_batch_with_sonnet(batch, text)
+
+        batch_results = await asyncio.gather(*[validate(batch) for batch in batches])
+        fresh = dict(zip(pending, [validation for results in batch_results for validation in results]))
+
+        for index, violation in enumerate(violations):
+            if validations[index] is None:
+                validation = fresh[self._validation_cache_key(violation)]
+                validations[index] = self._validation_result(
+                    violation, validation.verdict, validation.rationale, validation.modified_text
+                )
 
+        for violation, validation in zip(violations, validations):
             if validation.verdict == ValidationVerdict.CONFIRM:
                 # Keep as-is but adjust confidence
                 violation.confidence += validation.confidence_adjustment
@@ -500,9 +582,14 @@ Verify required clauses are present.""",
 
         # Simple paragraph-based segmentation for now
         # In production, would use more sophisticated NLP
-        paragraphs = text.split('\n\n')
+        # Offsets advance with each paragraph and its separator, so repeated
+        # paragraphs keep their own positions without searching the text
+        offset = 0
+
+        for para in text.split('\n\n'):
+            start = offset
+            offset += len(para) + 2
 
-        for para in paragraphs:
             if not para.strip():
                 continue
 
@@ -510,8 +597,8 @@ Verify required clauses are present.""",
             segments.append({
                 'text': para,
                 'clause_type': clause_type,
-                'start': text.find(para),
-                'end': text.find(para) + len(para)
+                'start': start,
+                'end': start + len(para)
             })
 
         return segments
@@ -545,21 +632,31 @@ Verify required clauses are present.""",
 
     def _should_skip_segment(self,
                             segment: Dict,
-                            existing_violations: List[ViolationSchema]) -> bool:
-        """Check if segment can be skipped based on existing coverage"""
+                            violation_spans: List[Tuple[int, int, str]]) -> bool:
+        """
+        Check if segment can be skipped based on existing coverage
 
-        # Count existing violations in this segment
-        segment_violations = [
-            v for v in existing_violations
-            if v.start >= segment['start'] and v.end <= segment['end']
-        ]
+        violation_spans are (start, end, severity) tuples sorted by start;
+        only those starting inside the segment are visited.
+        """
+        segment_start = segment['start']
+        segment_end = segment['end']
+
+        # Severities of existing violations inside this segment
+        segment_severities = []
+        for index in range(bisect_left(violation_spans, (segment_start,)), len(violation_spans)):
+            start, end, severity = violation_spans[index]
+            if start > segment_end:
+                break
+            if end <= segment_end:
+                segment_severities.append(severity)
 
         # Skip if high coverage from rules
-        if len(segment_violations) >= 3:
+        if len(segment_severities) >= 3:
             return True
 
         # Skip if critical issues already found
-        critical_found = any(v.severity == Severity.CRITICAL for v in segment_violations)
+        critical_found = Severity.CRITICAL in segment_severities
         if critical_found and self.enforcement_level == EnforcementLevel.LENIENT:
             return True
 
@@ -603,7 +700,7 @@ Return violations in strict JSON format."""
             )
 
             # Parse response
-            content = json.loads(response.choices[0].message.content)
+            content = await parse_off_loop(loads, response.choices[0].message.content)
 
             # Convert to schema
             return GPT5Response(
@@ -631,10 +728,7 @@ Return violations in strict JSON format."""
 
         prompt = self.prompts['pass2_sonnet']
 
-        # Get context around violation
-        context_start = max(0, violation.start - 200)
-        context_end = min(len(full_text), violation.end + 200)
-        context = full_text[context_start:context_end]
+        context = self._violation_context(violation, full_text)
 
         message = f"""Review this flagged violation:
 
@@ -678,14 +772,7 @@ Provide verdict and detailed rationale."""
             else:
                 verdict = ValidationVerdict.CONFIRM  # Default
 
-            return ValidationResult(
-                violation_id=violation.id,
-                original_violation=violation,
-                verdict=verdict,
-                rationale=content,
-                confidence_adjustment=0.0 if verdict == ValidationVerdict.CONFIRM else -10.0,
-                modified_text=violation.revised_text if verdict == ValidationVerdict.MODIFY else None
-            )
+            return self._remember_validation(self._validation_result(violation, verdict, content))
 
         except Exception as e:
             logger.error(f"Sonnet validation error: {e}")
@@ -698,6 +785,176 @@ Provide verdict and detailed rationale."""
                 confidence_adjustment=0.0
             )
 
+    async def _validate_batch_with_sonnet(self,
+                                          violations: List[ViolationSchema],
+                                          full_text: str) -> List[ValidationResult]:
+        """Validate several violations with one Claude Sonnet call"""
+
+        if len(violations) == 1:
+            return [await self._validate_with_sonnet(violations[0], full_text)]
+
+        prompt = self.prompts['pass2_sonnet']
+
+        # Nearby violations share one context passage instead of repeating it
+        windows, window_of = self._context_windows(violations, full_text)
+        passages = "\n\n".join(
+            f"[P{number}] {window}" for number, window in enumerate(windows, 1)
+        )
+
+        flagged = "\n\n".join(
+            f"""[{number}]
+CONTEXT: see [P{window_of[number - 1] + 1}]
+FLAGGED TEXT: {violation.original_text}
+SUGGESTED REVISION: {violation.revised_text}
+REASON: {violation.explanation}
+SEVERITY: {violation.severity}"""
+            for number, violation in enumerate(violations, 1)
+        )
+
+        message = f"""Document passages:
+
+{passages}
+
+Review these {len(violations)} flagged violations:
+
+{flagged}
+
+For each violation, is it a valid issue? Options:
+- confirm: Yes, this is a real issue
+- modify: Issue exists but needs different fix
+- reject: False positive, not an issue
+
+Respond with ONLY a JSON object of the form
+{{"validations": [{{"verdict": "confirm", "rationale": "...", "modified_text": null}}]}}
+with exactly one entry per violation, in the order given. Set modified_text
+to the better revision when the verdict is modify."""
+
+        try:
+            model = os.getenv("SONNET_MODEL", "claude-sonnet-4-5-20250929")
+            max_tokens = int(os.getenv("SONNET_BATCH_MAX_TOKENS", "4000"))
+
+            response = await self.anthropic_client.messages.create(
+                model=model,
+                messages=[{"role": "user", "content": message}],
+                system=prompt['system'],
+                temperature=prompt['temperature'],
+                max_tokens=max_tokens
+            )
+
+            content = response.content[0].text
+            items = (await parse_off_loop(extract_json_object, content) or {})['validations']
+
+            if len(items) != len(violations):
+                raise ValueError(f"expected {len(violations)} validations, got {len(items)}")
+
+            results = [
+                self._validation_result(
+                    violation,
+                    ValidationVerdict(str(item.get('verdict', 'confirm')).lower()),
+                    str(item.get('rationale') or 'No rationale given'),
+                    item.get('modified_text')
+                )
+                for violation, item in zip(violations, items)
+            ]
+            return [self._remember_validation(result) for result in results]
+
+        except Exception as e:
+            # Fall back to one call per violation
+            logger.warning(f"Batched Sonnet validation failed, validating individually: {e}")
+            return [await self._validate_with_sonnet(v, full_text) for v in violations]
+
+    @staticmethod
+    def _violation_context(violation: ViolationSchema, full_text: str) -> str:
+        """Document text around a violation"""
+        context_start = max(0, violation.start - 200)
+        context_end = min(len(full_text), violation.end + 200)
+        return full_text[context_start:context_end]
+
+    @staticmethod
+    def _context_windows(violations: List[ViolationSchema],
+                         full_text: str) -> Tuple[List[str], List[int]]:
+        """
+        Merged context passages for a batch of violations
+
+        Each violation's window is the one _violation_context would give;
+        overlapping windows are merged into one passage.
+
+        Returns:
+            The passages in document order, and the passage index of each violation
+        """
+        spans = sorted(
+            (max(0, v.start - 200), min(len(full_text), v.end + 200), index)
+            for index, v in enumerate(violations)
+        )
+        merged: List[List[int]] = []
+        window_of = [0] * len(violations)
+
+        for start, end, index in spans:
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+            window_of[index] = len(merged) - 1
+
+        return [full_text[start:end] for start, end in merged], window_of
+
+    @staticmethod
+    def _validation_result(violation: ViolationSchema,
+                           verdict: ValidationVerdict,
+                           rationale: str,
+                           modified_text: Optional[str] = None) -> ValidationResult:
+        """Build the validation result for a Sonnet verdict"""
+        return ValidationResult(
+            violation_id=violation.id,
+            original_violation=violation,
+            verdict=verdict,
+            rationale=rationale,
+            confidence_adjustment=0.0 if verdict == ValidationVerdict.CONFIRM else -10.0,
+            modified_text=(modified_text or violation.revised_text)
+            if verdict == ValidationVerdict.MODIFY else None
+        )
+
+    def _validation_cache_key(self, violation: ViolationSchema) -> Tuple[str, str, str]:
+        """Key a violation by enforcement level, clause type and normalized text"""
+        return (
+            self.enforcement_level.value,
+            violation.clause_type,
+            ' '.join(violation.original_text.lower().split())
+        )
+
+    def _gated_validation(self, violation: ViolationSchema) -> Optional[ValidationResult]:
+        """Accept a high-confidence model violation without asking Sonnet"""
+        if (self.validate_all or violation.source == ViolationSource.RULE
+                or violation.confidence < self.confidence_threshold):
+            return None
+
+        self.stats['confidence_gated'] += 1
+        return self._validation_result(
+            violation, ValidationVerdict.CONFIRM, "Accepted by confidence gate"
+        )
+
+    def _cached_validation(self, violation: ViolationSchema) -> Optional[ValidationResult]:
+        """Reuse the verdict of an identical clause validated earlier"""
+        key = self._validation_cache_key(violation)
+        cached = self._validation_cache.get(key)
+        if cached is None:
+            return None
+
+        self._validation_cache.move_to_end(key)
+        self.stats['validation_cache_hits'] += 1
+        return self._validation_result(violation, *cached)
+
+    def _remember_validation(self, validation: ValidationResult) -> ValidationResult:
+        """Cache a Sonnet verdict for the violation's clause"""
+        key = self._validation_cache_key(validation.original_violation)
+        self._validation_cache[key] = (
+            validation.verdict, validation.rationale, validation.modified_text
+        )
+        self._validation_cache.move_to_end(key)
+        if len(self._validation_cache) > self._validation_cache_size:
+            self._validation_cache.popitem(last=False)
+        return validation
+
     def _identify_adjudication_candidates(self,
                                          violations: List[ViolationSchema]) -> List[ViolationSchema]:
         """Identify violations needing Opus adjudication"""
@@ -826,9 +1083,7 @@ Provide definitive ruling for each violation with detailed legal reasoning."""
         for token in banned_tokens:
             if token.lower() in text_lower:
                 # Find all occurrences
-                import re
-                pattern = re.compile(re.escape(token), re.IGNORECASE)
-                for match in pattern.finditer(text):
+                for match in _banned_token_pattern(token).finditer(text):
                     banned_found.append({
                         'token': token,
                         'location': match.start(),
@@ -0,0 +1,98 @@
+"""
+Unit tests for BatchProcessor
+Runs a batch end to end with a mocked orchestrator
+"""
+import pytest
+from unittest.mock import AsyncMock, Mock
+from docx import Document
+
+SHARED_CLAUSE = "The Receiving Party shall keep the information confidential for five (5) years."
+
+
+def _write_docx(path, paragraphs):
+    doc = Document()
+    for text in paragraphs:
+        doc.add_paragraph(text)
+    doc.save(str(path))
+    return str(path)
+
+
+def _locate(redlines, clause_text):
+    """Stand-in for _convert_claude_to_document_format: position each redline in the clause"""
+    located = []
+    for redline in redlines:
+        start = clause_text.find(redline['original_text'])
+        if start != -1:
+            located.append({**redline, 'start': start, 'end': start + len(redline['original_text'])})
+    return located
+
+
+@pytest.fixture
+def orchestrator():
+    """Orchestrator mock that redlines the five-year term"""
+    async def analyze_with_opus(clause_text, clause_hash, rule_redlines):
+        if 'five (5) years' in clause_text:
+            return {'redlines': [{'original_text': 'five (5) years', 'revised_text': 'two (2) years'}]}
+        return {'redlines': []}
+
+    orchestrator = Mock()
+    orchestrator._analyze_with_opus = AsyncMock(side_effect=analyze_with_opus)
+    orchestrator._convert_claude_to_document_format = Mock(side_effect=_locate)
+    return orchestrator
+
+
+@pytest.fixture
+def processor(orchestrator, tmp_path):
+    """BatchProcessor with the mocked orchestrator and a private semantic cache"""
+    from backend.app.api.batch import BatchProcessor
+    from backend.app.core.process_pool import shutdown_process_pool
+    from backend.app.core.semantic_cache import SemanticCache
+
+    processor = BatchProcessor(orchestrator=orchestrator)
+    processor.semantic_cache = SemanticCache(cache_dir=str(tmp_path / "cache"))
+    processor.rule_engine = Mock(apply_rules=Mock(return_value=[]))
+    yield processor
+    shutdown_process_pool()
+
+
+@pytest.mark.unit
+class TestBatchProcessor:
+    """Test suite for BatchProcessor.process_batch"""
+
+    async def test_process_batch_runs_every_phase(self, processor, orchestrator, tmp_path):
+        """Clauses are split, deduplicated, analyzed once and placed in each document"""
+        from backend.app.core.docx_text import build_working_text
+
+        file_paths = [
+            _write_docx(tmp_path / "first.docx", [
+                "Mutual Non-Disclosure Agreement",
+                SHARED_CLAUSE,
+                "This Agreement is governed by the laws of the State of Delaware.",
+            ]),
+            _write_docx(tmp_path / "second.docx", [
+                SHARED_CLAUSE,
+                "Neither party shall solicit the employees of the other party.",
+            ]),
+        ]
+        updates = []
+
+        async def callback(update):
+            updates.append(update)
+
+        result = await processor.process_batch("batch-1", file_paths, callback=callback)
+
+        assert result['status'] == 'completed'
+        assert result['documents_processed'] == 2
+        assert result['total_clauses'] == 5
+        assert result['unique_clauses'] == 4
+        assert orchestrator._analyze_with_opus.await_count == 4
+
+        for file_path, doc_result in zip(file_paths, result['results']):
+            working_text = build_working_text(file_path)
+            assert doc_result['total_redlines'] == 1
+            redline = doc_result['redlines'][0]
+            assert working_text[redline['start']:redline['end']] == 'five (5) years'
+
+        statuses = [update['status'] for update in updates]
+        assert statuses.count('document_complete') == 2
+        assert statuses[-1] == 'completed'
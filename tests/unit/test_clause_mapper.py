@@ -0,0 +1,71 @@
+"""
+Unit tests for ClauseMapper
+Tests chunking, section boundaries and batch clause mapping
+"""
+import pytest
+
+
+SAMPLE_NDA = (
+    "1. Confidentiality: The Receiving Party shall keep all information "
+    "confidential for two years.\n\n"
+    "2. Governing Law: This Agreement is governed by the laws of New York.\n\n"
+    "3. Term: This Agreement remains in effect for two years."
+)
+
+
+@pytest.mark.unit
+@pytest.mark.fast
+class TestClauseMapper:
+    """Test suite for ClauseMapper"""
+
+    def test_section_end_stops_at_next_header(self):
+        """Section end is the start of the next header after the position"""
+        from backend.app.core.clause_mapper import ClauseMapper
+
+        mapper = ClauseMapper()
+        start = SAMPLE_NDA.index("Governing Law")
+
+        end = mapper._find_section_end(SAMPLE_NDA, start)
+
+        assert end == SAMPLE_NDA.index("\n\n3. Term")
+
+    def test_section_end_without_header_uses_paragraph_break(self):
+        """Without a following header, the section ends at the next blank line"""
+        from backend.app.core.clause_mapper import ClauseMapper
+
+        mapper = ClauseMapper()
+        document = "Preamble text here.\n\nmore text without a header"
+
+        assert mapper._find_section_end(document, 0) == document.index("\n\n")
+
+    def test_chunk_spans_cover_chunk_text(self):
+        """Each chunk span addresses the chunk text in the document"""
+        from backend.app.core.clause_mapper import ClauseMapper
+
+        mapper = ClauseMapper()
+        chunks, spans = mapper._split_into_chunks(SAMPLE_NDA, chunk_size=60)
+
+        assert len(chunks) == len(spans)
+        for chunk, (start, end) in zip(chunks, spans):
+            assert SAMPLE_NDA[start:end].split() == chunk.split()
+
+        # Cached for the same document and chunk size
+        assert mapper._split_into_chunks(SAMPLE_NDA, chunk_size=60) == (chunks, spans)
+
+    def test_convert_maps_duplicate_clauses_once(self):
+        """Repeated clauses are mapped once and converted per redline"""
+        from backend.app.core.clause_mapper import ClauseMapper
+
+        mapper = ClauseMapper()
+        redlines = [
+            {'clause': 'governing law: this agreement', 'recommendation': 'Delaware'},
+            {'clause': 'governing law: this agreement ', 'recommendation': 'Delaware law'},
+        ]
+
+        converted, stats = mapper.convert_redlines_with_mapping(redlines, SAMPLE_NDA)
+
+        assert stats['converted'] == 2
+        assert [r['start'] for r in converted] == [SAMPLE_NDA.index("Governing Law")] * 2
+        assert converted[0]['confidence'] == 95.0
+        assert mapper.get_stats()['total_attempts'] == 1
+        assert mapper.get_stats()['average_confidence'] == 95.0
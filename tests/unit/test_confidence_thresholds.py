@@ -0,0 +1,79 @@
+"""
+Unit tests for redline confidence scoring
+Tests that the batch scorer matches the scalar one
+"""
+import pytest
+
+
+# (rule_id, clause_type, text_context, pattern_match_quality, expected confidence, level, action)
+CASES = [
+    # 98 * 1.05 + 8 context + 3 frequency, clamped to 100
+    ("term_limit_specific_years_to_18mo", "confidentiality_term",
+     "This Mutual Non-Disclosure Agreement shall survive termination.", 1.0, 100.0, "high", "auto_apply"),
+    # 85 * 0.97 + 3 context
+    ("allow_assignment", "assignment", "Governing Law: Delaware", 1.0, 85.45, "medium", "suggest_review"),
+    # 80 * 0.95 * 0.9 - 8 context
+    ("remove_affiliate_references", "affiliate_clause",
+     "Except as provided herein and notwithstanding the foregoing", 0.9, 60.4, "low", "require_validation"),
+    # Unknown rule and clause type: default 75, no modifier or boost
+    ("custom_rule", "miscellaneous", "", 1.0, 75.0, "low", "require_validation"),
+    # 92 * 0.5 + context capped at +10 + 2 frequency
+    ("retention_carveout", "document_retention",
+     "Edgewater confidentiality agreement", 0.5, 58.0, "low", "require_validation"),
+    # 75 + context capped at -10
+    ("default", "jurisdiction",
+     "except as noted, unless otherwise agreed, this may be modified, notwithstanding", 1.0, 65.0,
+     "low", "require_validation"),
+]
+
+
+@pytest.mark.unit
+@pytest.mark.fast
+class TestRedlineConfidence:
+    """Test suite for calculate_redline_confidence and its batch form"""
+
+    def test_scalar_matches_expected_values(self):
+        """Each case scores, bands and routes as computed by hand"""
+        from backend.app.config.confidence_thresholds import calculate_redline_confidence
+
+        for rule_id, clause_type, context, quality, expected, level, action in CASES:
+            confidence, confidence_level, processing_action = calculate_redline_confidence(
+                rule_id, clause_type, context, quality
+            )
+
+            assert confidence == pytest.approx(expected)
+            assert (confidence_level.value, processing_action.value) == (level, action)
+
+    @pytest.mark.parametrize("use_numpy", [True, False])
+    def test_batch_matches_scalar(self, monkeypatch, use_numpy):
+        """The batch scorer returns exactly the scalar results, with and without NumPy"""
+        from backend.app.config import confidence_thresholds
+
+        if use_numpy and confidence_thresholds.np is None:
+            pytest.skip("NumPy not installed")
+        if not use_numpy:
+            monkeypatch.setattr(confidence_thresholds, 'np', None)
+
+        rule_ids, clause_types, contexts, qualities = zip(*(case[:4] for case in CASES))
+        expected = [
+            confidence_thresholds.calculate_redline_confidence(*case[:4])
+            for case in CASES
+        ]
+
+        batch = confidence_thresholds.calculate_redline_confidence_batch(
+            list(rule_ids), list(clause_types), list(contexts), list(qualities)
+        )
+
+        assert batch == expected
+
+    def test_batch_defaults_and_empty_input(self):
+        """Qualities default to 1.0 and an empty batch scores nothing"""
+        from backend.app.config.confidence_thresholds import (
+            calculate_redline_confidence,
+            calculate_redline_confidence_batch,
+        )
+
+        batch = calculate_redline_confidence_batch(["allow_assignment"], ["assignment"], ["Governing Law"])
+
+        assert batch == [calculate_redline_confidence("allow_assignment", "assignment", "Governing Law")]
+        assert calculate_redline_confidence_batch([], [], []) == []
@@ -0,0 +1,203 @@
+"""
+Unit tests for ContextualAnalyzer
+Tests extraction of existing NDA terms
+"""
+import pytest
+
+
+SAMPLE_NDA = (
+    "MUTUAL NON-DISCLOSURE AGREEMENT\n\n"
+    "1. Term. The obligations herein shall expire 2 years from the Effective Date.\n\n"
+    "2. Return of Materials. Upon request, each party shall return or destroy all "
+    "Confidential Information, provided that the Recipient may retain archival copies "
+    "as required by law.\n\n"
+    "3. Non-Solicitation. For a period of 12 months, neither party shall solicit "
+    "employees of the other, except through general advertising or where the "
+    "employee initiates contact.\n\n"
+    "4. Governing Law. This Agreement shall be governed by the laws of the State of "
+    "Delaware."
+)
+
+
+@pytest.mark.unit
+@pytest.mark.fast
+class TestContextualAnalyzer:
+    """Test suite for ContextualAnalyzer"""
+
+    def test_analyze_existing_terms(self):
+        """Key terms are extracted from a typical NDA"""
+        from backend.app.core.context_analyzer import ContextualAnalyzer, DocumentType
+
+        context = ContextualAnalyzer().analyze_existing_terms(SAMPLE_NDA)
+
+        assert context['term_length_months'] == 24
+        assert context['term_is_reasonable'] is True
+        assert context['governing_law'] == 'Delaware'
+        assert context['jurisdiction_is_reasonable'] is True
+        assert context['has_retention_carveout'] is True
+        assert context['has_return_provision'] is True
+        assert context['non_solicit_exceptions'] == 2
+        assert context['non_solicit_duration_months'] == 12
+        assert context['document_type'] == DocumentType.MUTUAL
+
+    def test_term_length_precedence(self):
+        """Years win over months, and perpetual is only used as a fallback"""
+        from backend.app.core.context_analyzer import ContextualAnalyzer
+
+        analyzer = ContextualAnalyzer()
+
+        assert analyzer._extract_term_length("term of 18 months; a 3-year term") == 36
+        assert analyzer._extract_term_length("expire 6 months after disclosure") == 6
+        assert analyzer._extract_term_length("obligations are perpetual") == 999
+        assert analyzer._extract_term_length("no duration stated") is None
+
+    def test_governing_law_normalization(self):
+        """Jurisdiction abbreviations are normalized"""
+        from backend.app.core.context_analyzer import ContextualAnalyzer
+
+        analyzer = ContextualAnalyzer()
+
+        assert analyzer._extract_governing_law("governed by the laws of NY") == 'New York'
+        assert analyzer._extract_governing_law("the laws of Texas shall govern") == 'Texas'
+        assert analyzer._extract_governing_law("no choice of law") is None
+
+    def test_geographic_scope(self):
+        """Named regions are preferred over the worldwide fallback"""
+        from backend.app.core.context_analyzer import ContextualAnalyzer
+
+        analyzer = ContextualAnalyzer()
+
+        assert analyzer._extract_geographic_scope("within the territory where it operates") == 'territory'
+        assert analyzer._extract_geographic_scope("applies worldwide") == 'Worldwide'
+        assert analyzer._extract_geographic_scope("no scope") is None
+
+    def test_non_solicit_exceptions_counted_once_each(self):
+        """Every exception type is counted, even when matches overlap"""
+        from backend.app.core.context_analyzer import ContextualAnalyzer
+
+        analyzer = ContextualAnalyzer()
+        text = "former employee who initiated prior discussions; general advertising"
+
+        assert analyzer._count_non_solicit_exceptions(text) == 4
+        assert analyzer._count_non_solicit_exceptions("no exceptions") == 0
+
+    def test_non_ascii_text_matches_case_insensitively(self):
+        """Documents that cannot be lowercased in place are scanned as written"""
+        from backend.app.core.context_analyzer import ContextualAnalyzer
+
+        analyzer = ContextualAnalyzer()
+        text = "Société Générale. GOVERNED BY THE LAWS OF THE STATE OF DELAWARE. 3 YEARS FROM signing."
+
+        context = analyzer.analyze_existing_terms(text)
+
+        assert context['governing_law'] == 'Delaware'
+        assert context['term_length_months'] == 36
+        assert analyzer.analyze_existing_terms(text.encode('ascii', 'ignore').decode()) == context
+
+    def test_scan_skips_patterns_without_required_keywords(self):
+        """Patterns run only when the document contains their literals"""
+        from backend.app.core.context_analyzer import _GEO_PATTERNS, _Scan
+
+        scan = _Scan("Restricted within the Territory.")
+        assert scan.search(_GEO_PATTERNS[0]) is None
+        assert scan.contains('where') is False
+
+        scan = _Scan("Restricted within the Territory where it operates.")
+        assert scan.search(_GEO_PATTERNS[0]).group(1) == 'territory'
+
+        # Non-ASCII text is scanned as written, without keyword pre-filtering
+        assert _Scan("Société").contains('where') is True
+
+    def test_document_type_from_opening(self):
+        """NDA type and is_mutual come from the first 1000 characters"""
+        from backend.app.core.context_analyzer import ContextualAnalyzer, DocumentType
+
+        analyzer = ContextualAnalyzer()
+
+        multi = analyzer.analyze_existing_terms("Agreement among three companies.")
+        one_way = analyzer.analyze_existing_terms("x" * 1000 + " mutual obligations")
+
+        assert multi['document_type'] == DocumentType.MULTI_PARTY
+        assert multi['is_mutual'] is False
+        assert one_way['document_type'] == DocumentType.ONE_WAY
+        assert one_way['is_mutual'] is False
+
+    def test_should_apply_rule(self):
+        """Rules are skipped only when the existing term is already acceptable"""
+        from backend.app.core.context_analyzer import ContextualAnalyzer
+
+        analyzer = ContextualAnalyzer()
+        context = {
+            'term_is_reasonable': True,
+            'jurisdiction_is_reasonable': False,
+            'non_solicit_is_reasonable': True,
+            'non_solicit_exceptions': 1,
+            'has_return_provision': True,
+        }
+
+        assert analyzer.should_apply_rule({'type': 'confidentiality_term'}, context) is False
+        assert analyzer.should_apply_rule({'clause_type': 'governing_law'}, context) is True
+        assert analyzer.should_apply_rule({'type': 'employee_solicitation'}, context) is True
+        assert analyzer.should_apply_rule(
+            {'type': 'employee_solicitation'}, {**context, 'non_solicit_exceptions': 2}
+        ) is False
+        assert analyzer.should_apply_rule({'type': 'return_destruction'}, context) is False
+        assert analyzer.should_apply_rule({'type': 'retention_exception'}, context) is True
+        assert analyzer.should_apply_rule({'type': 'unknown'}, context) is True
+        assert analyzer.should_apply_rule({}, context) is True
+
+    def test_analysis_cache(self):
+        """Repeat analyses are served from the cache as independent copies"""
+        from backend.app.core.context_analyzer import ContextualAnalyzer
+
+        analyzer = ContextualAnalyzer()
+        analyzer.ANALYSIS_CACHE_SIZE = 2
+
+        first = analyzer.analyze_existing_terms(SAMPLE_NDA)
+        first['governing_law'] = 'Mutated'
+        second = analyzer.analyze_existing_terms(SAMPLE_NDA)
+
+        assert second['governing_law'] == 'Delaware'
+        assert second is not first
+
+        analyzer.analyze_existing_terms("one")
+        analyzer.analyze_existing_terms("two")
+
+        assert list(analyzer._analysis_cache) == ["one", "two"]
+
+    def test_non_solicit_section_stays_within_sentence(self):
+        """An employee mention only starts a non-solicit section in the same sentence"""
+        from backend.app.core.context_analyzer import ContextualAnalyzer
+
+        analyzer = ContextualAnalyzer()
+
+        assert analyzer._extract_non_solicit_duration(
+            "No employee solicitation for 6 months."
+        ) == 6
+        assert analyzer._extract_non_solicit_duration(
+            "Employees are bound for 3 years.\nNon-solicitation applies for 9 months."
+        ) == 9
+        # Many employee mentions without a following solicitation stay linear
+        assert analyzer._extract_non_solicit_duration(
+            "solicitation. " + "employee " * 20000
+        ) is None
+
+    def test_scan_lower_prefix(self):
+        """The lowercased opening is taken from the shared scan in either form"""
+        from backend.app.core.context_analyzer import _Scan
+
+        assert _Scan("MUTUAL Agreement").lower_prefix(6) == "mutual"
+        assert _Scan("MUTUAL Société").lower_prefix(100) == "mutual société"
+
+    def test_lower_form_matches_re(self):
+        """Lower forms (re2 when installed) find the same spans as re"""
+        import re
+        from backend.app.core.context_analyzer import _RETENTION_PATTERNS, _Scan
+
+        text = "Copies aside, the Recipient may retain one archival copy."
+        scan = _Scan(text)
+
+        for pattern in _RETENTION_PATTERNS:
+            expected = re.search(pattern.raw.pattern, text.lower())
+            match = scan.search(pattern)
+            assert (match and match.span()) == (expected and expected.span())
@@ -0,0 +1,197 @@
+"""
+Unit tests for the track changes engine
+Tests revision markup and redline validation
+"""
+import pytest
+
+
+WORKING_TEXT = "The Receiving Party shall keep all information confidential for five years."
+
+
+@pytest.mark.unit
+@pytest.mark.fast
+class TestTrackChangesEngine:
+    """Test suite for TrackChangesEngine"""
+
+    def test_child_index(self):
+        """Runs are located by position; runs of other paragraphs are not found"""
+        from docx import Document
+        from backend.app.core.docx_engine import TrackChangesEngine
+
+        doc = Document()
+        paragraph = doc.add_paragraph("first ")
+        second = paragraph.add_run("second")
+        other = doc.add_paragraph("other").runs[0]
+
+        assert TrackChangesEngine._child_index(paragraph._element, second._element) == 1
+        assert TrackChangesEngine._child_index(paragraph._element, other._element) is None
+
+    def test_apply_replacement_wraps_runs(self):
+        """Replacement puts the old run in w:del and the new text in a following w:ins"""
+        from docx import Document
+        from docx.oxml.ns import qn
+        from backend.app.core.docx_engine import TrackChangesEngine
+
+        doc = Document()
+        paragraph = doc.add_paragraph("keep ")
+        run = paragraph.add_run("five years")
+        engine = TrackChangesEngine(author="Reviewer")
+
+        assert engine.apply_replacement(paragraph, run, "five years", "two years") is True
+
+        del_elem, ins_elem = list(paragraph._element)[1:]
+        assert del_elem.tag == qn('w:del')
+        assert ins_elem.tag == qn('w:ins')
+        assert del_elem.get(qn('w:id')) == '1'
+        assert ins_elem.get(qn('w:id')) == '2'
+        assert ins_elem.get(qn('w:author')) == "Reviewer"
+        assert del_elem[0] is run._element
+        assert ins_elem.findtext(f"{qn('w:r')}/{qn('w:t')}") == "two years"
+        assert engine.revision_id == 3
+
+    def test_apply_deletion_and_insertion(self):
+        """Deletion wraps the run in place; insertion lands after the position run"""
+        from docx import Document
+        from docx.oxml.ns import qn
+        from backend.app.core.docx_engine import TrackChangesEngine
+
+        doc = Document()
+        paragraph = doc.add_paragraph("first ")
+        second = paragraph.add_run("second")
+        engine = TrackChangesEngine()
+
+        assert engine.apply_deletion(paragraph, second, "second") is True
+        assert engine.apply_insertion(paragraph, paragraph.runs[0], "inserted ") is True
+
+        tags = [child.tag for child in paragraph._element]
+        assert tags == [qn('w:r'), qn('w:ins'), qn('w:del')]
+
+    def test_revision_ids_are_unique(self):
+        """Each w:del/w:ins gets the next revision id and the engine's author and date"""
+        from docx import Document
+        from docx.oxml.ns import qn
+        from backend.app.core.docx_engine import TrackChangesEngine
+
+        doc = Document()
+        paragraph = doc.add_paragraph("a ")
+        b = paragraph.add_run("b ")
+        c = paragraph.add_run("c")
+        engine = TrackChangesEngine(author="Reviewer")
+
+        engine.apply_deletion(paragraph, c, "c")
+        engine.apply_replacement(paragraph, b, "b ", "B ")
+        engine.apply_insertion(paragraph, None, " d")
+
+        revisions = [el for el in paragraph._element if el.tag in (qn('w:del'), qn('w:ins'))]
+        assert [el.get(qn('w:id')) for el in revisions] == ['2', '3', '1', '4']
+        assert {el.get(qn('w:author')) for el in revisions} == {"Reviewer"}
+        assert {el.get(qn('w:date')) for el in revisions} == {engine.timestamp}
+
+    def test_inserted_text_is_escaped_on_save(self):
+        """Markup characters in inserted text survive a save and reload"""
+        import io
+        from docx import Document
+        from docx.oxml.ns import qn
+        from backend.app.core.docx_engine import TrackChangesEngine
+
+        doc = Document()
+        paragraph = doc.add_paragraph("Price ")
+        new_text = ' <b>"A" & \'B\'</b> '
+
+        assert TrackChangesEngine().apply_insertion(paragraph, paragraph.runs[0], new_text) is True
+
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        reloaded = Document(io.BytesIO(buffer.getvalue())).paragraphs[0]
+        assert reloaded._element.findtext(f"{qn('w:ins')}/{qn('w:r')}/{qn('w:t')}") == new_text
+
+    def test_enable_track_changes_once(self):
+        """trackRevisions is added to the settings part only once"""
+        from docx import Document
+        from docx.oxml.ns import qn
+        from backend.app.core.docx_engine import TrackChangesEngine
+
+        doc = Document()
+        engine = TrackChangesEngine()
+        engine.enable_track_changes(doc)
+        engine.enable_track_changes(doc)
+
+        assert len(doc.settings.element.findall(qn('w:trackRevisions'))) == 1
+
+    def test_apply_all_redlines_per_paragraph(self):
+        """Several redlines in one paragraph each reach their own run"""
+        from docx import Document
+        from docx.oxml.ns import qn
+        from backend.app.core.docx_engine import TrackChangesEngine
+        from backend.app.core.text_indexer import WorkingTextIndexer
+
+        doc = Document()
+        paragraph = doc.add_paragraph("Term: ")
+        paragraph.add_run("five years").bold = True
+        paragraph.add_run(" under ")
+        paragraph.add_run("New York").italic = True
+        paragraph.add_run(" law.")
+        doc.add_paragraph("Second ").add_run("paragraph").bold = True
+
+        indexer = WorkingTextIndexer()
+        indexer.build_index(doc)
+        text = indexer.working_text
+
+        def span(phrase, revised):
+            start = text.index(phrase)
+            return {'start': start, 'end': start + len(phrase),
+                    'original_text': phrase, 'revised_text': revised}
+
+        redlines = [span("five years", "two years"), span("New York", "Delaware"), span("paragraph", "")]
+
+        applied = TrackChangesEngine().apply_all_redlines(doc, indexer, redlines)
+
+        assert applied == 3
+        first, second = doc.paragraphs
+        deleted = [el.findtext(f"{qn('w:r')}/{qn('w:t')}") for el in first._element.iter(qn('w:del'))]
+        inserted = [el.findtext(f"{qn('w:r')}/{qn('w:t')}") for el in first._element.iter(qn('w:ins'))]
+        assert deleted == ["five years", "New York"]
+        assert inserted == ["two years", "Delaware"]
+        assert second._element.findtext(f"{qn('w:del')}/{qn('w:r')}/{qn('w:t')}") == "paragraph"
+
+
+@pytest.mark.unit
+@pytest.mark.fast
+class TestRedlineValidator:
+    """Test suite for RedlineValidator"""
+
+    def test_exact_match_is_valid(self):
+        """Original text matching the span, verbatim or ignoring case and padding, is valid"""
+        from backend.app.core.docx_engine import RedlineValidator
+
+        start = WORKING_TEXT.index("five years")
+        redline = {'start': start, 'end': start + 10, 'original_text': ' FIVE YEARS '}
+        verbatim = {'start': start, 'end': start + 10, 'original_text': 'five years'}
+
+        assert RedlineValidator.validate_redline(redline, WORKING_TEXT) is True
+        assert RedlineValidator.validate_redline(verbatim, WORKING_TEXT) is True
+
+    def test_fuzzy_match_threshold(self):
+        """Near matches pass; unrelated text at the span is rejected"""
+        from backend.app.core.docx_engine import RedlineValidator
+
+        start = WORKING_TEXT.index("information confidential")
+        end = start + len("information confidential")
+
+        near = {'start': start, 'end': end, 'original_text': "information confidental"}
+        wrong = {'start': start, 'end': end, 'original_text': "governing law of Delaware"}
+
+        assert RedlineValidator.validate_redline(near, WORKING_TEXT) is True
+        assert RedlineValidator.validate_redline(wrong, WORKING_TEXT) is False
+
+    def test_invalid_ranges_rejected(self):
+        """Missing fields, out-of-bounds and empty ranges are invalid"""
+        from backend.app.core.docx_engine import RedlineValidator
+
+        assert RedlineValidator.validate_redline({'start': 0, 'end': 3}, WORKING_TEXT) is False
+        assert RedlineValidator.validate_redline(
+            {'start': 0, 'end': len(WORKING_TEXT) + 1, 'original_text': WORKING_TEXT}, WORKING_TEXT
+        ) is False
+        assert RedlineValidator.validate_redline(
+            {'start': 5, 'end': 5, 'original_text': ''}, WORKING_TEXT
+        ) is False
@@ -0,0 +1,119 @@
+"""
+Unit tests for streaming DOCX text extraction
+Output must match python-docx paragraph text
+"""
+import pytest
+from docx import Document
+from docx.enum.text import WD_BREAK
+
+
+@pytest.fixture
+def sample_docx(tmp_path):
+    """DOCX with plain, multi-run, break, empty and table paragraphs"""
+    doc = Document()
+    doc.add_paragraph("Confidential Information shall be protected.")
+
+    paragraph = doc.add_paragraph("The term is ")
+    paragraph.add_run("two (2) years").bold = True
+    paragraph.add_run("\tfrom the Effective Date.")
+
+    paragraph = doc.add_paragraph("Line one")
+    paragraph.add_run().add_break()
+    paragraph.add_run("Line two")
+    paragraph.add_run().add_break(WD_BREAK.PAGE)
+
+    doc.add_paragraph("")
+
+    table = doc.add_table(rows=1, cols=2)
+    table.cell(0, 0).text = "Governing Law"
+    table.cell(0, 1).text = "Delaware"
+
+    path = tmp_path / "sample.docx"
+    doc.save(str(path))
+    return path
+
+
+@pytest.mark.unit
+@pytest.mark.fast
+class TestDocxText:
+    """Test suite for docx_text"""
+
+    def test_body_paragraphs_match_python_docx(self, sample_docx):
+        """Body paragraph text matches Paragraph.text in order"""
+        from backend.app.core.docx_text import iter_paragraph_texts
+
+        expected = [p.text for p in Document(str(sample_docx)).paragraphs]
+        actual = [
+            text for location, text in iter_paragraph_texts(str(sample_docx))
+            if location == 'body'
+        ]
+
+        assert actual == expected
+        assert actual[2] == "Line one\nLine two"
+
+    def test_table_paragraphs_reported_separately(self, sample_docx):
+        """Body-level table cell paragraphs are yielded with location 'table'"""
+        from backend.app.core.docx_text import iter_paragraph_texts
+
+        with open(sample_docx, 'rb') as f:
+            table_texts = [
+                text for location, text in iter_paragraph_texts(f)
+                if location == 'table'
+            ]
+
+        assert table_texts == ["Governing Law", "Delaware"]
+
+
+@pytest.fixture
+def layout_docx(tmp_path):
+    """DOCX with multi-run paragraphs, merged table cells, headers, footers and two sections"""
+    doc = Document()
+    doc.sections[0].header.paragraphs[0].text = "CONFIDENTIAL  DRAFT"
+    doc.sections[0].footer.paragraphs[0].text = "Page footer"
+
+    paragraph = doc.add_paragraph("The term is ")
+    paragraph.add_run(" two (2)  years").bold = True
+    paragraph.add_run("  from the Effective Date.").bold = True
+    paragraph.add_run("\u200b")
+
+    paragraph = doc.add_paragraph()
+    paragraph.add_run("Governing ").italic = True
+    paragraph.add_run(" law").italic = False
+
+    table = doc.add_table(rows=3, cols=3)
+    table.cell(0, 0).merge(table.cell(0, 1)).text = "Parties"
+    table.cell(0, 2).text = "Term"
+    table.cell(1, 0).merge(table.cell(2, 0)).text = "Recipient  "
+    table.cell(1, 1).text = "Acme"
+    table.cell(2, 2).text = "Two years"
+
+    doc.add_section()
+    doc.add_paragraph("Second section text.")
+
+    path = tmp_path / "layout.docx"
+    doc.save(str(path))
+    return path
+
+
+@pytest.mark.unit
+@pytest.mark.fast
+class TestBuildWorkingText:
+    """Test suite for build_working_text"""
+
+    def test_matches_working_text_indexer(self, layout_docx):
+        """Working text is identical to WorkingTextIndexer.build_index"""
+        from backend.app.core.docx_text import build_working_text
+        from backend.app.core.text_indexer import WorkingTextIndexer
+
+        indexer = WorkingTextIndexer()
+        indexer.build_index(Document(str(layout_docx)))
+
+        working_text = build_working_text(str(layout_docx))
+
+        assert working_text == indexer.working_text
+        # Runs are normalized one at a time, merged cells repeat per grid cell,
+        # and the second section inherits the first section's header
+        assert "The term is  two (2) years from the Effective Date.\n" in working_text
+        assert working_text.count("Parties\n") == 2
+        assert working_text.count("Recipient \n") == 2
+        assert working_text.count("CONFIDENTIAL DRAFT\n") == 2
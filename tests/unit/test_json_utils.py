@@ -0,0 +1,86 @@
+"""
+Unit tests for JSON extraction
+Tests locating JSON objects inside model responses
+"""
+import pytest
+
+
+@pytest.mark.unit
+@pytest.mark.fast
+class TestExtractJsonObject:
+    """Test suite for extract_json_object"""
+
+    def test_bare_fenced_and_prose_wrapped(self):
+        """The first object is found whatever surrounds it"""
+        from backend.app.core.json_utils import extract_json_object
+
+        assert extract_json_object('{"redlines": []}') == {'redlines': []}
+        assert extract_json_object('```json\n{"a": {"b": 1}}\n```') == {'a': {'b': 1}}
+        assert extract_json_object('Here you go: {"a": "}"} and {"b": 2}') == {'a': '}'}
+
+    def test_skips_braces_that_are_not_json(self):
+        """Candidates that fail to parse are skipped in favour of later ones"""
+        from backend.app.core.json_utils import extract_json_object
+
+        assert extract_json_object('set {x} then {"ok": true}') == {'ok': True}
+        assert extract_json_object('no json here') is None
+        assert extract_json_object('[1, 2]') is None
+
+    def test_unbalanced_input_stays_linear(self):
+        """Many unmatched braces do not trigger backtracking"""
+        from backend.app.core.json_utils import extract_json_object
+
+        assert extract_json_object('{' * 50000) is None
+
+    def test_fast_path_matches_stdlib(self):
+        """Whole-object responses parse the same with or without orjson"""
+        from unittest.mock import patch
+        from backend.app.core import json_utils
+
+        text = '```json\n{"redlines": [{"severity": "high", "text": "caf\\u00e9"}]}\n```'
+
+        with patch.object(json_utils, 'ORJSON_AVAILABLE', False):
+            expected = json_utils.extract_json_object(text)
+
+        assert json_utils.extract_json_object(text) == expected
+        assert expected == {'redlines': [{'severity': 'high', 'text': 'café'}]}
+
+    async def test_parse_off_loop_threads_long_text(self):
+        """Only texts over OFFLOAD_CHARS are parsed in a worker thread"""
+        import threading
+        from backend.app.core.json_utils import OFFLOAD_CHARS, parse_off_loop
+
+        def parse(text):
+            return threading.current_thread() is threading.main_thread()
+
+        assert await parse_off_loop(parse, "x" * OFFLOAD_CHARS) is True
+        assert await parse_off_loop(parse, "x" * (OFFLOAD_CHARS + 1)) is False
+
+    def test_array_item_stream_yields_completed_objects(self):
+        """Objects of the keyed array come out as they complete, however the text is split"""
+        import json
+        from backend.app.core.json_utils import ArrayItemStream
+
+        redlines = [{'a': '}\\"{', 'b': [1, {'c': 2}]}, {'d': ']'}]
+        text = 'Result:\n```json\n' + json.dumps({'redlines': redlines, 'x': [{'e': 1}]}) + '\n```'
+
+        for size in (1, 3, 7, len(text)):
+            stream = ArrayItemStream("redlines")
+            items = []
+            for i in range(0, len(text), size):
+                items += stream.feed(text[i:i + size])
+            assert items == redlines
+
+    def test_dumps_round_trips_with_or_without_orjson(self):
+        """dumps output is compact, optionally key-sorted and readable by json.loads"""
+        import json
+        from unittest.mock import patch
+        from backend.app.core import json_utils
+
+        value = {'b': [1, 'é'], 'a': {2: None}}
+
+        with patch.object(json_utils, 'ORJSON_AVAILABLE', False):
+            expected = json_utils.dumps(value, sort_keys=True)
+
+        assert json_utils.dumps(value, sort_keys=True) == expected == '{"a":{"2":null},"b":[1,"é"]}'
+        assert json.loads(json_utils.dumps(value)) == {'b': [1, 'é'], 'a': {'2': None}}
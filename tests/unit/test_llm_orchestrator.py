@@ -1,6 +1,7 @@
 """
 Tests for All-Claude LLM Orchestrator
 """
+import asyncio
 import pytest
 from unittest.mock import Mock, AsyncMock, patch
 import os
@@ -217,3 +218,516 @@ def test_missing_api_key():
 
         with pytest.raises(ValueError, match="ANTHROPIC_API_KEY"):
             AllClaudeLLMOrchestrator()
+
+
+@pytest.fixture
+async def orchestrator():
+    """Orchestrator with a mocked client and no startup health check"""
+    from backend.app.core.llm_orchestrator import AnthropicExclusiveOrchestrator
+
+    with patch.object(AnthropicExclusiveOrchestrator, '_startup_health_check', AsyncMock()):
+        orchestrator = AnthropicExclusiveOrchestrator(api_key='sk-ant-test')
+    orchestrator.client = Mock()
+    return orchestrator
+
+
+def _message(text, input_tokens=1000, output_tokens=1000, cache_read=0):
+    """Mock Messages API response"""
+    return Mock(content=[Mock(text=text)], usage=Mock(
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        cache_read_input_tokens=cache_read,
+        cache_creation_input_tokens=0
+    ))
+
+
+def _stream(message, delays=()):
+    """Mock messages.stream() context whose events arrive after the given delays"""
+    class Stream:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def __aiter__(self):
+            for delay in delays:
+                await asyncio.sleep(delay)
+                yield Mock(type='content_block_delta')
+
+        async def get_final_message(self):
+            return message
+
+    return Mock(return_value=Stream())
+
+
+@pytest.mark.asyncio
+async def test_sonnet_validation_via_batch_api(orchestrator):
+    """With the batch API enabled, validation is polled from a message batch at half cost"""
+    async def results():
+        yield Mock(custom_id='request-0', result=Mock(type='succeeded', message=_message(
+            '{"validated_redlines": ["0"], "removed_redlines": []}'
+        )))
+
+    batches = orchestrator.client.messages.batches
+    batches.create = AsyncMock(return_value=Mock(id='batch-1', processing_status='in_progress'))
+    batches.retrieve = AsyncMock(return_value=Mock(id='batch-1', processing_status='ended'))
+    batches.results = AsyncMock(return_value=results())
+    orchestrator.client.messages.create = AsyncMock()
+    orchestrator.use_batch_api = True
+    redlines = [{'clause': 'Term', 'original_text': 'in perpetuity'}]
+
+    with patch('backend.app.core.llm_orchestrator.asyncio.sleep', AsyncMock()):
+        validated = await orchestrator._validate_with_sonnet({'redlines': redlines}, "text", "doc-1")
+
+    assert validated == redlines
+    orchestrator.client.messages.create.assert_not_awaited()
+    request = batches.create.await_args.kwargs['requests'][0]
+    assert request['params']['model'] == orchestrator.sonnet_model
+    assert orchestrator.stats.sonnet_calls == 1
+    assert orchestrator.stats.total_cost_usd == pytest.approx(0.009)
+
+
+@pytest.mark.asyncio
+async def test_batch_api_failure_preserves_opus_redlines(orchestrator):
+    """A failed batched validation falls back to the unvalidated redlines"""
+    async def results():
+        yield Mock(custom_id='request-0', result=Mock(type='errored'))
+
+    batches = orchestrator.client.messages.batches
+    batches.create = AsyncMock(return_value=Mock(id='batch-1', processing_status='ended'))
+    batches.results = AsyncMock(return_value=results())
+    orchestrator.use_batch_api = True
+    redlines = [{'clause': 'Term'}, {'clause': 'Governing Law'}]
+
+    validated = await orchestrator._validate_with_sonnet({'redlines': redlines}, "text", "doc-1")
+
+    assert validated == redlines
+
+
+@pytest.mark.asyncio
+async def test_opus_instructions_sent_as_cached_system_block(orchestrator):
+    """The Opus system prompt is marked for prompt caching and cache reads are tracked"""
+    from backend.app.core.llm_orchestrator import OPUS_SYSTEM
+
+    orchestrator.client.messages.stream = _stream(
+        _message('{"redlines": []}', input_tokens=100, output_tokens=100, cache_read=1000)
+    )
+
+    result = await orchestrator._analyze_with_opus("The term is perpetual.", "doc-1", [])
+
+    assert result == {'redlines': []}
+    kwargs = orchestrator.client.messages.stream.call_args.kwargs
+    assert kwargs['system'] is OPUS_SYSTEM
+    assert OPUS_SYSTEM[-1]['cache_control'] == {'type': 'ephemeral'}
+    assert "The term is perpetual." in kwargs['messages'][0]['content']
+    assert "The term is perpetual." not in OPUS_SYSTEM[-1]['text']
+    assert orchestrator.stats.cache_read_tokens == 1000
+    assert orchestrator.stats.total_cost_usd == pytest.approx((200 * 0.015 + 100 * 0.075) / 1000)
+
+
+@pytest.mark.asyncio
+async def test_orchestrators_share_connection_pool():
+    """Anthropic clients reuse the worker's httpx pool until shutdown closes it"""
+    from backend.app.core.http_client import close_http_client, get_http_client
+    from backend.app.core.llm_orchestrator import AnthropicExclusiveOrchestrator
+
+    with patch.object(AnthropicExclusiveOrchestrator, '_startup_health_check', AsyncMock()):
+        first = AnthropicExclusiveOrchestrator(api_key='sk-ant-test')
+        second = AnthropicExclusiveOrchestrator(api_key='sk-ant-test')
+
+    pool = get_http_client()
+    assert first.client._client is pool
+    assert second.client._client is pool
+
+    await first.aclose()
+
+    assert not pool.is_closed
+    assert second.client._client is get_http_client()
+
+    await close_http_client()
+
+    assert pool.is_closed
+    assert get_http_client() is not pool
+
+
+@pytest.mark.asyncio
+async def test_stalled_opus_stream_times_out(orchestrator):
+    """A stream that stops sending events fails after the chunk timeout"""
+    orchestrator.stream_chunk_timeout = 0.05
+    orchestrator.client.messages.stream = _stream(_message('{"redlines": []}'), delays=(0, 0, 1))
+
+    with pytest.raises(asyncio.TimeoutError):
+        await orchestrator._stream_message(model='opus', max_tokens=10, messages=[])
+
+    orchestrator.client.messages.stream = _stream(_message('{"redlines": []}'), delays=(0.01, 0.01))
+    message = await orchestrator._stream_message(model='opus', max_tokens=10, messages=[])
+    assert message.content[0].text == '{"redlines": []}'
+
+
+def test_validation_prompt_is_compact(orchestrator):
+    """The validation prompt carries ids, the change and local context only"""
+    document = "Preamble. " * 500 + "The obligations survive in perpetuity. Signed."
+    redlines = [{
+        'clause': 'Term',
+        'issue': 'Perpetual term',
+        'severity': 'high',
+        'original_text': 'survive in perpetuity',
+        'revised_text': 'survive for two years',
+        'recommendation': 'Limit the term',
+        'explanation': 'A long explanation that Sonnet does not need. ' * 20,
+    }]
+
+    prompt = orchestrator._build_validation_prompt({'redlines': redlines}, document)
+
+    assert "[0] high: Perpetual term" in prompt
+    assert "NEW: survive for two years" in prompt
+    assert "CTX: " in prompt and "Signed." in prompt
+    assert "explanation that Sonnet" not in prompt
+    assert len(prompt) < 1000
+
+
+def test_stats_snapshot(orchestrator):
+    """get_stats() returns the counters as a dict with derived metrics"""
+    orchestrator.stats.total_requests = 4
+    orchestrator.stats.successful_requests = 3
+    orchestrator.stats.processing_times.extend([1.0, 3.0])
+
+    stats = orchestrator.get_stats()
+
+    assert stats['success_rate'] == 0.75
+    assert stats['avg_processing_time'] == 2.0
+    assert (stats['p50_processing_time'], stats['p99_processing_time']) == (3.0, 3.0)
+    assert 'processing_times' not in stats
+    assert list(orchestrator.stats.processing_times) == [1.0, 3.0]
+
+
+def test_processing_times_window_is_bounded(orchestrator):
+    """Only the most recent durations are kept for the percentiles"""
+    from backend.app.core.llm_orchestrator import PROCESSING_TIMES_WINDOW
+
+    orchestrator.stats.processing_times.extend(float(i) for i in range(PROCESSING_TIMES_WINDOW + 500))
+
+    stats = orchestrator.get_stats()
+
+    assert len(orchestrator.stats.processing_times) == PROCESSING_TIMES_WINDOW
+    assert stats['p50_processing_time'] == 500.0 + PROCESSING_TIMES_WINDOW // 2
+    assert stats['p99_processing_time'] == 500.0 + int(PROCESSING_TIMES_WINDOW * 0.99)
+
+
+def test_half_open_circuit_admits_one_trial_request(orchestrator):
+    """After the reset time only one request probes the API until it resolves"""
+    import time
+    from backend.app.core.llm_orchestrator import CircuitBreakerState
+
+    for _ in range(orchestrator.circuit_breaker_threshold):
+        orchestrator._record_circuit_breaker_failure()
+
+    assert orchestrator.circuit_breaker_state == CircuitBreakerState.OPEN
+    assert orchestrator._check_circuit_breaker() is False
+
+    orchestrator.circuit_breaker_last_failure_time = time.monotonic() - orchestrator.circuit_breaker_reset_time
+    assert [orchestrator._check_circuit_breaker() for _ in range(3)] == [True, False, False]
+
+    orchestrator._record_circuit_breaker_failure()
+    assert orchestrator.circuit_breaker_state == CircuitBreakerState.OPEN
+    assert orchestrator.stats.circuit_breaker_trips == 2
+
+    orchestrator._reset_circuit_breaker()
+    assert [orchestrator._check_circuit_breaker() for _ in range(2)] == [True, True]
+
+
+@pytest.mark.asyncio
+async def test_oversized_document_rejected_before_opus(orchestrator):
+    """A prompt estimated past the token limit is not sent"""
+    from backend.app.core.llm_orchestrator import estimate_tokens
+
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcde") == 2
+
+    orchestrator.max_input_tokens = 2000
+    orchestrator.client.messages.stream = Mock()
+
+    with pytest.raises(RuntimeError, match="too large"):
+        await orchestrator._analyze_with_opus("word " * 2000, "doc-1", [])
+
+    orchestrator.client.messages.stream.assert_not_called()
+    assert "too large" in orchestrator._get_user_friendly_error(RuntimeError("Document too large for analysis"))
+
+
+@pytest.mark.asyncio
+async def test_sharded_opus_analysis(orchestrator):
+    """Shards end on paragraph breaks, run in parallel and their redlines are combined"""
+    document = "\n\n".join(["a" * 30, "b" * 30, "c" * 30, "d" * 200])
+    orchestrator.shard_documents = True
+    orchestrator.shard_tokens = 20  # 80 characters
+
+    shards = orchestrator._split_into_shards(document)
+    assert [document[start:end] for start, end in shards] == [
+        "a" * 30 + "\n\n" + "b" * 30, "c" * 30, "d" * 200
+    ]
+
+    async def analyze(text, document_id, rule_redlines, **kwargs):
+        return {'redlines': [{'original_text': text[:3]}]}
+
+    orchestrator._analyze_with_opus = AsyncMock(side_effect=analyze)
+    result = await orchestrator._analyze_document_with_opus(document, "doc-1", [])
+
+    assert result == {'redlines': [{'original_text': t} for t in ("aaa", "ccc", "ddd")]}
+
+    # A failed shard falls back to one call over the whole document
+    orchestrator._analyze_with_opus = AsyncMock(side_effect=[
+        RuntimeError("shard failed"), {'redlines': []}, {'redlines': []}, {'redlines': ['whole']}
+    ])
+    result = await orchestrator._analyze_document_with_opus(document, "doc-1", [])
+
+    assert result == {'redlines': ['whole']}
+    assert orchestrator._analyze_with_opus.await_args.args[0] == document
+
+
+@pytest.mark.asyncio
+async def test_failed_shards_count_as_one_breaker_failure(orchestrator):
+    """Shards do not record breaker failures; only a failed whole-document fallback does"""
+    from backend.app.core.llm_orchestrator import CircuitBreakerState
+
+    document = "\n\n".join(letter * 60 for letter in "abcdefgh")
+    orchestrator.shard_documents = True
+    orchestrator.shard_tokens = 20  # 80 characters, one paragraph per shard
+    assert len(orchestrator._split_into_shards(document)) > orchestrator.circuit_breaker_threshold
+
+    orchestrator._stream_message = AsyncMock(side_effect=ValueError("bad response"))
+    with pytest.raises(RuntimeError):
+        await orchestrator._analyze_document_with_opus(document, "doc-1", [])
+
+    assert orchestrator.circuit_breaker_failures == 1
+    assert orchestrator.circuit_breaker_state == CircuitBreakerState.CLOSED
+
+    # Shards failing but the whole document succeeding records nothing
+    async def stream_message(on_text=None, **params):
+        prompt = params["messages"][0]["content"]
+        if "a" * 60 not in prompt or "h" * 60 not in prompt:
+            raise ValueError("bad response")
+        return _message('{"redlines": []}')
+
+    orchestrator._stream_message = AsyncMock(side_effect=stream_message)
+    orchestrator._reset_circuit_breaker()
+    result = await orchestrator._analyze_document_with_opus(document, "doc-2", [])
+
+    assert result == {'redlines': []}
+    assert orchestrator.circuit_breaker_failures == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_backoff_follows_retry_after(orchestrator):
+    """429/529 waits use the retry-after header and are skipped after the last attempt"""
+    from anthropic import APIStatusError
+
+    def error(status, headers):
+        response = Mock(status_code=status, headers=headers)
+        return APIStatusError("limited", response=response, body=None)
+
+    sleep = AsyncMock()
+    with patch('backend.app.core.llm_orchestrator.asyncio.sleep', sleep):
+        await orchestrator._handle_api_error(error(429, {'retry-after': '2'}), "opus", 0)
+        await orchestrator._handle_api_error(error(529, {'retry-after-ms': '1500'}), "opus", 0)
+        await orchestrator._handle_api_error(error(429, {'retry-after': '2'}), "opus", orchestrator.max_retries)
+
+    waits = [call.args[0] for call in sleep.await_args_list]
+    assert len(waits) == 2
+    assert 2.0 <= waits[0] <= 2.5
+    assert 1.5 <= waits[1] <= 2.0
+    assert orchestrator._retry_after(error(429, {'retry-after': 'soon'})) is None
+    assert orchestrator.stats.rate_limit_hits == 2
+
+
+@pytest.mark.asyncio
+async def test_documents_analyzed_in_message_batches(orchestrator):
+    """Opus and Sonnet run as one batch each; failed requests use the real-time path"""
+    opus_reply = '{"redlines": [{"clause": "The obligations survive in perpetuity", "recommendation": "for two years"}]}'
+
+    async def results(entries):
+        for entry in entries:
+            yield entry
+
+    opus_results = [
+        Mock(custom_id='doc-1', result=Mock(type='succeeded', message=_message(opus_reply))),
+        Mock(custom_id='doc-2', result=Mock(type='expired')),
+    ]
+    sonnet_results = [Mock(custom_id='doc-1', result=Mock(type='succeeded', message=_message(
+        '{"validated_redlines": ["0"], "removed_redlines": []}'
+    )))]
+
+    batches = orchestrator.client.messages.batches
+    batches.create = AsyncMock(side_effect=[
+        Mock(id='batch-1', processing_status='ended'),
+        Mock(id='batch-2', processing_status='ended'),
+    ])
+    batches.results = AsyncMock(side_effect=[results(opus_results), results(sonnet_results)])
+    orchestrator.analyze_document = AsyncMock(return_value={'status': 'success', 'redlines': []})
+    orchestrator.use_batch_api = True
+    documents = [('doc-1', "The obligations survive in perpetuity."), ('doc-2', "Second NDA.")]
+
+    results_by_id = await orchestrator.analyze_documents_batch(documents)
+
+    opus_batch, sonnet_batch = [call.kwargs['requests'] for call in batches.create.await_args_list]
+    assert [r['custom_id'] for r in opus_batch] == ['doc-1', 'doc-2']
+    assert opus_batch[0]['params']['model'] == orchestrator.opus_model
+    assert [r['custom_id'] for r in sonnet_batch] == ['doc-1']
+    assert results_by_id['doc-1']['validated_redlines'] == 1
+    assert results_by_id['doc-1']['redlines'][0]['start'] == 0
+    orchestrator.analyze_document.assert_awaited_once_with("Second NDA.", 'doc-2', rule_redlines=None)
+    assert list(results_by_id) == ['doc-1', 'doc-2']
+    assert orchestrator.stats.opus_calls == 1 and orchestrator.stats.sonnet_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_sonnet_calls_bounded_across_documents(orchestrator):
+    """Concurrent validations never exceed sonnet_concurrency calls in flight"""
+    from backend.app.core.llm_orchestrator import AnthropicExclusiveOrchestrator
+
+    with patch.object(AnthropicExclusiveOrchestrator, '_startup_health_check', AsyncMock()):
+        bounded = AnthropicExclusiveOrchestrator(api_key='sk-ant-test', sonnet_concurrency=2)
+    bounded.client = Mock()
+    in_flight = 0
+    peak = 0
+
+    async def create(**params):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return _message('{"validated_redlines": ["0"], "removed_redlines": []}')
+
+    bounded.client.messages.create = AsyncMock(side_effect=create)
+    opus_result = {'redlines': [{'clause': 'Term'}]}
+
+    await asyncio.gather(*[bounded._validate_with_sonnet(opus_result, "text", f"doc-{i}") for i in range(5)])
+
+    assert bounded.client.messages.create.await_count == 5
+    assert peak == 2
+    assert orchestrator.opus_concurrency == 4
+
+
+@pytest.mark.asyncio
+async def test_identical_requests_served_from_response_cache(orchestrator):
+    """A repeated Opus prompt reuses the parsed response until it expires"""
+    orchestrator.client.messages.stream = _stream(
+        _message('{"redlines": [{"clause": "Term", "severity": "high"}]}')
+    )
+
+    first = await orchestrator._analyze_with_opus("The term is perpetual.", "doc-1", [])
+    first['redlines'][0]['severity'] = 'low'
+    second = await orchestrator._analyze_with_opus("The term is perpetual.", "doc-2", [])
+
+    assert orchestrator.client.messages.stream.call_count == 1
+    assert second == {'redlines': [{'clause': 'Term', 'severity': 'high'}]}
+    assert orchestrator.stats.response_cache_hits == 1
+
+    await orchestrator._analyze_with_opus("A different document.", "doc-3", [])
+    orchestrator._response_cache_ttl = 0
+    await orchestrator._analyze_with_opus("The term is perpetual.", "doc-4", [])
+
+    assert orchestrator.client.messages.stream.call_count == 3
+
+
+def test_rule_summary_is_a_cached_system_block(orchestrator):
+    """Rule findings follow the static instructions with their own cache breakpoint"""
+    from backend.app.core.llm_orchestrator import OPUS_SYSTEM
+
+    rules = [{'pattern': 'perpetual_term', 'explanation': 'Term must be limited'}]
+
+    params = orchestrator._opus_params("The term is perpetual.", rules)
+
+    static, summary = params['system']
+    assert static is OPUS_SYSTEM[0]
+    assert summary['cache_control'] == {'type': 'ephemeral'}
+    assert "1. perpetual_term: Term must be limited" in summary['text']
+    assert "perpetual_term" not in params['messages'][0]['content']
+    assert orchestrator._opus_params("The term is perpetual.", [])['system'] is OPUS_SYSTEM
+
+
+@pytest.mark.asyncio
+async def test_validation_overlaps_streaming_opus(orchestrator):
+    """Completed redlines are validated while the rest of the Opus response streams"""
+    document = "The obligations survive in perpetuity. This Agreement is governed by New York law."
+    reply = (
+        '{"redlines": [{"clause": "The obligations survive in perpetuity", "issue": "Perpetual term", '
+        '"recommendation": "two years"}, '
+        '{"clause": "governed by New York law", "issue": "Unfavourable venue", "recommendation": "Delaware law"}]}'
+    )
+    split = reply.index('{"clause": "governed')
+    sonnet_started_mid_stream = []
+
+    class Stream:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def __aiter__(self):
+            for text in (reply[:split], reply[split:]):
+                yield Mock(type='content_block_delta', delta=Mock(type='text_delta', text=text))
+                await asyncio.sleep(0.01)
+                sonnet_started_mid_stream.append(orchestrator.client.messages.create.await_count)
+
+        async def get_final_message(self):
+            return _message(reply)
+
+    orchestrator.client.messages.stream = Mock(return_value=Stream())
+    orchestrator.client.messages.create = AsyncMock(
+        return_value=_message('{"validated_redlines": ["0"], "removed_redlines": []}')
+    )
+    orchestrator.stream_validation = True
+    orchestrator.stream_validation_chunk = 1
+
+    result = await orchestrator.analyze_document(document, "doc-1")
+
+    assert sonnet_started_mid_stream == [1, 2]
+    assert orchestrator.client.messages.create.await_count == 2
+    assert [r['start'] for r in result['redlines']] == [0, document.index("governed")]
+
+
+@pytest.mark.asyncio
+async def test_batch_releases_half_open_trial(orchestrator):
+    """The batch path takes the half-open trial only when it sends a batch, and resolves it"""
+    import time
+    from backend.app.core.llm_orchestrator import CircuitBreakerState
+
+    def half_open():
+        for _ in range(orchestrator.circuit_breaker_threshold):
+            orchestrator._record_circuit_breaker_failure()
+        orchestrator.circuit_breaker_last_failure_time = time.monotonic() - orchestrator.circuit_breaker_reset_time
+
+    orchestrator.use_batch_api = True
+    orchestrator.enable_validation = False
+    orchestrator._analyze_document_with_opus = AsyncMock(return_value={'redlines': []})
+    orchestrator._run_message_batch = AsyncMock(side_effect=RuntimeError("batch failed"))
+
+    # Every document is sharded: no batch is sent and the trial goes to analyze_document
+    orchestrator.shard_documents = True
+    orchestrator.shard_tokens = 1
+    half_open()
+    results_by_id = await orchestrator.analyze_documents_batch([('doc-1', "A long NDA.")])
+
+    assert results_by_id['doc-1']['status'] == 'success'
+    orchestrator._run_message_batch.assert_not_awaited()
+    assert orchestrator.circuit_breaker_state == CircuitBreakerState.CLOSED
+
+    # A failed batch is recorded once; below the threshold the documents run individually
+    orchestrator.shard_documents = False
+    results_by_id = await orchestrator.analyze_documents_batch([('doc-1', "NDA."), ('doc-2', "Another NDA.")])
+
+    assert [r['status'] for r in results_by_id.values()] == ['success', 'success']
+    assert orchestrator.circuit_breaker_failures == 0
+
+    # A failed trial batch reopens the circuit rather than leaving the trial in flight
+    half_open()
+    trips = orchestrator.stats.circuit_breaker_trips
+    results_by_id = await orchestrator.analyze_documents_batch([('doc-1', "NDA.")])
+
+    assert orchestrator.circuit_breaker_state == CircuitBreakerState.OPEN
+    assert orchestrator.stats.circuit_breaker_trips == trips + 1
+    assert results_by_id['doc-1']['status'] == 'error'
+    assert "temporarily unavailable" in results_by_id['doc-1']['error']
@@ -0,0 +1,273 @@
+"""
+Unit tests for LLMPipelineOrchestrator
+Tests Sonnet validation and violation handling without network calls
+"""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+
+DOCUMENT = (
+    "The Receiving Party shall hold Confidential Information in perpetuity. "
+    "This Agreement is governed by the laws of California."
+)
+
+
+def make_violation(violation_id, phrase, **overrides):
+    """Build a rule violation over the first occurrence of phrase in DOCUMENT"""
+    from backend.app.models.schemas_v2 import ViolationSchema
+
+    start = DOCUMENT.index(phrase)
+    fields = {
+        'id': violation_id,
+        'clause_type': 'confidentiality_term',
+        'start': start,
+        'end': start + len(phrase),
+        'original_text': phrase,
+        'revised_text': 'for two years',
+        'severity': 'critical',
+        'confidence': 90,
+        'source': 'rule',
+        'enforcement_levels': ['Balanced'],
+        'explanation': 'Test violation',
+    }
+    fields.update(overrides)
+    return ViolationSchema(**fields)
+
+
+def sonnet_reply(text):
+    """Mock Anthropic message whose first content block is text"""
+    response = MagicMock()
+    response.content = [MagicMock(text=text)]
+    return response
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    """Pipeline with placeholder keys and a mocked Anthropic client"""
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-openai-key')
+    monkeypatch.setenv('ANTHROPIC_API_KEY', 'test-anthropic-key')
+    from backend.app.orchestrators.llm_pipeline import LLMPipelineOrchestrator
+
+    pipeline = LLMPipelineOrchestrator(enable_cache=False)
+    pipeline.anthropic_client = MagicMock()
+    return pipeline
+
+
+@pytest.mark.unit
+@pytest.mark.fast
+class TestSonnetValidationPass:
+    """Test suite for Pass 2 Sonnet validation"""
+
+    async def test_validations_run_concurrently(self, pipeline, monkeypatch):
+        """Validation calls run in parallel, bounded by SONNET_CONCURRENCY"""
+        monkeypatch.setenv('SONNET_BATCH_SIZE', '1')
+        monkeypatch.setenv('SONNET_CONCURRENCY', '2')
+        in_flight = 0
+        peak = 0
+
+        async def create(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            message = kwargs['messages'][0]['content']
+            if "FLAGGED TEXT: laws of California" in message:
+                return sonnet_reply("REJECT - a choice of law is not an issue")
+            return sonnet_reply("CONFIRM - this is a real issue")
+
+        pipeline.anthropic_client.messages.create = AsyncMock(side_effect=create)
+        violations = [
+            make_violation('a', 'in perpetuity'),
+            make_violation('b', 'laws of California'),
+            make_violation('c', 'Confidential Information'),
+        ]
+
+        kept, result = await pipeline._execute_pass_2(DOCUMENT, violations)
+
+        assert peak == 2
+        assert [v.id for v in kept] == ['a', 'c']
+        assert result.items_removed == 1
+
+    async def test_batch_validated_in_one_call(self, pipeline):
+        """A batch of violations costs one Sonnet call; verdicts apply in order"""
+        pipeline.anthropic_client.messages.create = AsyncMock(return_value=sonnet_reply(
+            '{"validations": ['
+            '{"verdict": "modify", "rationale": "Use a fixed term instead", "modified_text": "for 2 years"},'
+            '{"verdict": "reject", "rationale": "California law is acceptable"},'
+            '{"verdict": "confirm", "rationale": "Definition is too broad"}'
+            ']}'
+        ))
+        violations = [
+            make_violation('a', 'in perpetuity'),
+            make_violation('b', 'laws of California'),
+            make_violation('c', 'Confidential Information'),
+        ]
+
+        kept, result = await pipeline._execute_pass_2(DOCUMENT, violations)
+
+        assert pipeline.anthropic_client.messages.create.await_count == 1
+        assert [v.id for v in kept] == ['a', 'c']
+        assert kept[0].revised_text == 'for 2 years'
+        assert (result.items_removed, result.items_modified) == (1, 1)
+
+    async def test_batch_shares_overlapping_context(self, pipeline):
+        """Violations with overlapping context windows reference one passage"""
+        text = DOCUMENT + " " + "x" * 500 + " Notices go to the address above."
+        pipeline.anthropic_client.messages.create = AsyncMock(return_value=sonnet_reply(
+            '{"validations": [' + ', '.join(['{"verdict": "confirm", "rationale": "Real issue here"}'] * 3) + ']}'
+        ))
+        notices = text.index("Notices")
+        violations = [
+            make_violation('a', 'in perpetuity'),
+            make_violation('b', 'laws of California'),
+            make_violation('c', 'in perpetuity', start=notices, end=notices + 7, original_text='Notices'),
+        ]
+
+        windows, window_of = pipeline._context_windows(violations, text)
+        await pipeline._validate_batch_with_sonnet(violations, text)
+
+        assert window_of == [0, 0, 1]
+        assert windows[0] == text[:min(len(text), violations[1].end + 200)]
+        message = pipeline.anthropic_client.messages.create.await_args.kwargs['messages'][0]['content']
+        assert message.count("Receiving Party shall hold") == 1
+        assert message.count("CONTEXT: see [P1]") == 2
+
+    async def test_batch_length_mismatch_falls_back(self, pipeline):
+        """A reply that does not cover every violation is retried per violation"""
+        pipeline.anthropic_client.messages.create = AsyncMock(side_effect=[
+            sonnet_reply('{"validations": [{"verdict": "reject", "rationale": "Only one verdict"}]}'),
+            sonnet_reply("CONFIRM - this is a real issue"),
+            sonnet_reply("REJECT - a choice of law is not an issue"),
+        ])
+        violations = [make_violation('a', 'in perpetuity'), make_violation('b', 'laws of California')]
+
+        validations = await pipeline._validate_batch_with_sonnet(violations, DOCUMENT)
+
+        assert pipeline.anthropic_client.messages.create.await_count == 3
+        assert [v.verdict.value for v in validations] == ['confirm', 'reject']
+
+    async def test_repeated_clause_reuses_verdict(self, pipeline):
+        """A clause validated before is not sent to Sonnet again"""
+        pipeline.anthropic_client.messages.create = AsyncMock(
+            return_value=sonnet_reply("REJECT - perpetual here is harmless")
+        )
+
+        await pipeline._execute_pass_2(DOCUMENT, [make_violation('a', 'in perpetuity')])
+        kept, result = await pipeline._execute_pass_2(
+            DOCUMENT, [make_violation('b', 'in perpetuity', original_text='IN  perpetuity')]
+        )
+
+        assert pipeline.anthropic_client.messages.create.await_count == 1
+        assert kept == [] and result.items_removed == 1
+        assert pipeline.stats['validation_cache_hits'] == 1
+
+    async def test_failed_validation_is_not_cached(self, pipeline):
+        """The confirm-on-error fallback is not reused for later documents"""
+        pipeline.anthropic_client.messages.create = AsyncMock(side_effect=[
+            RuntimeError("API unavailable"),
+            sonnet_reply("REJECT - perpetual here is harmless"),
+        ])
+
+        first, _ = await pipeline._execute_pass_2(DOCUMENT, [make_violation('a', 'in perpetuity')])
+        second, _ = await pipeline._execute_pass_2(DOCUMENT, [make_violation('b', 'in perpetuity')])
+
+        assert [v.id for v in first] == ['a']
+        assert second == []
+
+    async def test_duplicate_clauses_validated_once(self, pipeline):
+        """A clause flagged twice in one document costs one validation"""
+        pipeline.anthropic_client.messages.create = AsyncMock(
+            return_value=sonnet_reply("CONFIRM - this is a real issue")
+        )
+        violations = [
+            make_violation('a', 'in perpetuity'),
+            make_violation('b', 'in perpetuity', severity='high'),
+        ]
+
+        kept, _ = await pipeline._execute_pass_2(DOCUMENT, violations)
+
+        assert pipeline.anthropic_client.messages.create.await_count == 1
+        assert [v.id for v in kept] == ['a', 'b']
+
+    async def test_high_confidence_skips_sonnet(self, pipeline, monkeypatch):
+        """Model violations at the confidence threshold are accepted without a Sonnet call"""
+        pipeline.anthropic_client.messages.create = AsyncMock(
+            return_value=sonnet_reply("REJECT - a choice of law is not an issue")
+        )
+        violations = [
+            make_violation('a', 'in perpetuity', confidence=95, source='gpt5'),
+            make_violation('b', 'laws of California'),
+        ]
+
+        kept, _ = await pipeline._execute_pass_2(DOCUMENT, violations)
+
+        assert pipeline.anthropic_client.messages.create.await_count == 1
+        assert [v.id for v in kept] == ['a']
+        assert pipeline.stats['confidence_gated'] == 1
+
+        pipeline.validate_all = True
+        kept, _ = await pipeline._execute_pass_2(
+            DOCUMENT, [make_violation('c', 'Confidential Information', confidence=99, source='gpt5')]
+        )
+
+        assert kept == []
+        assert pipeline.anthropic_client.messages.create.await_count == 2
+
+    async def test_rule_violations_always_go_to_sonnet(self, pipeline):
+        """Rule hits carry confidence 100 but are still validated"""
+        pipeline.anthropic_client.messages.create = AsyncMock(
+            return_value=sonnet_reply("REJECT - a choice of law is not an issue")
+        )
+
+        kept, _ = await pipeline._execute_pass_2(
+            DOCUMENT, [make_violation('a', 'laws of California', confidence=100)]
+        )
+
+        assert kept == []
+        assert pipeline.anthropic_client.messages.create.await_count == 1
+        assert pipeline.stats['confidence_gated'] == 0
+
+
+@pytest.mark.unit
+@pytest.mark.fast
+class TestClauseSegmentation:
+    """Test suite for paragraph segmentation"""
+
+    def test_segments_address_their_own_paragraph(self, pipeline):
+        """Offsets follow the split, including for repeated paragraphs"""
+        text = "Governed by the laws of Delaware.\n\n\n\nNotices.\n\nGoverned by the laws of Delaware."
+
+        segments = pipeline._segment_by_clause_type(text)
+
+        assert [text[s['start']:s['end']] for s in segments] == [s['text'] for s in segments]
+        assert [s['start'] for s in segments] == [0, 37, 47]
+
+
+    def test_segment_skipped_when_covered(self, pipeline):
+        """Three violations inside a segment skip it; spans outside it do not count"""
+        segment = {'start': 100, 'end': 200}
+        spans = sorted([
+            (90, 150, 'high'), (100, 120, 'low'), (150, 160, 'low'),
+            (190, 210, 'high'), (250, 260, 'critical'),
+        ])
+
+        assert pipeline._should_skip_segment(segment, spans) is False
+        assert pipeline._should_skip_segment(segment, sorted(spans + [(200, 200, 'low')])) is True
+        assert pipeline._should_skip_segment(segment, []) is False
+
+
+@pytest.mark.unit
+@pytest.mark.fast
+class TestConsistencySweep:
+    """Test suite for the Pass 4 consistency check"""
+
+    async def test_banned_tokens_found_case_insensitively(self, pipeline):
+        """Every occurrence of a banned token is reported with its location"""
+        text = "Perpetual terms apply. The term is perpetual."
+
+        check = await pipeline._check_consistency(text, [], ['perpetual', 'forever'], set())
+
+        assert [hit['location'] for hit in check.banned_tokens_found] == [0, 35]
+        assert check.needs_correction is True
@@ -0,0 +1,30 @@
+"""
+Unit tests for the shared process pool
+Tests lazy creation, the spawn start method and shutdown
+"""
+import pytest
+
+
+@pytest.mark.unit
+@pytest.mark.fast
+class TestProcessPool:
+    """Test suite for get_process_pool / shutdown_process_pool"""
+
+    def test_pool_is_shared_until_shutdown(self, monkeypatch):
+        """One spawn-based pool per worker; shutdown lets the next call start a new one"""
+        from backend.app.core import process_pool
+
+        monkeypatch.setenv('BATCH_EXTRACT_WORKERS', '2')
+        process_pool.shutdown_process_pool()
+
+        pool = process_pool.get_process_pool()
+
+        assert process_pool.get_process_pool() is pool
+        assert pool._max_workers == 2
+        assert pool._mp_context.get_start_method() == 'spawn'
+
+        process_pool.shutdown_process_pool()
+
+        assert process_pool._process_pool is None
+        assert process_pool.get_process_pool() is not pool
+        process_pool.shutdown_process_pool()
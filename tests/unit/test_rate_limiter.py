@@ -0,0 +1,69 @@
+"""
+Unit tests for the client-side rate limiter
+Tests token bucket waits against a fake clock
+"""
+import pytest
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake monotonic clock that asyncio.sleep advances; records the waits"""
+    from backend.app.core import rate_limiter
+
+    class Clock:
+        now = 1000.0
+        waits = []
+
+        def monotonic(self):
+            return self.now
+
+        async def sleep(self, seconds):
+            self.waits.append(seconds)
+            self.now += seconds
+
+    fake = Clock()
+    monkeypatch.setattr(rate_limiter.time, 'monotonic', fake.monotonic)
+    monkeypatch.setattr(rate_limiter.asyncio, 'sleep', fake.sleep)
+    return fake
+
+
+@pytest.mark.unit
+@pytest.mark.fast
+class TestRateLimiter:
+    """Test suite for RateLimiter"""
+
+    async def test_waits_for_token_capacity(self, clock):
+        """A request past the token budget waits until enough tokens refill"""
+        from backend.app.core.rate_limiter import RateLimiter
+
+        limiter = RateLimiter(rpm=0, tpm=600)  # 10 tokens per second
+
+        await limiter.acquire(500)
+        await limiter.acquire(200)
+
+        assert clock.waits == [pytest.approx(10.0)]
+
+    async def test_waits_for_request_capacity(self, clock):
+        """The request bucket allows rpm calls, then one per 60/rpm seconds"""
+        from backend.app.core.rate_limiter import RateLimiter
+
+        limiter = RateLimiter(rpm=2, tpm=0)
+
+        for _ in range(3):
+            await limiter.acquire(10)
+
+        assert clock.waits == [pytest.approx(30.0)]
+
+    async def test_unlimited_and_oversized_requests(self, clock):
+        """Zero limits never wait; a request above tpm waits for a full bucket"""
+        from backend.app.core.rate_limiter import RateLimiter, get_rate_limiter
+
+        await RateLimiter().acquire(10 ** 9)
+        assert clock.waits == []
+
+        limiter = RateLimiter(tpm=60)
+        await limiter.acquire(1000)
+        await limiter.acquire(1000)
+        assert clock.waits == [pytest.approx(60.0)]
+
+        assert get_rate_limiter('sonnet') is get_rate_limiter('sonnet')
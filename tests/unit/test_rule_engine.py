@@ -231,6 +231,21 @@ class TestRuleValidation:
         assert overlaps(redlines[0], redlines[1])  # Should overlap
         assert not overlaps(redlines[0], redlines[2])  # Should not overlap
 
+    def test_find_overlapping_pairs(self):
+        """Overlapping span pairs are found in index order; touching counts only when inclusive"""
+        from backend.app.core.rule_engine import RuleConflictDetector, find_overlapping_pairs
+
+        spans = [(30, 40), (10, 20), (15, 25), (20, 30), (12, 13)]
+
+        assert find_overlapping_pairs(spans) == [(1, 2), (1, 4), (2, 3)]
+        assert find_overlapping_pairs(spans, inclusive=True) == [
+            (0, 3), (1, 2), (1, 3), (1, 4), (2, 3)
+        ]
+
+        redlines = [{'start': s, 'end': e} for s, e in spans]
+        conflicts = RuleConflictDetector.find_conflicts(redlines)
+        assert [(c['overlap_start'], c['overlap_end']) for c in conflicts] == [(15, 20), (12, 13), (20, 25)]
+
     def test_redline_sorting(self):
         """Test that redlines are sorted by position"""
         redlines = [
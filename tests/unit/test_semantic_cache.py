@@ -0,0 +1,80 @@
+"""
+Unit tests for SemanticCache
+Tests the in-process SimHash fingerprint index
+"""
+import pytest
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Semantic cache without Redis, storing under a temporary directory"""
+    from backend.app.core.semantic_cache import SemanticCache
+
+    return SemanticCache(cache_dir=str(tmp_path))
+
+
+@pytest.mark.unit
+@pytest.mark.fast
+class TestFingerprintIndex:
+    """Test suite for the SimHash fingerprint index"""
+
+    async def test_index_evicts_least_recently_used(self, cache):
+        """Past the size cap the oldest fingerprint goes, band buckets included"""
+        cache._fingerprint_index_size = 2
+        clauses = [
+            "The Receiving Party shall keep the information confidential for two years.",
+            "This Agreement is governed by the laws of the State of Delaware.",
+            "Neither party shall solicit the employees of the other party for twelve months.",
+        ]
+
+        await cache._store_fingerprint(clauses[0], {'id': 0}, cost=0.03)
+        await cache._store_fingerprint(clauses[1], {'id': 1}, cost=0.03)
+        assert (await cache._search_fingerprint(clauses[0]))['response'] == {'id': 0}
+        await cache._store_fingerprint(clauses[2], {'id': 2}, cost=0.03)
+
+        assert await cache._search_fingerprint(clauses[1]) is None
+        assert len(cache.fingerprint_entries) == 2
+        indexed = set().union(*(bucket for bands in cache.fingerprint_bands for bucket in bands.values()))
+        assert indexed == set(cache.fingerprint_entries)
+
+    async def test_expired_fingerprint_is_pruned(self, cache):
+        """An expired entry found by a lookup is removed from the index"""
+        clause = "The Receiving Party shall keep the information confidential for two years."
+
+        await cache._store_fingerprint(clause, {'id': 0}, cost=0.03)
+        for entry in cache.fingerprint_entries.values():
+            entry['timestamp'] -= cache.ttl_seconds + 1
+
+        assert await cache._search_fingerprint(clause) is None
+        assert not cache.fingerprint_entries
+        assert cache.fingerprint_bands == [{} for _ in cache.fingerprint_bands]
+
+    async def test_near_duplicate_with_other_terms_is_not_reused(self, cache):
+        """Only clauses with the same normalized text reuse an entry"""
+        from backend.app.core.semantic_cache import SIMHASH_MAX_DISTANCE, simhash_fingerprint
+
+        clause = (
+            "The Receiving Party shall keep the Confidential Information confidential for "
+            "five (5) years from the date of disclosure, and shall use it solely for the "
+            "Purpose, and shall not copy it except as needed for the Purpose, and shall not "
+            "reverse engineer any samples."
+        )
+        changed = clause.replace("five (5)", "two (2)")
+        assert bin(simhash_fingerprint(clause) ^ simhash_fingerprint(changed)).count('1') <= SIMHASH_MAX_DISTANCE
+
+        await cache._store_fingerprint(clause, {'id': 0}, cost=0.03)
+
+        assert await cache._search_fingerprint(changed) is None
+        reformatted = "  " + clause.upper().replace(" ", "\n", 3)
+        assert (await cache._search_fingerprint(reformatted))['response'] == {'id': 0}
+
+    async def test_disabled_cache_does_not_use_fingerprint_index(self, cache):
+        """A disabled cache neither stores nor returns fingerprint entries"""
+        clause = "The Receiving Party shall keep the information confidential for two years."
+        cache.enabled = False
+
+        await cache.store(clause, {'id': 0}, cost=0.03)
+        assert not cache.fingerprint_entries
+
+        await cache._store_fingerprint(clause, {'id': 0}, cost=0.03)
+        assert await cache.search(clause) is None
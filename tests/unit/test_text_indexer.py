@@ -0,0 +1,66 @@
+"""
+Unit tests for WorkingTextIndexer
+Tests span lookup against the DOCX mappings
+"""
+import pytest
+
+
+@pytest.fixture
+def indexer():
+    """Indexer built over a two-paragraph document with formatted runs"""
+    from docx import Document
+    from backend.app.core.text_indexer import WorkingTextIndexer
+
+    doc = Document()
+    paragraph = doc.add_paragraph("Term: ")
+    paragraph.add_run("five years").bold = True
+    paragraph.add_run(" from signing.")
+    doc.add_paragraph("Governed by ").add_run("Delaware").italic = True
+
+    indexer = WorkingTextIndexer()
+    indexer.build_index(doc)
+    return indexer
+
+
+@pytest.mark.unit
+@pytest.mark.fast
+class TestWorkingTextIndexer:
+    """Test suite for WorkingTextIndexer"""
+
+    def test_find_spans_returns_overlapping_runs(self, indexer):
+        """Every run overlapping the span is returned, in order"""
+        text = indexer.working_text
+        start = text.index("years")
+        end = text.index("signing")
+
+        originals = [m.original for m in indexer.find_spans(start, end)]
+
+        assert originals == ["five years", " from signing."]
+        assert indexer.find_spans(len(text), len(text) + 5) == []
+
+    def test_find_spans_bulk_matches_single_lookups(self, indexer):
+        """Bulk lookup gives the same result as one find_spans call per span"""
+        text = indexer.working_text
+        spans = [
+            (text.index("Delaware"), text.index("Delaware") + 8),
+            (0, 3),
+            (text.index("five"), text.index("Governed")),
+            (5, 5),
+        ]
+
+        assert indexer.find_spans_bulk(spans) == [indexer.find_spans(s, e) for s, e in spans]
+
+    def test_rebuilding_index_refreshes_lookup(self, indexer):
+        """Span lookup follows the mappings of the latest build"""
+        from docx import Document
+
+        doc = Document()
+        doc.add_paragraph("Only paragraph")
+        indexer.build_index(doc)
+
+        assert [m.original for m in indexer.find_spans(0, 4)] == ["Only paragraph"]
+
+    def test_normalize_text(self, indexer):
+        """Whitespace runs collapse to one space and zero-width characters are dropped"""
+        assert indexer.normalize_text("Term:\t\n five​ years﻿") == "Term: five years"
+        assert indexer.normalize_text("") == ""